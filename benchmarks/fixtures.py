@@ -0,0 +1,67 @@
+import json
+import os
+import numpy as np
+from game.landmarks import result_from_array, synthetic_hand
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+LANDMARK_FIXTURE = os.path.join(FIXTURE_DIR, "landmarks.json")
+
+def synthetic_frame(width=320, height=240, seed=0):
+    """BGR camera-sized frame with noise so conversions can't take shortcuts."""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+def load_landmark_fixture(path=LANDMARK_FIXTURE):
+    """Load a landmark sequence: a list of (21, 3) arrays, or None where no hand was seen."""
+    with open(path) as f:
+        frames = json.load(f)["frames"]
+    return [None if frame is None else np.array(frame, dtype=np.float32) for frame in frames]
+
+def save_landmark_fixture(frames, path=LANDMARK_FIXTURE, source="synthetic"):
+    """Write a landmark sequence in the fixture format."""
+    data = {
+        "source": source,
+        "frames": [None if frame is None else np.round(frame, 4).tolist() for frame in frames],
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+
+def generate_landmark_fixture(count=60):
+    """A hand sweeping up and down, mostly pinched, losing tracking now and then."""
+    frames = []
+    for i in range(count):
+        if i % 20 == 19:
+            frames.append(None)
+            continue
+        y = 0.5 + 0.35 * np.sin(i / count * 2 * np.pi)
+        frames.append(synthetic_hand(y, pinched=i % 10 != 9))
+    return frames
+
+class FixtureHands:
+    """Replays a landmark sequence through the Hands.process interface."""
+    def __init__(self, frames):
+        self.results = [result_from_array(frame) for frame in frames]
+        self.index = 0
+
+    def process(self, rgb):
+        result = self.results[self.index % len(self.results)]
+        self.index += 1
+        return result
+
+class SyntheticCapture:
+    """Stands in for a cv2.VideoCapture, returning the same noise frame every read."""
+    def __init__(self, seed=0):
+        self.frame = synthetic_frame(seed=seed)
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        return True, self.frame
+
+    def release(self):
+        pass
+
+if __name__ == "__main__":
+    save_landmark_fixture(generate_landmark_fixture())
+    print(f"Wrote {LANDMARK_FIXTURE}")
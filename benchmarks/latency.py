@@ -0,0 +1,109 @@
+"""Headless motion-to-photon latency harness.
+
+Drives the game loop's playing path (process_cameras, update_paddle_positions,
+update_ball, drawing, pygame.display.update) from a recorded session or from a
+synthetic hand that jumps between two heights, and prints per-player latency
+from frame capture to inference, paddle target, present and settled paddle.
+
+    python -m benchmarks.latency                     # synthetic step input
+    python -m benchmarks.latency --replay session.npz
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import pygame
+from utils.constants import *
+from utils.latency import latency, MARKS
+from game.landmarks import synthetic_hand
+from benchmarks.fixtures import FixtureHands, SyntheticCapture
+
+SCREEN_SIZE = (1280, 720)
+
+def step_sequence(period, low=0.35, high=0.65):
+    """Pinched hand holding one height for `period` frames, then the other."""
+    return [synthetic_hand(low)] * period + [synthetic_hand(high)] * period
+
+def synthetic_source(period, num_players):
+    frames = step_sequence(period)
+    caps = [SyntheticCapture(seed=p) for p in range(num_players)]
+    # Offset player 2 by half a period so the players' jumps don't coincide
+    factory = lambda player_id: FixtureHands(frames[player_id * period // 2:] + frames[:player_id * period // 2])
+    return caps, factory, None, SCREEN_SIZE
+
+def replay_source(path):
+    from game.recording import Recording, ReplayCapture
+    recording = Recording(path)
+    caps = [ReplayCapture(recording, p) for p in range(recording.num_players)]
+    return caps, recording.hands_factory, recording, recording.field_size
+
+def run(args):
+    from game.game_logic import GameLogic
+    from ui.hud import GameHUD
+    from utils.helpers import cvimage_to_pygame
+
+    if args.replay:
+        caps, hands_factory, recording, size = replay_source(args.replay)
+    else:
+        caps, hands_factory, recording, size = synthetic_source(args.period, 1 if args.single_player else 2)
+    num_players = len(caps)
+    single_player = num_players == 1
+    seed = recording.seed if recording else 1
+
+    pygame.init()
+    screen = pygame.display.set_mode(size)
+    game_logic = GameLogic(*size, single_player, seed=seed, num_cameras=num_players, hands_factory=hands_factory,
+                           num_players=max(2, num_players))
+    hud = GameHUD(*size, [True] + [not single_player] * (game_logic.num_players - 1))
+    clock = pygame.time.Clock()
+    cam_surfaces = [None] * game_logic.num_players
+
+    latency.reset()
+    latency.enabled = True
+    frames = 0
+    while frames < args.frames and not (recording and recording.finished):
+        if not args.unpaced:
+            clock.tick(FPS)
+        if game_logic.check_game_over():
+            game_logic.restart_game()
+        results, camera_frames = game_logic.process_cameras(caps)
+        if camera_frames[0] is not None:
+            game_logic.update_paddle_positions(results)
+            for i, frame in enumerate(camera_frames):
+                if frame is not None:
+                    cam_surfaces[i] = cvimage_to_pygame(frame)
+        game_logic.update_ball(notify=False)
+
+        screen.fill(BLACK)
+        for paddle in game_logic.paddles:
+            paddle.draw(screen)
+        game_logic.ball.draw(screen)
+        hud.draw(screen, game_logic.scores, cam_surfaces, FPS, game_logic.ball)
+        pygame.display.update()
+        latency.present(game_logic.paddles)
+        frames += 1
+    pygame.quit()
+    return num_players
+
+def main():
+    parser = argparse.ArgumentParser(description="Motion-to-photon latency harness")
+    parser.add_argument("--replay", metavar="PATH", help="Drive input from a recorded session")
+    parser.add_argument("--frames", type=int, default=600, help="Frames to run (default 600)")
+    parser.add_argument("--period", type=int, default=45, help="Frames between synthetic hand jumps")
+    parser.add_argument("--single-player", action="store_true", help="Synthetic input for one player only")
+    parser.add_argument("--unpaced", action="store_true", help="Don't wait for the frame clock between frames")
+    parser.add_argument("--output", help="Write percentiles to a JSON file")
+    args = parser.parse_args()
+
+    num_players = run(args)
+    print(latency.report())
+    if args.output:
+        data = {f"player{p + 1}": {mark: latency.percentiles(p, mark) for mark in MARKS}
+                for p in range(num_players)}
+        with open(args.output, "w") as f:
+            json.dump(data, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Per-player frame cost as the number of players grows.
+
+Times GameLogic.process_cameras (capture, detection and landmark drawing for
+every player) for 1..MAX_PLAYERS players, once with the cameras in turn and
+once on the per-camera pipelines, from synthetic frames and the landmark
+fixture. The fixture replays landmarks almost for free, so --inference-ms
+adds a stand-in for MediaPipe: OpenCV blurs that, like the real graph, run
+outside the GIL.
+
+    python -m benchmarks.players
+    python -m benchmarks.players --inference-ms 8 --frames 200
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+from utils.constants import *
+from benchmarks.fixtures import FixtureHands, SyntheticCapture, load_landmark_fixture, synthetic_frame
+
+SCREEN_SIZE = (1280, 720)
+BLUR_KERNEL = (31, 31)
+
+def calibrate_blurs(milliseconds):
+    """Blurs of a camera-sized frame that take about this long on this machine."""
+    if milliseconds <= 0:
+        return 0
+    rgb = synthetic_frame()
+    cv2.GaussianBlur(rgb, BLUR_KERNEL, 0)
+    runs = 20
+    start = time.perf_counter()
+    for _ in range(runs):
+        cv2.GaussianBlur(rgb, BLUR_KERNEL, 0)
+    per_blur = (time.perf_counter() - start) / runs * 1000
+    return max(1, round(milliseconds / per_blur))
+
+class BusyHands(FixtureHands):
+    """FixtureHands that also spends CPU time outside the GIL on every frame."""
+    def __init__(self, frames, blurs):
+        super().__init__(frames)
+        self.blurs = blurs
+
+    def process(self, rgb):
+        for _ in range(self.blurs):
+            cv2.GaussianBlur(rgb, BLUR_KERNEL, 0)
+        return super().process(rgb)
+
+def time_players(num_players, pipelined, frames, blurs, landmarks):
+    """Median milliseconds per process_cameras call."""
+    from game.game_logic import GameLogic
+    game_logic = GameLogic(*SCREEN_SIZE, num_cameras=num_players, num_players=max(2, num_players),
+                           hands_factory=lambda player_id: BusyHands(landmarks, blurs))
+    if game_logic.pipelines:
+        game_logic.pipelines.shutdown()
+    # One thread per camera even on fewer cores, so both ways are measured everywhere
+    game_logic.pipelines = ThreadPoolExecutor(num_players) if pipelined and num_players > 1 else None
+    caps = [SyntheticCapture(seed=p) for p in range(num_players)]
+    for _ in range(5):
+        game_logic.process_cameras(caps)  # Warm up (and start the pipeline threads)
+    samples = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        game_logic.process_cameras(caps)
+        samples.append((time.perf_counter() - start) * 1000)
+    if game_logic.pipelines:
+        game_logic.pipelines.shutdown()
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-player frame cost for 1..MAX_PLAYERS players")
+    parser.add_argument("--frames", type=int, default=300, help="Timed frames per configuration (default 300)")
+    parser.add_argument("--inference-ms", type=float, default=0.0,
+                        help="CPU time per frame standing in for MediaPipe (default 0: fixture only)")
+    args = parser.parse_args()
+
+    blurs = calibrate_blurs(args.inference_ms)
+    landmarks = load_landmark_fixture()
+    print(f"CPU cores: {os.cpu_count()}, inference stand-in: {blurs} blurs (~{args.inference_ms:g} ms)")
+    print(f"{'players':<9}{'in turn ms':>12}{'per player':>12}{'pipelined ms':>14}{'per player':>12}{'speedup':>9}")
+    for num_players in range(1, MAX_PLAYERS + 1):
+        sequential = time_players(num_players, False, args.frames, blurs, landmarks)
+        pipelined = time_players(num_players, True, args.frames, blurs, landmarks)
+        print(f"{num_players:<9}{sequential:>12.3f}{sequential / num_players:>12.3f}"
+              f"{pipelined:>14.3f}{pipelined / num_players:>12.3f}{sequential / pipelined:>8.2f}x")
+
+if __name__ == "__main__":
+    main()
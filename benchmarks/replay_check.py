@@ -0,0 +1,78 @@
+"""Round trip of a recorded session through the game loop's order.
+
+Plays matches from the landmark fixture the way main.py does with --record
+(the menu's restart_game, then a camera tick, paddles, ball and the winner
+check every frame, and the next match started after each win), then
+replays the recording with game.recording.replay_headless and compares the
+final state checksums. Exits 1 when they differ.
+
+    python -m benchmarks.replay_check
+    python -m benchmarks.replay_check --players 4 --ticks 5000
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import random
+import sys
+import tempfile
+from utils.constants import *
+from benchmarks.fixtures import FixtureHands, SyntheticCapture, load_landmark_fixture
+
+SCREEN_SIZE = (1280, 720)
+
+def record_session(path, num_players, ticks):
+    """Play and record ticks camera ticks; returns (final checksum, finished matches)."""
+    from game.game_logic import GameLogic
+    from game.recording import SessionRecorder
+    from net.netplay import state_checksum
+    from utils.config import match_rules
+
+    landmarks = load_landmark_fixture()
+    # Players start at different points of the sweep
+    factory = lambda player_id: FixtureHands(landmarks[player_id * 7:] + landmarks[:player_id * 7])
+    seed = random.getrandbits(32)
+    rules = match_rules()
+    game_logic = GameLogic(*SCREEN_SIZE, num_players == 1, seed=seed, num_cameras=num_players,
+                           hands_factory=factory, num_players=max(2, num_players), **rules)
+    game_logic.recorder = SessionRecorder(path, num_players, seed, SCREEN_SIZE, None, rules)
+    caps = [SyntheticCapture(seed=p) for p in range(num_players)]
+
+    game_logic.restart_game()  # The menu starts the match
+    matches = 0
+    for _ in range(ticks):
+        # After a win the winner screen and menu come first; no camera ticks are recorded there
+        if game_logic.check_game_over():
+            matches += 1
+            game_logic.restart_game()
+        results, frames = game_logic.process_cameras(caps)
+        if any(frame is not None for frame in frames):
+            game_logic.update_paddle_positions(results)
+        game_logic.update_ball(notify=False)
+    checksum = state_checksum(game_logic.save_state())
+    game_logic.recorder.close(checksum)
+    if game_logic.pipelines:
+        game_logic.pipelines.shutdown()
+    return checksum, matches
+
+def main():
+    parser = argparse.ArgumentParser(description="Record a fixture session and check its replay ends the same")
+    parser.add_argument("--players", type=int, default=2, choices=range(1, MAX_PLAYERS + 1),
+                        help="Cameras to record; 1 plays against the computer (default 2)")
+    parser.add_argument("--ticks", type=int, default=3000, help="Camera ticks to record (default 3000)")
+    args = parser.parse_args()
+
+    from game.recording import replay_headless
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "session.npz")
+        recorded, matches = record_session(path, args.players, args.ticks)
+        replayed = replay_headless(path)
+    same = replayed == recorded
+    print(f"{args.ticks} ticks, {matches} finished matches: recorded {recorded:08x}, "
+          f"replayed {replayed:08x} ({'match' if same else 'DIFFERENT'})")
+    if not same:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Headless benchmarks for the per-frame hot paths.
+
+Runs with SDL's dummy video driver, synthetic camera frames and the landmark
+fixture, so no display, camera or hand is needed. Results are compared with a
+JSON baseline and any benchmark slower than the threshold fails the run, as
+does one that was skipped (here or in the baseline) and so wasn't compared.
+
+    python -m benchmarks.run                    # compare with benchmarks/baseline.json
+    python -m benchmarks.run --save-baseline    # record a new baseline on this machine
+    python -m benchmarks.run --filter hud --threshold 0.1
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import numpy as np
+import pygame
+from utils.constants import *
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+SCREEN_SIZE = (1280, 720)
+DEFAULT_THRESHOLD = 0.25  # Fail when the median is 25% slower than baseline
+
+BENCHMARKS = []
+
+def benchmark(name):
+    """Register a setup function returning the callable to time."""
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+@benchmark("gestures.process_frame")
+def bench_process_frame(screen):
+    from game.gestures import GestureDetector
+    from benchmarks.fixtures import FixtureHands, load_landmark_fixture, synthetic_frame
+    frames = load_landmark_fixture()
+    detector = GestureDetector(1, hands_factory=lambda player_id: FixtureHands(frames))
+    frame = synthetic_frame()
+    return lambda: detector.process_frame(frame, 0)
+
+@benchmark("gestures.draw_landmarks")
+def bench_draw_landmarks(screen):
+    from game.gestures import GestureDetector
+    from game.landmarks import result_from_array
+    from benchmarks.fixtures import FixtureHands, load_landmark_fixture, synthetic_frame
+    frames = load_landmark_fixture()
+    detector = GestureDetector(1, hands_factory=lambda player_id: FixtureHands(frames))
+    hand = result_from_array(next(f for f in frames if f is not None)).multi_hand_landmarks
+    frame = synthetic_frame()
+    return lambda: detector.draw_landmarks(frame, hand)
+
+@benchmark("gestures.get_paddle_position")
+def bench_get_paddle_position(screen):
+    from game.gestures import GestureDetector
+    from game.landmarks import result_from_array
+    from benchmarks.fixtures import load_landmark_fixture
+    # Only the pure-Python filtering is timed, so skip building any Hands graph
+    detector = GestureDetector.__new__(GestureDetector)
+    detector.gesture_history = [[], []]
+    detector.stable_positions = [None, None]
+    results = [result_from_array(frame).multi_hand_landmarks for frame in load_landmark_fixture()]
+    state = {"i": 0}
+    def run():
+        state["i"] += 1
+        return detector.get_paddle_position(results[state["i"] % len(results)], SCREEN_SIZE[1], 0)
+    return run
+
+@benchmark("helpers.cvimage_to_pygame")
+def bench_cvimage_to_pygame(screen):
+    from utils.helpers import cvimage_to_pygame
+    from benchmarks.fixtures import synthetic_frame
+    frame = synthetic_frame()
+    return lambda: cvimage_to_pygame(frame)
+
+def _fast_ball():
+    """Ball mid-rally with a full trail, glow and hit dots."""
+    from game.objects import Ball
+    ball = Ball(SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2)
+    for _ in range(6):
+        ball.increase_speed(announce=False)
+    for _ in range(20):
+        ball.move()
+    ball.rect.center = (SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2)
+    return ball
+
+@benchmark("objects.Ball.draw")
+def bench_ball_draw(screen):
+    ball = _fast_ball()
+    return lambda: ball.draw(screen)
+
+@benchmark("hud.GameHUD.draw")
+def bench_hud_draw(screen):
+    from ui.hud import GameHUD
+    from utils.helpers import cvimage_to_pygame
+    from benchmarks.fixtures import synthetic_frame
+    hud = GameHUD(*SCREEN_SIZE)
+    cam0 = cvimage_to_pygame(synthetic_frame(seed=0))
+    cam1 = cvimage_to_pygame(synthetic_frame(seed=1))
+    ball = _fast_ball()
+    hud.update_camera_status((True, False))
+    return lambda: hud.draw(screen, (3, 2), (cam0, cam1), 60, ball)
+
+@benchmark("menu.Menu.draw")
+def bench_menu_draw(screen):
+    from ui.menu import Menu
+    menu = Menu(*SCREEN_SIZE)
+    return lambda: menu.draw(screen)
+
+@benchmark("components.WinnerDisplay.update")
+def bench_winner_update(screen):
+    from ui.components import WinnerDisplay
+    display = WinnerDisplay(*SCREEN_SIZE)
+    display.show_winner(1)
+    return display.update
+
+@benchmark("components.WinnerDisplay.draw")
+def bench_winner_draw(screen):
+    from ui.components import WinnerDisplay
+    display = WinnerDisplay(*SCREEN_SIZE)
+    display.show_winner(1)
+    for _ in range(60):
+        display.update()
+    return lambda: display.draw(screen)
+
+@benchmark("notifications.NotificationPool.draw")
+def bench_notifications_draw(screen):
+    from ui.notifications import NotificationPool
+    pool = NotificationPool(*SCREEN_SIZE)
+    state = {"frame": 0}
+    def run():
+        # A new message every few frames keeps several slots fading at once
+        state["frame"] += 1
+        if state["frame"] % 8 == 0:
+            pool.show(f"SPEED BOOST! {1 + state['frame'] % 40 * 0.1:.1f}x")
+        pool.update()
+        pool.draw(screen)
+    return run
+
+@benchmark("game_logic.update_ball")
+def bench_update_ball(screen):
+    from game.game_logic import GameLogic
+    game_logic = GameLogic(*SCREEN_SIZE, seed=1, num_cameras=0)
+    def run():
+        # Keep paddles on the ball so hits (and speed-ups) happen regularly
+        y = game_logic.ball.rect.centery
+        game_logic.apply_paddle_targets((y, y))
+        game_logic.update_ball(notify=False)
+    return run
+
+def time_callable(func, min_time=0.2, rounds=7):
+    """Median and spread of per-call time in microseconds over several rounds."""
+    # Calibrate the iteration count so each round takes about min_time / rounds
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / rounds:
+            break
+        iterations *= 2
+
+    per_call = []
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            func()
+        per_call.append((time.perf_counter_ns() - start) / iterations / 1000)
+    return {
+        "median_us": round(statistics.median(per_call), 3),
+        "min_us": round(min(per_call), 3),
+        "max_us": round(max(per_call), 3),
+        "iterations": iterations * rounds,
+    }
+
+def environment():
+    versions = {"python": platform.python_version(), "pygame": pygame.version.ver, "numpy": np.__version__}
+    try:
+        import cv2
+        versions["opencv"] = cv2.__version__
+    except ImportError:
+        pass
+    return {"machine": platform.machine(), "platform": platform.platform(), "versions": versions}
+
+def run_benchmarks(name_filter=None, min_time=0.2):
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    results = {}
+    for name, setup in BENCHMARKS:
+        if name_filter and name_filter not in name:
+            continue
+        try:
+            func = setup(screen)
+            func()  # Warm caches (fonts, surfaces) outside the timed rounds
+        except Exception as e:
+            results[name] = {"skipped": f"{type(e).__name__}: {e}"}
+            continue
+        results[name] = time_callable(func, min_time)
+    pygame.quit()
+    return results
+
+def compare(results, baseline, threshold):
+    """Print a table against the baseline; return the names that regressed or were skipped."""
+    regressions = []
+    print(f"{'benchmark':<36}{'median us':>12}{'baseline':>12}{'change':>10}")
+    for name, result in results.items():
+        if "skipped" in result:
+            print(f"{name:<36}{'skipped':>12}  {result['skipped']}")
+            if baseline:
+                regressions.append(name)
+            continue
+        if "skipped" in baseline.get(name, {}):
+            # A skipped baseline entry would let this benchmark regress unnoticed
+            print(f"{name:<36}{result['median_us']:>12.1f}{'skipped':>12}  re-record the baseline")
+            regressions.append(name)
+            continue
+        base = baseline.get(name, {}).get("median_us")
+        if base is None:
+            print(f"{name:<36}{result['median_us']:>12.1f}{'-':>12}{'new':>10}")
+            continue
+        change = result["median_us"] / base - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{name:<36}{result['median_us']:>12.1f}{base:>12.1f}{change:>+10.1%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless hot-path benchmarks")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before failing, as a fraction (default 0.25)")
+    parser.add_argument("--output", help="Also write this run's results to a JSON file")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds spent timing each benchmark")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.filter, args.min_time)
+    report = {"environment": environment(), "results": results}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        compare(results, {}, args.threshold)
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) skipped or slower than baseline by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""Headless memory soak of the game loop.
+
+Cycles through the game's screens (menu, playing, instant replay, winner)
+for hours, with the drawing and camera conversion the real loop does, driven
+by the landmark fixture or a recorded session that is looped. Every
+--interval seconds it samples, after a garbage collection:
+
+    rss       resident set size of the process
+    surfaces  live pygame Surfaces and their pixel bytes (SDL memory, which
+              tracemalloc can't see)
+    traced    Python allocations still held, from tracemalloc
+
+The first sample after --warmup (fonts, caches and buffers filled) is the
+baseline. The report gives the RSS trend per hour and the modules whose
+retained allocations grew the most since the baseline, each with its
+largest growing line.
+
+    python -m benchmarks.soak --hours 8 --replay session.npz --output soak.json
+    python -m benchmarks.soak --hours 0.05 --interval 10 --warmup 10
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+import cv2
+import pygame
+from utils.constants import *
+from benchmarks.fixtures import FixtureHands, SyntheticCapture, load_landmark_fixture
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCREEN_SIZE = (1280, 720)
+MENU_FRAMES = FPS          # Menu shown between matches
+WINNER_FRAMES = 3 * FPS    # Winner screen before the next match
+
+def rss_bytes():
+    """Resident set size; the peak where /proc isn't available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+def live_surfaces():
+    """(count, pixel bytes) of Surfaces referenced from any object the GC tracks.
+
+    Surfaces aren't tracked by the GC themselves, so they are found as
+    referents of the containers that hold them. Subsurfaces share their
+    parent's pixels and are counted without bytes.
+    """
+    seen = {}
+    for obj in gc.get_objects():
+        for ref in gc.get_referents(obj):
+            if isinstance(ref, pygame.Surface):
+                seen[id(ref)] = ref
+    pixels = sum(s.get_bytesize() * s.get_width() * s.get_height() for s in seen.values() if s.get_parent() is None)
+    return len(seen), pixels
+
+def take_snapshot():
+    """Traced allocations, without tracemalloc's own and the import machinery's."""
+    return tracemalloc.take_snapshot().filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen *>")))
+
+def module_of(filename):
+    """Dotted module for files in this repo, the top-level package elsewhere."""
+    path = os.path.abspath(filename)
+    if path.startswith(ROOT + os.sep):
+        module = os.path.splitext(os.path.relpath(path, ROOT))[0].replace(os.sep, ".")
+        return module[:-len(".__init__")] if module.endswith(".__init__") else module
+    parts = path.split(os.sep)
+    if "site-packages" in parts:
+        return os.path.splitext(parts[parts.index("site-packages") + 1])[0]
+    return os.path.splitext(os.path.basename(filename))[0]
+
+def growth_by_module(snapshot, baseline, top):
+    """Modules with the most retained growth: (module, bytes, blocks, (file:line, bytes) of its top line)."""
+    modules = {}
+    for stat in snapshot.compare_to(baseline, "lineno"):
+        frame = stat.traceback[0]
+        module = modules.setdefault(module_of(frame.filename), [0, 0, None, 0])
+        module[0] += stat.size_diff
+        module[1] += stat.count_diff
+        if stat.size_diff > module[3]:
+            module[2], module[3] = f"{os.path.relpath(frame.filename, ROOT)}:{frame.lineno}", stat.size_diff
+    ranked = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)
+    return [(name, size, count, (line, line_size)) for name, (size, count, line, line_size) in ranked[:top]
+            if size > 0]
+
+def slope_per_hour(points):
+    """Least-squares slope of (seconds, value) points, per hour."""
+    if len(points) < 2:
+        return 0.0
+    mean_t = sum(t for t, _ in points) / len(points)
+    mean_v = sum(v for _, v in points) / len(points)
+    var = sum((t - mean_t) ** 2 for t, _ in points)
+    if var == 0:
+        return 0.0
+    return sum((t - mean_t) * (v - mean_v) for t, v in points) / var * 3600
+
+def fixture_source(num_players):
+    landmarks = load_landmark_fixture()
+    caps = [SyntheticCapture(seed=p) for p in range(num_players)]
+    # Players start at different points of the sweep
+    factory = lambda player_id: FixtureHands(landmarks[player_id * 7:] + landmarks[:player_id * 7])
+    return caps, factory, None, SCREEN_SIZE
+
+def replay_source(path):
+    from game.recording import Recording, ReplayCapture
+    recording = Recording(path)
+    caps = [ReplayCapture(recording, p) for p in range(recording.num_players)]
+    return caps, recording.hands_factory, recording, recording.field_size
+
+class Soak:
+    """The game loop's screens, one frame per tick(), without input or pacing."""
+    def __init__(self, caps, hands_factory, recording, size, num_players):
+        from game.game_logic import GameLogic
+        from game.instant_replay import ReplayBuffer, InstantReplay
+        from ui.hud import GameHUD
+        from ui.menu import Menu
+        from ui.components import WinnerDisplay
+
+        self.caps = caps
+        self.recording = recording
+        self.screen = pygame.display.set_mode(size)
+        single_player = len(caps) == 1
+        self.game_logic = GameLogic(*size, single_player, seed=recording.seed if recording else 1,
+                                    num_cameras=len(caps), hands_factory=hands_factory, num_players=num_players)
+        self.game_logic.history = ReplayBuffer()
+        self.hud = GameHUD(*size, [True] + [not single_player] * (num_players - 1))
+        self.menu = Menu(*size)
+        self.winner_display = WinnerDisplay(*size)
+        self.instant_replay = InstantReplay(self.game_logic.history, *size)
+        self.cam_surfaces = [None] * num_players
+        self.state = "menu"
+        self.state_frames = 0
+        self.points = 0
+        self.frames = 0
+        self.matches = 0
+
+    def tick(self):
+        from utils.helpers import cvimage_to_pygame
+        game_logic = self.game_logic
+        self.state_frames += 1
+        if self.state == "menu":
+            self.menu.draw(self.screen)
+            if self.state_frames >= MENU_FRAMES:
+                game_logic.restart_game()
+                self.points = 0
+                self._enter("playing")
+        elif self.state == "playing":
+            if self.recording and self.recording.finished:
+                for cap in self.caps:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)  # Loop the session
+            results, frames = game_logic.process_cameras(self.caps)
+            detected = [False] * game_logic.num_players
+            if any(frame is not None for frame in frames):
+                game_logic.update_paddle_positions(results)
+                for player_id, frame in enumerate(frames):
+                    if frame is not None:
+                        self.cam_surfaces[player_id] = cvimage_to_pygame(frame)
+                        detected[player_id] = bool(results[player_id] and results[player_id].multi_hand_landmarks)
+            else:
+                for paddle in game_logic.paddles:
+                    paddle.update_smooth_movement()
+            game_logic.update_ball()
+            game_logic.notifications.update()
+
+            self.screen.fill(BLACK)
+            for paddle in game_logic.paddles:
+                paddle.draw(self.screen)
+            game_logic.ball.draw(self.screen)
+            game_logic.notifications.draw(self.screen)
+            self.hud.update_camera_status(detected)
+            self.hud.update_camera_health(self.caps)
+            self.hud.draw(self.screen, game_logic.scores, self.cam_surfaces, FPS, game_logic.ball)
+
+            winner = game_logic.check_game_over()
+            if winner:
+                self.matches += 1
+                self.winner_display.show_winner(winner)
+                self._enter("winner")
+            elif sum(game_logic.scores) > self.points:
+                self.points = sum(game_logic.scores)
+                if self.instant_replay.start():
+                    self._enter("instant_replay")
+        elif self.state == "instant_replay":
+            self.instant_replay.draw(self.screen)
+            if not self.instant_replay.update():
+                self._enter("playing")
+        elif self.state == "winner":
+            self.winner_display.update()
+            self.winner_display.draw(self.screen)
+            if self.state_frames >= WINNER_FRAMES:
+                self.winner_display.close()
+                self._enter("menu")
+        pygame.display.update()
+        self.frames += 1
+
+    def _enter(self, state):
+        self.state = state
+        self.state_frames = 0
+
+def sample(started, soak):
+    gc.collect()
+    count, pixels = live_surfaces()
+    traced, _ = tracemalloc.get_traced_memory()
+    return {"seconds": round(time.monotonic() - started, 1), "frames": soak.frames, "matches": soak.matches,
+            "rss": rss_bytes(), "surfaces": count, "surface_bytes": pixels, "traced": traced}
+
+def print_sample(s):
+    mb = 1024 * 1024
+    print(f"{s['seconds']:>9.0f} s {s['frames']:>10} frames  rss {s['rss'] / mb:8.1f} MB  "
+          f"surfaces {s['surfaces']:>5} ({s['surface_bytes'] / mb:6.1f} MB)  traced {s['traced'] / mb:7.2f} MB",
+          flush=True)
+
+def report(samples, growth):
+    mb = 1024 * 1024
+    first, last = samples[0], samples[-1]
+    hours = (last["seconds"] - first["seconds"]) / 3600
+    rss_slope = slope_per_hour([(s["seconds"], s["rss"] / mb) for s in samples])
+    traced_slope = slope_per_hour([(s["seconds"], s["traced"] / mb) for s in samples])
+    lines = [
+        f"Soak: {hours:.2f} h after warmup, {last['frames'] - first['frames']} frames, "
+        f"{last['matches'] - first['matches']} matches",
+        f"RSS {first['rss'] / mb:.1f} -> {last['rss'] / mb:.1f} MB ({rss_slope:+.2f} MB/h); "
+        f"traced {first['traced'] / mb:.2f} -> {last['traced'] / mb:.2f} MB ({traced_slope:+.3f} MB/h); "
+        f"surfaces {first['surfaces']} -> {last['surfaces']}",
+        f"{'module':<28}{'growth KB':>11}{'blocks':>9}  top line",
+    ]
+    for module, size, count, (line, line_size) in growth:
+        lines.append(f"{module:<28}{size / 1024:>11.1f}{count:>+9}  {line} ({line_size / 1024:+.1f} KB)")
+    if not growth:
+        lines.append("(no retained growth)")
+    return "\n".join(lines), rss_slope
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless memory soak of the game loop")
+    parser.add_argument("--replay", metavar="PATH", help="Drive input from a recorded session, looped")
+    parser.add_argument("--players", type=int, choices=range(1, MAX_PLAYERS + 1), default=2,
+                        help="Players for the fixture input (1 plays the CPU)")
+    parser.add_argument("--hours", type=float, default=1.0, help="Soak length after warmup (default 1)")
+    parser.add_argument("--interval", type=float, default=60.0, help="Seconds between samples (default 60)")
+    parser.add_argument("--warmup", type=float, default=60.0, help="Seconds before the baseline sample (default 60)")
+    parser.add_argument("--paced", action="store_true", help="Run at FPS like a cabinet instead of flat out")
+    parser.add_argument("--top", type=int, default=15, help="Modules in the growth report (default 15)")
+    parser.add_argument("--output", help="Write the samples and growth report to a JSON file")
+    parser.add_argument("--fail-above", type=float, metavar="MB_PER_HOUR",
+                        help="Exit with status 1 when RSS grows faster than this")
+    args = parser.parse_args()
+
+    if args.replay:
+        caps, hands_factory, recording, size = replay_source(args.replay)
+    else:
+        caps, hands_factory, recording, size = fixture_source(args.players)
+
+    tracemalloc.start()
+    pygame.init()
+    soak = Soak(caps, hands_factory, recording, size, max(2, len(caps)))
+    clock = pygame.time.Clock()
+    started = time.monotonic()
+    baseline = None
+    samples = []
+    next_sample = started + args.warmup
+    end = next_sample + args.hours * 3600
+    while True:
+        if args.paced:
+            clock.tick(FPS)
+        soak.tick()
+        pygame.event.pump()
+        now = time.monotonic()
+        if now < next_sample:
+            continue
+        if baseline is None:
+            # Before the first sample, so the snapshot's own memory isn't counted as growth
+            baseline = take_snapshot()
+        samples.append(sample(started, soak))
+        print_sample(samples[-1])
+        if now >= end:
+            break
+        next_sample = min(now + args.interval, end)
+
+    snapshot = take_snapshot()
+    growth = growth_by_module(snapshot, baseline, args.top)
+    text, rss_slope = report(samples, growth)
+    print(text)
+    pygame.quit()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"samples": samples,
+                       "growth": [{"module": module, "bytes": size, "blocks": count, "top_line": line,
+                                   "top_line_bytes": line_size}
+                                  for module, size, count, (line, line_size) in growth]}, f, indent=2)
+    if args.fail_above is not None and rss_slope > args.fail_above:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
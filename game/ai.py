@@ -0,0 +1,103 @@
+import math
+import random
+from utils.constants import *
+
+MAX_PREDICTED_BOUNCES = 32  # Guards against a ball wedged against a wall
+
+def _rect_step(speed):
+    """Per-frame displacement of a Rect moved by a float speed (pygame rounds half away from zero)."""
+    return int(math.copysign(math.floor(abs(speed) + 0.5), speed))
+
+def _frames_until(y, vy, floor_y):
+    """Frames until Ball.move leaves the ball touching a wall, i.e. GameLogic bounces it."""
+    if vy < 0:
+        to_top = max(1, math.ceil(y / -vy))
+    else:
+        to_top = 1 if y + vy <= 0 else math.inf
+    if vy > 0:
+        to_bottom = max(1, math.ceil((floor_y - y) / vy))
+    else:
+        to_bottom = 1 if y + vy >= floor_y else math.inf
+    return min(to_top, to_bottom)
+
+class ComputerOpponent:
+    """CPU player that computes the ball intercept analytically instead of simulating it."""
+    def __init__(self, paddle, width, height, reaction_frames=AI_REACTION_FRAMES, aim_error=AI_AIM_ERROR,
+                 rng=None):
+        self.paddle = paddle
+        self.width = width
+        self.height = height
+        self.reaction_frames = reaction_frames
+        self.aim_error = aim_error
+        self.rng = rng or random
+
+        # +1 if the paddle defends the right edge, -1 for the left edge
+        self.side = 1 if paddle.rect.centerx > width // 2 else -1
+
+        self.target_y = height // 2
+        self.reaction_timer = 0
+        self.last_direction = 0
+        self.aim_offset = 0.0
+
+    def predict_intercept(self, ball):
+        """Return the ball's center y when it reaches the paddle, folding in wall bounces.
+        
+        Works bounce-by-bounce on the integer per-frame motion the Rect really
+        performs, so the cost is a few iterations per wall hit rather than one per frame.
+        """
+        if ball.speed_x * self.side <= 0:
+            return None  # Ball is moving away
+        
+        # pygame.Rect rounds each float step, so the effective velocity is integral
+        vx = _rect_step(ball.speed_x)
+        vy = _rect_step(ball.speed_y)
+        if vx == 0:
+            return None
+        
+        # Frames until the ball rect first overlaps the paddle column
+        if self.side > 0:
+            gap = self.paddle.rect.left - ball.rect.right
+        else:
+            gap = ball.rect.left - self.paddle.rect.right
+        frames = max(1, gap // abs(vx) + 1)
+        
+        y = ball.rect.top
+        floor_y = self.height - ball.rect.height
+        for _ in range(MAX_PREDICTED_BOUNCES):
+            hit_frames = _frames_until(y, vy, floor_y)
+            if hit_frames >= frames:
+                break
+            y += hit_frames * vy
+            frames -= hit_frames
+            vy = -vy
+        y += frames * vy
+        return y + ball.rect.height / 2
+    
+    def reset(self):
+        """Forget the current plan, e.g. after a point is scored."""
+        self.target_y = self.height // 2
+        self.reaction_timer = 0
+        self.last_direction = 0
+
+    def update(self, ball):
+        """Return the paddle target for this frame."""
+        direction = 1 if ball.speed_x > 0 else -1
+        if direction != self.last_direction:
+            # New approach: wait out the reaction delay and pick a fresh aim error
+            self.last_direction = direction
+            self.reaction_timer = self.reaction_frames
+            speed_multiplier = ball.current_speed / ball.base_speed
+            error = self.aim_error * (1 + (speed_multiplier - 1) * AI_SPEED_ERROR_GAIN)
+            self.aim_offset = self.rng.gauss(0, error * PADDLE_HEIGHT)
+
+        if self.reaction_timer > 0:
+            self.reaction_timer -= 1
+            return self.target_y
+
+        intercept = self.predict_intercept(ball)
+        if intercept is None:
+            # Drift back towards the middle while the opponent plays the ball
+            self.target_y = self.height // 2
+        else:
+            self.target_y = int(intercept + self.aim_offset)
+        return self.target_y
@@ -1,149 +1,331 @@
-import pygame
-from .objects import Ball, Paddle
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .objects import Ball, create_paddles, lerp_factor
 from .gestures import GestureDetector
+from .ai import ComputerOpponent
 from utils.constants import *
+from utils.profiler import profiler
+from utils.latency import latency
+from utils.audio import sounds
+from utils.telemetry import metrics
+from utils.log import get_logger
+from ui.notifications import NotificationPool
+
+log = get_logger("game", rate_limit=True)
+
+PLAYER_LABELS = [str(p) for p in range(1, MAX_PLAYERS + 1)]
+SKIPPED = [metrics.counter("pong_inference_skipped_total", "Camera ticks skipped because a read failed", player=p)
+           for p in PLAYER_LABELS]
+POINTS = [metrics.counter("pong_points_total", "Points scored", player=p) for p in PLAYER_LABELS]
+RALLY_HITS = metrics.histogram("pong_rally_hits", "Paddle hits in each rally", TELEMETRY_RALLY_BUCKETS)
 
 class GameLogic:
-    def __init__(self, width, height):
+    """One match between num_players players.
+
+    Players 1 and 2 defend the left and right edges; in a 3- or 4-player
+    arena players 3 and 4 defend the top and bottom edge, which are otherwise
+    walls. A ball leaving through a player's edge scores a point for every
+    other player (in a two-player match: the opponent).
+
+    winning_score, ball_speed and paddle_speed are the match's own copy of
+    those settings (utils.config.match_rules); the simulation never reads
+    the live config.
+    """
+    def __init__(self, width, height, single_player=False, seed=None, num_cameras=None,
+                 winning_score=WINNING_SCORE, hands_factory=None, gesture_detector=None, num_players=2,
+                 ball_speed=BALL_SPEED, paddle_speed=PADDLE_SPEED):
         self.width = width
         self.height = height
-        self.ball = Ball(width // 2, height // 2)
-        self.paddle1 = Paddle(PADDLE_OFFSET, height // 2)
-        self.paddle2 = Paddle(width - PADDLE_OFFSET - PADDLE_WIDTH, height // 2)
-        self.score1 = 0
-        self.score2 = 0
-        self.gesture_detector = GestureDetector()
+        self.winning_score = winning_score
+        self.ball_speed = ball_speed      # Applies from the next serve
+        self.paddle_speed = paddle_speed
+        # A seeded generator makes ball resets reproducible across networked peers and replays
+        self.rng = random.Random(seed) if seed is not None else None
+        self.ball = Ball(width // 2, height // 2, self.rng, ball_speed)
+        self.paddles = create_paddles(num_players, width, height)
+        self.scores = [0] * num_players
+        # The top and bottom edges are goals when a player defends them, walls otherwise
+        sides = {paddle.side for paddle in self.paddles}
+        self.top_wall = "top" not in sides
+        self.bottom_wall = "bottom" not in sides
+        self.single_player = single_player
+        # One Hands graph per local camera; 0 runs headless without gesture detection.
+        # A detector built (and warmed up) elsewhere, e.g. during startup, can be passed in.
+        if num_cameras is None:
+            num_cameras = 1 if single_player else num_players
+        if gesture_detector is None and num_cameras > 0:
+            gesture_detector = GestureDetector(num_cameras, hands_factory)
+        self.gesture_detector = gesture_detector
+        # Per-camera capture and inference pipelines run side by side; threads start on first use
+        workers = min(num_cameras, os.cpu_count() or 1) if PIPELINE_WORKERS is None else PIPELINE_WORKERS
+        self.pipelines = (ThreadPoolExecutor(workers, thread_name_prefix="camera-pipeline")
+                          if workers > 1 and num_cameras > 1 else None)
+        
+        # CPU controls paddle2 in single-player mode
+        self.opponent = ComputerOpponent(self.paddle2, width, height, rng=self.rng) if single_player else None
         
         # Speed tracking
         self.last_hit_count = 0
-        self.speed_notifications = []
-    
-    def update_paddle_positions(self, result0, result1):
-        """Update paddle positions based on gesture detection with smoothing."""
-        pos1 = self.gesture_detector.get_paddle_position(
-            result0.multi_hand_landmarks if result0 else None, self.height, 0)
-        pos2 = self.gesture_detector.get_paddle_position(
-            result1.multi_hand_landmarks if result1 else None, self.height, 1)
+        # Per-match records for the match log; maxima, so rollback re-simulation can't inflate them
+        self.longest_rally = 0
+        self.top_speed = 0.0
+        self.match_started = time.monotonic()
+        # On-screen messages (speed boosts); surfaces are only rendered once something is shown
+        self.notifications = NotificationPool(width, height)
         
-        if pos1 is not None:
-            self.paddle1.move_to(pos1, self.height)
-        else:
-            self.paddle1.predict_movement()
-            
-        if pos2 is not None:
-            self.paddle2.move_to(pos2, self.height)
-        else:
-            self.paddle2.predict_movement()
+        # Optional SessionRecorder fed from process_cameras
+        self.recorder = None
+        # Optional instant-replay ReplayBuffer fed every tick from update_ball
+        self.history = None
+    
+    # Two-player views, used by the modes that only exist for two players (netplay, spectators, tables)
+    @property
+    def paddle1(self):
+        return self.paddles[0]
+    
+    @property
+    def paddle2(self):
+        return self.paddles[1]
+    
+    @property
+    def score1(self):
+        return self.scores[0]
+    
+    @property
+    def score2(self):
+        return self.scores[1]
+    
+    @property
+    def num_players(self):
+        return len(self.paddles)
+    
+    def track_length(self, paddle):
+        return self.height if paddle.vertical else self.width
+    
+    def update_paddle_positions(self, results):
+        """Update paddle positions from each player's hand detection result, with smoothing."""
+        positions = []
+        for player_id, paddle in enumerate(self.paddles):
+            if player_id == 1 and self.opponent:
+                positions.append(self.opponent.update(self.ball))
+                continue
+            result = results[player_id] if player_id < len(results) else None
+            positions.append(self.gesture_detector.get_paddle_position(
+                result.multi_hand_landmarks if result else None, self.track_length(paddle), player_id,
+                paddle.vertical))
         
-        # Apply smooth movement
-        self.paddle1.update_smooth_movement()
-        self.paddle2.update_smooth_movement()
+        self.apply_paddle_targets(positions)
+        for player_id, result in enumerate(results):
+            if result and result.multi_hand_landmarks and not (player_id == 1 and self.opponent):
+                latency.target_set(player_id, self.paddles[player_id])
+    
+    def apply_paddle_targets(self, positions):
+        """Move paddles towards explicit targets, by player; None keeps the last valid target."""
+        lerp = lerp_factor(self.paddle_speed)
+        for paddle, pos in zip(self.paddles, positions):
+            if pos is not None:
+                paddle.move_to(pos, self.height if paddle.vertical else self.width)
+            else:
+                paddle.predict_movement()
+            paddle.update_smooth_movement(lerp)
     
-    def update_ball(self):
+    def step(self, positions, notify=True):
+        """Advance one deterministic simulation tick from paddle targets."""
+        self.apply_paddle_targets(positions)
+        self.update_ball(notify)
+    
+    def save_state(self):
+        """Snapshot everything the simulation depends on (used for rollback)."""
+        ball = self.ball
+        return (
+            tuple(ball.rect), ball.speed_x, ball.speed_y, ball.current_speed, ball.hit_count,
+            ball.speed_flash_timer, tuple(ball.trail_positions), ball.max_trail_length,
+            tuple((p.rect.y if p.vertical else p.rect.x, p.target_y, p.smooth_y, p.last_valid_y)
+                  for p in self.paddles),
+            *self.scores, self.last_hit_count,
+            self.rng.getstate() if self.rng else None,
+        )
+    
+    def load_state(self, state):
+        """Restore a snapshot taken with save_state."""
+        ball = self.ball
+        (rect, ball.speed_x, ball.speed_y, ball.current_speed, ball.hit_count,
+         ball.speed_flash_timer, trail, ball.max_trail_length, paddles,
+         *scores, self.last_hit_count, rng_state) = state
+        self.scores = list(scores)
+        ball.rect.update(rect)
+        ball.trail_positions = list(trail)
+        for paddle, (edge, paddle.target_y, paddle.smooth_y, paddle.last_valid_y) in zip(self.paddles, paddles):
+            if paddle.vertical:
+                paddle.rect.y = edge
+            else:
+                paddle.rect.x = edge
+        if rng_state is not None:
+            self.rng.setstate(rng_state)
+    
+    def update_ball(self, notify=True):
         """Update ball position and handle collisions."""
-        self.ball.move()
+        ball = self.ball
+        rect = ball.rect
+        ball.move()
         
         # Wall collisions
-        if self.ball.rect.top <= 0 or self.ball.rect.bottom >= self.height:
-            self.ball.bounce_y()
+        if (rect.top <= 0 and self.top_wall) or (rect.bottom >= self.height and self.bottom_wall):
+            ball.bounce_y()
+            if notify:
+                sounds.play("wall_bounce")
         
         # Paddle collisions with speed increase
         paddle_hit = False
-        if self.ball.rect.colliderect(self.paddle1.rect):
-            # Only increase speed if ball is moving towards paddle
-            if self.ball.speed_x < 0:
-                self.ball.bounce_x()
-                paddle_hit = True
-        elif self.ball.rect.colliderect(self.paddle2.rect):
-            # Only increase speed if ball is moving towards paddle
-            if self.ball.speed_x > 0:
-                self.ball.bounce_x()
-                paddle_hit = True
+        if len(self.paddles) == 2:
+            # The usual two-player match, without the per-side checks of the arena
+            left, right = self.paddles
+            if rect.colliderect(left.rect):
+                # Only increase speed if ball is moving towards paddle
+                if ball.speed_x < 0:
+                    ball.bounce_x(notify)
+                    paddle_hit = True
+            elif rect.colliderect(right.rect):
+                if ball.speed_x > 0:
+                    ball.bounce_x(notify)
+                    paddle_hit = True
+        else:
+            for paddle in self.paddles:
+                if rect.colliderect(paddle.rect):
+                    if paddle.facing(ball):
+                        ball.bounce_off(paddle, notify)
+                        paddle_hit = True
+                    break
+        
+        if paddle_hit:
+            self.top_speed = max(self.top_speed, ball.current_speed)
+            if notify:
+                sounds.play("paddle_hit")
         
         # Check for speed increase notification
-        if paddle_hit and self.ball.hit_count > self.last_hit_count:
-            self.last_hit_count = self.ball.hit_count
-            speed_multiplier = self.ball.current_speed / self.ball.base_speed
-            self.add_speed_notification(self.ball.hit_count, speed_multiplier)
+        if paddle_hit and ball.hit_count > self.last_hit_count:
+            self.last_hit_count = ball.hit_count
+            speed_multiplier = ball.current_speed / ball.base_speed
+            if notify:
+                self.add_speed_notification(ball.hit_count, speed_multiplier)
+        
+        if self.history:
+            self.history.record(self)
         
-        # Scoring
-        if self.ball.rect.left <= 0:
-            self.score2 += 1
-            self.reset_ball()
-        elif self.ball.rect.right >= self.width:
-            self.score1 += 1
-            self.reset_ball()
+        # Scoring: players are numbered in PLAYER_SIDES order (left, right, top, bottom)
+        if rect.left <= 0:
+            conceded = 0
+        elif rect.right >= self.width:
+            conceded = 1
+        elif not self.top_wall and rect.top <= 0:
+            conceded = 2
+        elif not self.bottom_wall and rect.bottom >= self.height:
+            conceded = 3
+        else:
+            return
+        for player_id in range(len(self.scores)):
+            if player_id != conceded:
+                self.scores[player_id] += 1
+                POINTS[player_id].inc()
+        self.end_rally(notify)
+    
+    def end_rally(self, notify=True):
+        """Rally statistics, then a fresh serve."""
+        if notify:
+            sounds.play("score")
+        RALLY_HITS.observe(self.ball.hit_count)
+        self.longest_rally = max(self.longest_rally, self.ball.hit_count)
+        self.reset_ball()
     
     def add_speed_notification(self, hit_count, speed):
         """Add speed increase notification."""
-        notification = {
-            'text': f"SPEED BOOST! {speed:.1f}x",
-            'timer': 90,  # Show for 1.5 seconds
-            'y_offset': 0,
-            'alpha': 255
-        }
-        self.speed_notifications.append(notification)
-    
-    def update_speed_notifications(self):
-        """Update speed notifications."""
-        for notification in self.speed_notifications[:]:
-            notification['timer'] -= 1
-            notification['y_offset'] += 1
-            notification['alpha'] = max(0, int(255 * (notification['timer'] / 90)))
-            
-            if notification['timer'] <= 0:
-                self.speed_notifications.remove(notification)
-    
-    def draw_speed_notifications(self, screen):
-        """Draw speed notifications."""
-        font = pygame.font.SysFont('Arial', 28, bold=True)
-        
-        for notification in self.speed_notifications:
-            text_surface = font.render(notification['text'], True, SPEED_INDICATOR_COLOR)
-            text_surface.set_alpha(notification['alpha'])
-            
-            text_rect = text_surface.get_rect(
-                center=(self.width // 2, self.height // 2 - 150 - notification['y_offset'])
-            )
-            screen.blit(text_surface, text_rect)
+        self.notifications.show(f"SPEED BOOST! {speed:.1f}x", "speed")
     
     def reset_ball(self):
         """Reset ball to center position and reset speed tracking."""
-        self.ball.reset(self.width // 2, self.height // 2)
+        self.ball.reset(self.width // 2, self.height // 2, self.ball_speed)
         self.last_hit_count = 0
-        self.speed_notifications.clear()
+        self.notifications.clear()
+        if self.history:
+            self.history.start_rally()
+        if self.opponent:
+            self.opponent.reset()
     
     def check_game_over(self):
         """Check if game should restart and return winner."""
         try:
-            if self.score1 >= WINNING_SCORE:
-                return 1  # Player 1 wins
-            elif self.score2 >= WINNING_SCORE:
-                return 2  # Player 2 wins
+            best = max(self.scores)
+            # In an arena several players score at once; a tie at the top plays on
+            if best >= self.winning_score and self.scores.count(best) == 1:
+                return self.scores.index(best) + 1  # Winning player's number
             return None  # Game continues
         except Exception as e:
-            print(f"Error checking game over: {e}")
+            log.error("Error checking game over: %s", e)
             return None
     
     def restart_game(self):
         """Reset scores and ball."""
-        self.score1 = 0
-        self.score2 = 0
+        self.scores = [0] * len(self.paddles)
+        self.longest_rally = 0
+        self.top_speed = 0.0
+        self.match_started = time.monotonic()
         self.reset_ball()
     
-    def process_cameras(self, cap0, cap1):
-        """Process both camera feeds."""
-        ret0, frame0 = cap0.read()
-        ret1, frame1 = cap1.read()
-        
-        if not ret0 or not ret1:
-            return None, None, None, None
+    def process_cameras(self, caps):
+        """Read and run hand detection on every player's camera (caps indexed by player).
         
-        result0, processed_frame0 = self.gesture_detector.process_frame(frame0, 0)
-        result1, processed_frame1 = self.gesture_detector.process_frame(frame1, 1)
+        Returns (results, frames): per player, the Hands result and the frame
+        with the gesture overlay drawn, or None where the camera read failed,
+        so only that player stalls. Each capture is a pipeline of its own
+        (read, detection, landmark drawing); they run side by side on
+        self.pipelines, since OpenCV and MediaPipe release the GIL while they
+        work. Players sharing one capture go through it in turn.
         
-        # Draw landmarks
-        self.gesture_detector.draw_landmarks(processed_frame0, result0.multi_hand_landmarks if result0 else None)
-        self.gesture_detector.draw_landmarks(processed_frame1, result1.multi_hand_landmarks if result1 else None)
-        
-        return result0, result1, processed_frame0, processed_frame1
+        The pipelines only fill in their players' slots (and timestamps); the
+        profiler and latency samples are recorded here, on the game thread,
+        once every pipeline has finished.
+        """
+        self.gesture_detector.close_retired()
+        groups = {}
+        for player_id, cap in enumerate(caps):
+            groups.setdefault(id(cap), []).append(player_id)
+        results = [None] * len(caps)
+        frames = [None] * len(caps)
+        processed_frames = [None] * len(caps)
+        stamps = [None] * len(caps)  # (read, inference done) perf_counter_ns by player
+        outputs = (results, frames, processed_frames, stamps)
+        if self.pipelines and len(groups) > 1:
+            pending = [self.pipelines.submit(self._run_pipeline, caps, player_ids, outputs)
+                       for player_ids in groups.values()]
+            for future in pending:
+                future.result()
+            profiler.collect()
+        else:
+            for player_ids in groups.values():
+                self._run_pipeline(caps, player_ids, outputs)
+        for player_id, stamp in enumerate(stamps):
+            if stamp:
+                latency.capture(player_id, stamp[0])
+                latency.mark(player_id, "inference", stamp[1])
+        if self.recorder:
+            self.recorder.record(results, frames)
+        return results, processed_frames
+    
+    def _run_pipeline(self, caps, player_ids, outputs):
+        """One capture's share of process_cameras; fills in the output lists at its players' indices."""
+        results, frames, processed_frames, stamps = outputs
+        for player_id in player_ids:
+            t = profiler.start()
+            ret, frame = caps[player_id].read()
+            read_at = time.perf_counter_ns()
+            profiler.stop("capture", t)
+            if not ret:
+                SKIPPED[player_id].inc()
+                continue
+            frames[player_id] = frame
+            result, processed_frame = self.gesture_detector.process_frame(frame, player_id)
+            stamps[player_id] = (read_at, time.perf_counter_ns())
+            self.gesture_detector.draw_landmarks(processed_frame, result.multi_hand_landmarks if result else None)
+            results[player_id], processed_frames[player_id] = result, processed_frame
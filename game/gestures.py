@@ -1,42 +1,148 @@
+import threading
 import cv2
-import mediapipe as mp
+import numpy as np
 from utils.constants import *
+from utils.config import settings
+from utils.log import get_logger, fields
+from utils.profiler import profiler
+from utils.telemetry import metrics
+from .landmarks import HAND_CONNECTIONS
+
+INFERENCES = [metrics.counter("pong_inference_total", "Camera frames run through hand detection", player=p)
+              for p in map(str, range(1, MAX_PLAYERS + 1))]
+DETECTIONS = [metrics.counter("pong_gesture_detected_total", "Frames in which a hand was detected", player=p)
+              for p in map(str, range(1, MAX_PLAYERS + 1))]
+
+log = get_logger("gestures")
 
 class GestureDetector:
-    def __init__(self):
-        self.mp_hands = mp.solutions.hands
-        self.hands0 = self.mp_hands.Hands(
-            min_detection_confidence=MIN_DETECTION_CONFIDENCE,
-            min_tracking_confidence=MIN_TRACKING_CONFIDENCE,
-            max_num_hands=1
-        )
-        self.hands1 = self.mp_hands.Hands(
-            min_detection_confidence=MIN_DETECTION_CONFIDENCE,
-            min_tracking_confidence=MIN_TRACKING_CONFIDENCE,
-            max_num_hands=1
-        )
-        self.mp_draw = mp.solutions.drawing_utils
+    def __init__(self, num_players=2, hands_factory=None):
+        # hands_factory(player_id) lets benchmarks and replays substitute recorded results;
+        # they don't need MediaPipe until landmarks are drawn (see _load_drawing)
+        self.custom_hands = hands_factory is not None
+        self.mp_hands = None
+        self.mp_draw = None  # drawing_utils; False where mediapipe has none and OpenCV draws instead
+        if hands_factory is None:
+            # Imported here rather than at module load: it takes about a second and
+            # the game builds detectors on a background thread at startup
+            import mediapipe as mp
+            self.mp_hands = mp.solutions.hands
+            self.mp_draw = mp.solutions.drawing_utils
+            hands_factory = self._create_hands
+        # One graph per human player; each camera pipeline only ever runs its own
+        self.hands = [hands_factory(player_id) for player_id in range(num_players)]
+        self.retired = []  # Graphs replaced by rebuild(), closed on the main thread
+        self.rebuilding = None  # The hands-rebuild thread while it runs
+        self.rebuild_requested = False
+        # Guards the three above and the swap of self.hands against the rebuild thread
+        self.rebuild_lock = threading.Lock()
         
         # Gesture stability tracking
-        self.gesture_history = [[], []]  # For each player
-        self.stable_positions = [None, None]  # Last stable positions
+        self.gesture_history = [[] for _ in range(MAX_PLAYERS)]  # For each player
+        self.stable_positions = [None] * MAX_PLAYERS  # Last stable positions
+    
+    def _create_hands(self, player_id):
+        """Build a MediaPipe Hands graph for one player."""
+        return self.mp_hands.Hands(
+            min_detection_confidence=settings.min_detection_confidence,
+            min_tracking_confidence=settings.min_tracking_confidence,
+            max_num_hands=1
+        )
+    
+    def warm_up(self):
+        """Run one inference per graph on a blank frame (and load the drawing) so the first real frame isn't slow."""
+        self._warm_up(self.hands)
+        if self.mp_draw is None:
+            self._load_drawing()
     
+    def _load_drawing(self):
+        try:
+            import mediapipe as mp
+            self.mp_hands = mp.solutions.hands
+            self.mp_draw = mp.solutions.drawing_utils
+        except (ImportError, AttributeError):
+            # Builds with only the tasks API can still replay and draw recorded hands
+            log.info("mediapipe drawing utils unavailable, drawing hands with OpenCV")
+            self.mp_draw = False
+
+    def _warm_up(self, graphs):
+        blank = np.zeros((settings.capture_height, settings.capture_width, 3), dtype=np.uint8)
+        for hands in graphs:
+            hands.process(blank)
+
+    def rebuild(self):
+        """Build and warm graphs with the current confidence settings off the main thread, then swap them in.
+
+        The old graphs keep tracking until the new ones are ready. Recorded
+        results (a custom hands_factory) have no settings to apply.
+        """
+        if self.custom_hands:
+            return
+        with self.rebuild_lock:
+            self.rebuild_requested = True
+            if self.rebuilding is None:
+                self.rebuilding = threading.Thread(target=self._rebuild, name="hands-rebuild", daemon=True)
+                self.rebuilding.start()
+
+    def _rebuild(self):
+        while True:
+            # Another edit while building means these graphs are already out of date. The
+            # thread only gives up under the lock, so a request made meanwhile is never lost.
+            with self.rebuild_lock:
+                if not self.rebuild_requested:
+                    self.rebuilding = None
+                    break
+                self.rebuild_requested = False
+            try:
+                graphs = [self._create_hands(player_id) for player_id in range(len(self.hands))]
+                self._warm_up(graphs)
+            except Exception as e:
+                log.error("Could not rebuild hand tracking, keeping the current graphs: %s", e)
+                with self.rebuild_lock:
+                    self.rebuilding = None
+                return
+            with self.rebuild_lock:
+                self.retired.extend(self.hands)
+                self.hands = graphs
+        log.info("Rebuilt hand tracking", extra=fields(min_detection_confidence=settings.min_detection_confidence,
+                                                       min_tracking_confidence=settings.min_tracking_confidence))
+
+    def close_retired(self):
+        """Close graphs swapped out by rebuild(); call while no camera pipeline is running."""
+        if self.retired:
+            with self.rebuild_lock:
+                retired, self.retired = self.retired, []
+            for hands in retired:
+                hands.close()
+
     def process_frame(self, frame, player_id):
-        """Process camera frame and return hand landmarks."""
+        """Process camera frame and return hand landmarks.
+
+        Safe to run for different players on different threads at once: each
+        player has its own graph and counters, and the profiler queues samples
+        taken off the game thread.
+        """
+        t = profiler.start()
         frame = cv2.flip(frame, 1)
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        profiler.stop("preprocess", t)
         
-        hands = self.hands0 if player_id == 0 else self.hands1
-        result = hands.process(rgb)
+        t = profiler.start()
+        result = self.hands[player_id].process(rgb)
+        profiler.stop("inference", t)
+        INFERENCES[player_id].inc()
+        if result and result.multi_hand_landmarks:
+            DETECTIONS[player_id].inc()
         
+        t = profiler.start()
         # Draw gesture detection area (the green box you see) - now larger
         h, w, _ = frame.shape
         
         # Calculate the active gesture region (larger area)
         top_margin = int(h * GESTURE_MIN_REGION)
         bottom_margin = int(h * GESTURE_MAX_REGION)
-        left_margin = int(w * 0.05)  # 5% from sides (was 0.1)
-        right_margin = int(w * 0.95)  # 95% to right side (was 0.9)
+        left_margin = int(w * GESTURE_SIDE_MARGIN)  # 5% from sides (was 0.1)
+        right_margin = int(w * (1 - GESTURE_SIDE_MARGIN))  # 95% to right side (was 0.9)
         
         # Draw the main detection area (green box) - thicker border for better visibility
         cv2.rectangle(frame, (left_margin, top_margin), 
@@ -76,16 +182,22 @@ class GestureDetector:
         
         cv2.putText(frame, status_text, (10, h - 20),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, status_color, 2)
+        profiler.stop("overlay", t)
         
         return result, frame
     
-    def get_paddle_position(self, hand_landmarks, screen_height, player_id):
-        """Extract paddle position with stability filtering."""
+    def get_paddle_position(self, hand_landmarks, screen_height, player_id, vertical=True):
+        """Extract paddle position with stability filtering.
+
+        Top and bottom paddles (vertical=False) follow the hand's x inside the
+        gesture area instead of its y; screen_height is then the field width.
+        """
         if not hand_landmarks:
             # No gesture detected, predict movement
             return self._get_predicted_position(player_id, screen_height)
         
         current_position = None
+        pinch_threshold = settings.pinch_threshold
         
         for handLms in hand_landmarks:
             lm = handLms.landmark
@@ -95,11 +207,17 @@ class GestureDetector:
             # Check if fingers are pinched
             distance = ((index_tip.x - thumb_tip.x) ** 2 + (index_tip.y - thumb_tip.y) ** 2) ** 0.5
             
-            if distance < PINCH_THRESHOLD:
+            if distance < pinch_threshold:
                 # Use a simpler confidence check since visibility might not be available
-                y_normalized = index_tip.y
-                y_clamped = min(max(y_normalized, GESTURE_MIN_REGION), GESTURE_MAX_REGION)
-                y_mapped = (y_clamped - GESTURE_MIN_REGION) / (GESTURE_MAX_REGION - GESTURE_MIN_REGION)
+                if vertical:
+                    y_normalized, low, high = index_tip.y, GESTURE_MIN_REGION, GESTURE_MAX_REGION
+                else:
+                    # The frame is mirrored before detection, so x already matches the screen
+                    y_normalized, low, high = index_tip.x, GESTURE_SIDE_MARGIN, 1 - GESTURE_SIDE_MARGIN
+                y_clamped = min(max(y_normalized, low), high)
+                y_mapped = (y_clamped - low) / (high - low)
+                # Sensitivity above 1 reaches the edges with less hand travel
+                y_mapped = min(max(0.5 + (y_mapped - 0.5) * settings.gesture_sensitivity, 0.0), 1.0)
                 current_position = int(y_mapped * screen_height)
                 break  # Use first valid detection
         
@@ -126,7 +244,7 @@ class GestureDetector:
         if len(history) >= GESTURE_STABILITY_FRAMES:
             # Check if recent positions are stable (within reasonable range)
             avg_position = sum(history) / len(history)
-            position_variance = sum((pos - avg_position) ** 2 for pos in history) / len(history)
+            position_variance = sum([(pos - avg_position) ** 2 for pos in history]) / len(history)
             
             # If variance is low, use averaged position for smoother movement
             variance_threshold = (screen_height * 0.02) ** 2  # 2% of screen height variance threshold
@@ -147,10 +265,16 @@ class GestureDetector:
     
     def draw_landmarks(self, frame, hand_landmarks):
         """Draw hand landmarks on frame with enhanced visualization."""
+        t = profiler.start()
         if hand_landmarks:
+            if self.mp_draw is None:
+                self._load_drawing()
             for handLms in hand_landmarks:
                 # Draw the hand connections
-                self.mp_draw.draw_landmarks(frame, handLms, self.mp_hands.HAND_CONNECTIONS)
+                if self.mp_draw:
+                    self.mp_draw.draw_landmarks(frame, handLms, self.mp_hands.HAND_CONNECTIONS)
+                else:
+                    self._draw_skeleton(frame, handLms)
                 
                 # Highlight important landmarks (thumb tip and index tip)
                 h, w, _ = frame.shape
@@ -171,7 +295,17 @@ class GestureDetector:
                 
                 # Calculate and display pinch distance
                 distance = ((thumb_tip.x - index_tip.x) ** 2 + (thumb_tip.y - index_tip.y) ** 2) ** 0.5
-                pinch_status = "PINCHED" if distance < PINCH_THRESHOLD else "OPEN"
+                pinch_status = "PINCHED" if distance < settings.pinch_threshold else "OPEN"
                 
                 cv2.putText(frame, pinch_status, (10, 30),
                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+        profiler.stop("landmarks", t)
+    
+    def _draw_skeleton(self, frame, hand_landmarks):
+        """OpenCV version of mp_draw.draw_landmarks with its default colours."""
+        h, w, _ = frame.shape
+        points = [(int(lm.x * w), int(lm.y * h)) for lm in hand_landmarks.landmark]
+        for start, end in HAND_CONNECTIONS:
+            cv2.line(frame, points[start], points[end], (224, 224, 224), 2)
+        for point in points:
+            cv2.circle(frame, point, 2, (0, 0, 255), 2)
@@ -0,0 +1,252 @@
+"""Highlight clips encoded to video in a separate process.
+
+When a match is won, the deciding rally is regenerated from the instant
+replay ring buffer and the winner screen is captured live for a few
+seconds; both go into one video file. The game process only copies the
+rally's state records and, for the live part, a downscaled copy of the
+display into a fixed ring of shared-memory frame slots. A live frame that
+finds no free slot is dropped rather than waited for. Only slot numbers and
+small control messages go through the job queue. Rendering the rally, colour
+conversion and encoding all happen in the encoder process.
+"""
+import multiprocessing
+import os
+import queue
+import time
+from multiprocessing import shared_memory
+import numpy as np
+import pygame
+from utils.constants import *
+from utils.log import get_logger, fields
+from utils.telemetry import metrics
+
+log = get_logger("highlights")
+
+CLIPS = metrics.counter("pong_highlight_clips_total", "Highlight clips encoded")
+DROPPED = metrics.counter("pong_highlight_frames_dropped_total", "Live highlight frames dropped because no frame slot was free")
+
+
+def _even(value):
+    return max(2, int(value) // 2 * 2)
+
+
+def encoder_main(jobs, results, released, shm_name, slots, directory, size, fps):
+    """Encoder process: renders rallies and writes clips until it receives None."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    if hasattr(os, "nice"):
+        # On machines with few cores the game process must win the CPU
+        os.nice(HIGHLIGHT_ENCODER_NICE)
+    import cv2
+    from .instant_replay import InstantReplay, ReplayBuffer
+    pygame.font.init()
+    os.makedirs(directory, exist_ok=True)
+    width, height = size
+    # Owned (and unlinked) by the game process; spawned children share its resource tracker
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = np.ndarray((slots, height, width, 4), dtype=np.uint8, buffer=shm.buf)
+
+    writer = None
+    stats = None
+
+    def write(image, conversion):
+        writer.write(cv2.cvtColor(image, conversion))
+        stats["frames"] += 1
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        kind, name = job[0], job[1]
+        start = time.perf_counter()
+        if kind == "begin":
+            _, _, records, field_size = job
+            path = os.path.join(directory, f"{name}.mp4")
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*HIGHLIGHT_CODEC), fps, size)
+            stats = {"clip": name, "path": path, "frames": 0, "rally_frames": 0, "encode_s": 0.0,
+                     "started": time.perf_counter()}
+            if records is not None and len(records):
+                # Regenerate the rally from its state records with the regular drawing code
+                replay = InstantReplay(ReplayBuffer.from_frames(records), *field_size, interactive=False)
+                replay.start()
+                field = pygame.Surface(field_size)
+                small = pygame.Surface(size)
+                step = max(1, round(FPS / fps))
+                shown = 0
+                while True:
+                    if shown % step == 0:
+                        replay.draw(field)
+                        pygame.transform.smoothscale(field, size, small)
+                        rgb = np.frombuffer(pygame.image.tobytes(small, "RGB"), dtype=np.uint8)
+                        write(rgb.reshape(height, width, 3), cv2.COLOR_RGB2BGR)
+                    shown += 1
+                    if not replay.update():
+                        break
+                stats["rally_frames"] = stats["frames"]
+        elif kind == "frame":
+            if writer is not None:
+                write(frames[job[2]], cv2.COLOR_BGRA2BGR)
+            released.put(job[2])
+        elif kind == "end" and writer is not None:
+            writer.release()
+            writer = None
+            stats["encode_s"] += time.perf_counter() - start
+            stats["dropped"] = job[2]
+            stats["wall_s"] = time.perf_counter() - stats.pop("started")
+            stats["video_s"] = stats["frames"] / fps
+            stats["bytes"] = os.path.getsize(stats["path"]) if os.path.exists(stats["path"]) else 0
+            results.put(stats)
+            continue
+        if stats is not None:
+            stats["encode_s"] += time.perf_counter() - start
+    if writer is not None:
+        writer.release()
+    del frames
+    shm.close()
+
+
+class HighlightExporter:
+    """Game-side handle for the encoder process; every call returns without waiting."""
+    def __init__(self, directory, field_size, fps=HIGHLIGHT_FPS, slots=HIGHLIGHT_FRAME_SLOTS):
+        field_width, field_height = field_size
+        self.field_size = field_size
+        self.size = width, height = (_even(HIGHLIGHT_WIDTH), _even(HIGHLIGHT_WIDTH * field_height / field_width))
+        self.fps = fps
+        self.directory = directory
+        # Live frames in flight; this is also the memory ceiling of the pipeline. Each slot is
+        # wrapped in a Surface so the display can be scaled straight into shared memory.
+        frame_bytes = height * width * 4
+        self.shm = shared_memory.SharedMemory(create=True, size=slots * frame_bytes)
+        self.slot_surfaces = [pygame.image.frombuffer(self.shm.buf[i * frame_bytes:(i + 1) * frame_bytes],
+                                                      self.size, "BGRA") for i in range(slots)]
+        self.free_slots = list(range(slots))
+        # A fresh interpreter rather than a fork of one with a display and camera threads open
+        context = multiprocessing.get_context("spawn")
+        self.jobs = context.Queue(slots + HIGHLIGHT_CONTROL_JOBS)
+        self.results = context.Queue()
+        self.released = context.Queue()  # Slots the encoder is done with
+        self.process = context.Process(target=encoder_main, name="highlight-encoder", daemon=True,
+                                       args=(self.jobs, self.results, self.released, self.shm.name, slots,
+                                             directory, self.size, fps))
+        self.clip = None
+        self.capture_until = 0.0
+        self.next_capture = 0.0
+        self.dropped = 0
+        self.small = None
+        self.pending = []  # Jobs that must not be dropped, retried from poll() while the queue is full
+
+    def start(self):
+        self.process.start()
+
+    @property
+    def active(self):
+        return self.clip is not None
+
+    def begin(self, name, history=None):
+        """Start a clip with the rally that just ended, then capture the screen for a while."""
+        if self.clip:
+            self.finish()
+        if self.pending:
+            log.warning("Highlight encoder is busy, skipping clip", extra=fields(clip=name))
+            return
+        records = None
+        if history is not None:
+            first, end = history.last_rally()
+            records = history.copy_range(first, end)
+        try:
+            self.jobs.put_nowait(("begin", name, records, self.field_size))
+        except queue.Full:
+            log.warning("Highlight encoder is busy, skipping clip", extra=fields(clip=name))
+            return
+        self.clip = name
+        self.dropped = 0
+        now = time.monotonic()
+        self.capture_until = now + HIGHLIGHT_LIVE_SECONDS
+        self.next_capture = now
+
+    def capture(self, surface):
+        """Offer the frame just drawn; taken at the clip's frame rate, dropped if the encoder lags."""
+        if not self.clip:
+            return
+        now = time.monotonic()
+        if now >= self.capture_until:
+            self.finish()
+            return
+        if now < self.next_capture:
+            return
+        self.next_capture += 1.0 / self.fps
+        while True:
+            try:
+                self.free_slots.append(self.released.get_nowait())
+            except queue.Empty:
+                break
+        if not self.free_slots:
+            self.dropped += 1
+            DROPPED.inc()
+            return
+        slot = self.free_slots.pop()
+        target = self.slot_surfaces[slot]
+        try:
+            pygame.transform.scale(surface, self.size, target)
+        except ValueError:
+            # Display format differs from the slot's: scale first, then let blit convert
+            if self.small is None:
+                self.small = pygame.Surface(self.size)
+            pygame.transform.scale(surface, self.size, self.small)
+            target.blit(self.small, (0, 0))
+        try:
+            self.jobs.put_nowait(("frame", self.clip, slot))
+        except queue.Full:
+            self.free_slots.append(slot)
+            self.dropped += 1
+            DROPPED.inc()
+
+    def finish(self):
+        """Close the current clip (also called when the winner screen is left early)."""
+        if not self.clip:
+            return
+        self.pending.append(("end", self.clip, self.dropped))
+        self.clip = None
+        self._flush()
+
+    def _flush(self):
+        while self.pending:
+            try:
+                self.jobs.put_nowait(self.pending[0])
+            except queue.Full:
+                return
+            self.pending.pop(0)
+
+    def poll(self):
+        """Call once per frame: hands over waiting jobs and logs the stats of finished clips."""
+        self._flush()
+        while True:
+            try:
+                stats = self.results.get_nowait()
+            except queue.Empty:
+                return
+            CLIPS.inc()
+            speed = stats["video_s"] / stats["encode_s"] if stats["encode_s"] > 0 else 0.0
+            log.info("Saved highlight %s", stats["path"],
+                     extra=fields(frames=stats["frames"], rally_frames=stats["rally_frames"],
+                                  dropped=stats["dropped"], video_s=stats["video_s"],
+                                  encode_s=stats["encode_s"], wall_s=stats["wall_s"],
+                                  encode_speed=f"{speed:.1f}x", kb=stats["bytes"] // 1024))
+
+    def close(self, timeout=HIGHLIGHT_CLOSE_TIMEOUT):
+        """Finish the open clip and give the encoder a moment to write it out."""
+        self.finish()
+        if self.process.is_alive():
+            try:
+                for job in self.pending + [None]:
+                    self.jobs.put(job, timeout=timeout)
+            except queue.Full:
+                pass
+            self.pending = []
+            self.process.join(timeout)
+            if self.process.is_alive():
+                log.warning("Highlight encoder did not finish in time, stopping it")
+                self.process.terminate()
+        self.poll()
+        self.slot_surfaces = []  # They hold views of the shared memory
+        self.shm.close()
+        self.shm.unlink()
@@ -0,0 +1,146 @@
+"""Idle power mode for the menu and winner screens.
+
+After IDLE_TIMEOUT seconds without input the screens redraw at IDLE_FPS and
+every camera except the first is released. The first camera is only read
+every IDLE_PREVIEW_INTERVAL seconds to look for a hand. Any input or a
+detected hand wakes the game: full frame rate, and the released cameras
+reopen in the background.
+
+CPU time (and package energy where Linux exposes RAPL counters) is tracked
+separately for awake and idle time on these screens, to report the savings.
+"""
+import time
+from utils.constants import *
+from utils.config import settings
+from utils.log import get_logger, fields
+from utils.telemetry import metrics
+
+IDLE_GAUGE = metrics.gauge("pong_idle", "1 while the menu/winner screens are in idle power mode")
+WAKES = {reason: metrics.counter("pong_idle_wakes_total", "Wake-ups from idle power mode", reason=reason)
+         for reason in ("input", "hand")}
+
+RAPL_ENERGY = "/sys/class/powercap/intel-rapl:0/energy_uj"
+RAPL_RANGE = "/sys/class/powercap/intel-rapl:0/max_energy_range_uj"
+
+log = get_logger("idle")
+
+WAKE_EVENTS = None  # pygame event types that count as input, filled in on first use
+
+def _read_int(path):
+    try:
+        with open(path) as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return None
+
+class IdleMode:
+    """Decides when the menu/winner screens go idle and wakes them again."""
+    def __init__(self, timeout=IDLE_TIMEOUT):
+        self.timeout = timeout
+        self.idle = False
+        self.last_activity = time.monotonic()
+        self.preview = None  # Camera read at a low rate for hands while idle
+        self.next_preview = 0.0
+        self.paused = []  # Cameras released while idle
+        # Per mode (False = awake, True = idle): [wall seconds, CPU seconds, joules or None]
+        self.usage = {False: [0.0, 0.0, 0.0], True: [0.0, 0.0, 0.0]}
+        self.rapl_range = _read_int(RAPL_RANGE)
+        self.sample = None
+
+    @property
+    def fps(self):
+        return IDLE_FPS if self.idle else settings.fps
+
+    def _sample(self):
+        return time.monotonic(), time.process_time(), _read_int(RAPL_ENERGY)
+
+    def _account(self, tracking):
+        """Add the time since the last frame to the current mode's totals."""
+        sample = self._sample() if tracking else None
+        if self.sample and sample:
+            usage = self.usage[self.idle]
+            usage[0] += sample[0] - self.sample[0]
+            usage[1] += sample[1] - self.sample[1]
+            if usage[2] is not None and sample[2] is not None and self.sample[2] is not None:
+                energy = sample[2] - self.sample[2]
+                if energy < 0 and self.rapl_range:
+                    energy += self.rapl_range  # Counter wrapped
+                usage[2] += energy / 1e6
+            else:
+                usage[2] = None
+        self.sample = sample
+
+    def handle_events(self, events):
+        """Any key, click or mouse movement counts as activity and wakes the game."""
+        global WAKE_EVENTS
+        if WAKE_EVENTS is None:
+            import pygame
+            WAKE_EVENTS = {pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION, pygame.JOYBUTTONDOWN}
+        if any(event.type in WAKE_EVENTS for event in events):
+            self.last_activity = time.monotonic()
+            if self.idle:
+                self.wake("input")
+
+    def update(self, enabled, caps=(), detector=None):
+        """Call once per frame; enabled is False while a match is being played.
+
+        caps and detector are only used once loading finished; captures
+        that can't be paused (replays) are left alone.
+        """
+        self._account(enabled)
+        now = time.monotonic()
+        if not enabled:
+            self.last_activity = now
+            if self.idle:
+                self.wake("input")
+            return
+        if not self.idle:
+            if now - self.last_activity >= self.timeout:
+                self.sleep(caps, detector)
+            return
+
+        if self.preview and detector and now >= self.next_preview:
+            self.next_preview = now + IDLE_PREVIEW_INTERVAL
+            ret, frame = self.preview.read()
+            if ret:
+                detector.close_retired()
+                result, _ = detector.process_frame(frame, 0)
+                if result and result.multi_hand_landmarks:
+                    self.last_activity = now
+                    self.wake("hand")
+
+    def sleep(self, caps, detector):
+        self.idle = True
+        IDLE_GAUGE.set(1)
+        # Players can share a capture; each one is paused once
+        pausable = list(dict.fromkeys(cap for cap in caps if hasattr(cap, "pause")))
+        # The first camera stays open for the hand preview; the rest stop streaming
+        self.preview = pausable[0] if pausable and detector else None
+        self.paused = [cap for cap in pausable if cap is not self.preview and cap.health == "ok"]
+        for cap in self.paused:
+            cap.pause()
+        self.next_preview = time.monotonic() + IDLE_PREVIEW_INTERVAL
+        log.info("Entering idle mode", extra=fields(after=self.timeout, paused_cameras=len(self.paused)))
+
+    def wake(self, reason):
+        self.idle = False
+        IDLE_GAUGE.set(0)
+        WAKES[reason].inc()
+        for cap in self.paused:
+            cap.resume()
+        self.paused = []
+        log.info("Leaving idle mode", extra=fields(reason=reason))
+
+    def report(self):
+        """One line comparing CPU (and energy) use awake vs idle on the menu/winner screens."""
+        awake, idle = self.usage[False], self.usage[True]
+        if idle[0] <= 0 or awake[0] <= 0:
+            return None
+        awake_cpu, idle_cpu = awake[1] / awake[0] * 100, idle[1] / idle[0] * 100
+        saving = (1 - idle_cpu / awake_cpu) * 100 if awake_cpu > 0 else 0.0
+        text = (f"Idle mode: {idle[0]:.0f} s idle at {idle_cpu:.1f}% CPU vs {awake_cpu:.1f}% "
+                f"awake on the menu ({saving:.0f}% less)")
+        if awake[2] is not None and idle[2] is not None:
+            awake_watts, idle_watts = awake[2] / awake[0], idle[2] / idle[0]
+            text += f"; package power {idle_watts:.1f} W vs {awake_watts:.1f} W"
+        return text
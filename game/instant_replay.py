@@ -0,0 +1,147 @@
+"""Instant replay of the last rally.
+
+ReplayBuffer is a preallocated NumPy ring holding one record per simulation
+tick (ball position, velocity and speed, paddle positions, scores), so its
+memory is fixed at INSTANT_REPLAY_SECONDS of play no matter how long a
+rally runs. InstantReplay plays a rally back from the buffer into its own
+Ball and Paddle objects, so the live GameLogic is never touched.
+"""
+import numpy as np
+import pygame
+from utils.constants import *
+from utils.config import settings
+from ui.components import Text
+from .objects import Ball, create_paddles
+
+FRAME_DTYPE = np.dtype([
+    ("ball", np.float32, 2),       # Centre x, y
+    ("velocity", np.float32, 2),
+    ("speed", np.float32),
+    ("hit_count", np.int16),
+    ("flash", np.int16),           # Ball.speed_flash_timer
+    ("paddles", np.float32, MAX_PLAYERS),  # Paddle centre along its edge by player, NaN without the player
+    ("scores", np.int16, MAX_PLAYERS),
+])
+
+class ReplayBuffer:
+    """Fixed-size ring of per-tick game state, filled by GameLogic.update_ball."""
+    def __init__(self, seconds=INSTANT_REPLAY_SECONDS, rate=FPS):
+        self.frames = np.zeros(int(seconds * rate), dtype=FRAME_DTYPE)
+        self.frames["paddles"] = np.nan
+        self.total = 0        # Ticks recorded so far; the next one goes to total % capacity
+        self.rally_start = 0  # Tick at which the current rally began
+        self.finished_rally = (0, 0)  # (first, end) ticks of the last rally that ended
+
+    @property
+    def capacity(self):
+        return len(self.frames)
+
+    @property
+    def nbytes(self):
+        return self.frames.nbytes
+
+    def record(self, game_logic):
+        frame = self.frames[self.total % self.capacity]
+        ball = game_logic.ball
+        frame["ball"] = ball.rect.center
+        frame["velocity"] = (ball.speed_x, ball.speed_y)
+        frame["speed"] = ball.current_speed
+        frame["hit_count"] = ball.hit_count
+        frame["flash"] = ball.speed_flash_timer
+        count = len(game_logic.paddles)
+        frame["paddles"][:count] = [paddle.position for paddle in game_logic.paddles]
+        frame["scores"][:count] = game_logic.scores
+        self.total += 1
+
+    def start_rally(self):
+        """Called on every ball reset: the rally so far becomes the one to replay."""
+        self.finished_rally = (self.rally_start, self.total)
+        self.rally_start = self.total
+
+    def last_rally(self):
+        """(first, end) ticks of the last finished rally, clipped to what the ring still holds."""
+        first, end = self.finished_rally
+        return max(first, self.total - self.capacity), end
+
+    def __getitem__(self, tick):
+        return self.frames[tick % self.capacity]
+
+    def copy_range(self, first, end):
+        """Records for ticks first..end-1 as a new contiguous array, oldest first."""
+        return self.frames.take(range(first, end), mode="wrap")
+
+    @classmethod
+    def from_frames(cls, frames):
+        """A buffer holding exactly these records as one finished rally."""
+        buffer = cls.__new__(cls)
+        buffer.frames = frames
+        buffer.total = len(frames)
+        buffer.rally_start = buffer.total
+        buffer.finished_rally = (0, buffer.total)
+        return buffer
+
+class InstantReplay:
+    """Plays the last rally back, slowing down for its final moments.
+
+    interactive=False leaves out the on-screen hints (used for exported clips).
+    """
+    def __init__(self, buffer, width, height, interactive=True):
+        self.buffer = buffer
+        self.interactive = interactive
+        self.width = width
+        self.height = height
+        # Stand-ins drawn with the regular Ball/Paddle code; the frames say which players take part
+        self.ball = Ball(width // 2, height // 2)
+        self.paddles = create_paddles(MAX_PLAYERS, width, height)
+        self.first = self.end = 0
+        self.cursor = 0.0
+        self.banner = Text("INSTANT REPLAY", settings.font_size // 2, YELLOW)
+        self.hint = Text("SPACE to skip", 24, GRAY)
+        self.score_text = Text("", settings.font_size // 2, WHITE)
+
+    def start(self):
+        """Begin playing the rally that just ended; False if there is nothing to show."""
+        self.first, self.end = self.buffer.last_rally()
+        self.cursor = float(self.first)
+        return self.end > self.first
+
+    @property
+    def slow_motion(self):
+        return self.end - self.cursor <= INSTANT_REPLAY_SLOWMO_TICKS
+
+    def update(self):
+        """Advance playback; returns False once the rally has been shown."""
+        self.cursor += INSTANT_REPLAY_SLOWMO_SPEED if self.slow_motion else 1.0
+        return self.cursor < self.end
+
+    def draw(self, screen):
+        tick = min(int(self.cursor), self.end - 1)
+        frame = self.buffer[tick]
+        ball = self.ball
+        ball.rect.center = (int(frame["ball"][0]), int(frame["ball"][1]))
+        ball.current_speed = float(frame["speed"])
+        ball.hit_count = int(frame["hit_count"])
+        ball.speed_flash_timer = int(frame["flash"])
+        # Rebuild the trail from earlier ticks of the same rally
+        trail_length = min(15, int(ball.current_speed * 1.5)) if ball.hit_count else 10
+        first = max(self.first, tick - trail_length + 1)
+        ball.trail_positions = [tuple(int(v) for v in self.buffer[t]["ball"]) for t in range(first, tick + 1)]
+        positions = frame["paddles"]
+        players = int(np.count_nonzero(~np.isnan(positions)))
+
+        screen.fill(BLACK)
+        for paddle, position in zip(self.paddles[:players], positions):
+            paddle.position = int(position)
+            paddle.draw(screen)
+        ball.draw(screen)
+
+        self.banner.draw(screen, self.width // 2, 60, center=True)
+        if self.slow_motion and (not self.interactive or pygame.time.get_ticks() // 250 % 2 == 0):
+            # Blinking slow-motion marker
+            pygame.draw.circle(screen, RED, (self.width // 2 + self.banner.rect.width // 2 + 30, 60), 8)
+        score = " : ".join(str(score) for score in frame["scores"][:players])
+        if score != self.score_text.text:
+            self.score_text.update_text(score)
+        self.score_text.draw(screen, self.width // 2, 120, center=True)
+        if self.interactive:
+            self.hint.draw(screen, self.width // 2, self.height - 40, center=True)
@@ -0,0 +1,76 @@
+import numpy as np
+
+LANDMARK_COUNT = 21  # MediaPipe hand landmarks per hand
+THUMB_TIP = 4
+INDEX_TIP = 8
+# Bones between landmarks, as in mediapipe's HAND_CONNECTIONS
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),                # thumb
+    (0, 5), (5, 6), (6, 7), (7, 8),                # index
+    (5, 9), (9, 10), (10, 11), (11, 12),           # middle
+    (9, 13), (13, 14), (14, 15), (15, 16),         # ring
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),  # pinky and palm
+)
+
+class Landmark:
+    """Normalized landmark with the attributes GestureDetector and mp drawing_utils read."""
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x, y, z=0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def HasField(self, name):
+        # Recorded landmarks carry no visibility/presence scores
+        return False
+
+class HandLandmarks:
+    """Stand-in for mediapipe's NormalizedLandmarkList built from a (21, 3) array."""
+    __slots__ = ('landmark',)
+
+    def __init__(self, landmark):
+        self.landmark = landmark
+
+class HandResult:
+    """Stand-in for the result object returned by Hands.process."""
+    __slots__ = ('multi_hand_landmarks',)
+
+    def __init__(self, multi_hand_landmarks=None):
+        self.multi_hand_landmarks = multi_hand_landmarks
+
+def landmarks_to_array(hand_landmarks):
+    """Convert one hand's landmarks to a float32 (21, 3) array."""
+    return np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32)
+
+def array_to_landmarks(points):
+    """Convert a (21, 3) array back into a landmark list."""
+    return HandLandmarks([Landmark(float(x), float(y), float(z)) for x, y, z in points])
+
+def result_from_array(points):
+    """Build a Hands-style result from a (21, 3) array, or an empty one for NaN/None."""
+    if points is None or np.isnan(points).any():
+        return HandResult(None)
+    return HandResult([array_to_landmarks(points)])
+
+def synthetic_hand(center_y, pinched=True, center_x=0.5, scale=0.18):
+    """Plausible (21, 3) hand pose whose index tip sits at center_y.
+
+    Used for benchmarks and synthetic input when no recording is available.
+    """
+    # Rough open-hand layout in hand-local coordinates (wrist at origin, fingers up)
+    base = np.array([
+        (0.00, 0.00), (-0.20, -0.10), (-0.35, -0.25), (-0.45, -0.40), (-0.50, -0.55),   # wrist, thumb
+        (-0.15, -0.45), (-0.17, -0.65), (-0.18, -0.80), (-0.19, -0.95),                 # index
+        (0.00, -0.48), (0.00, -0.70), (0.00, -0.86), (0.00, -1.00),                     # middle
+        (0.13, -0.45), (0.14, -0.64), (0.15, -0.78), (0.16, -0.90),                     # ring
+        (0.25, -0.40), (0.28, -0.55), (0.30, -0.66), (0.32, -0.76),                     # pinky
+    ], dtype=np.float32)
+    if pinched:
+        # Bring thumb tip onto the index tip
+        base[THUMB_TIP] = base[INDEX_TIP] + (0.02, 0.02)
+    points = np.zeros((LANDMARK_COUNT, 3), dtype=np.float32)
+    points[:, :2] = base * scale
+    points[:, 0] += center_x - points[INDEX_TIP, 0]
+    points[:, 1] += center_y - points[INDEX_TIP, 1]
+    return points
@@ -0,0 +1,314 @@
+"""Append-only match log with small per-day leaderboard indexes.
+
+Every finished match is appended to matches.bin as one fixed-size record
+(MATCH_DTYPE, 32 bytes), so the log reads back as a NumPy structured array
+(memory-mapped, one column per field) and tens of thousands of matches stay a
+few hundred KB. Appending and index upkeep happen on a writer thread; the
+game only queues a tuple.
+
+Next to the log, index/ holds the top LEADERBOARD_SIZE entries for longest
+rally, top speed and win streak: one JSON file per day plus all.json, and
+state.json with the number of records covered and each side's running
+streak. A leaderboard screen reads one or two of these small files instead
+of scanning the history. Missing or stale indexes are rebuilt (or caught up
+from the covered record count) when the log is opened.
+
+Print the leaderboards of a stats directory:
+    python -m game.match_stats stats [--day 2026-10-19] [--rebuild]
+"""
+import argparse
+import datetime
+import json
+import os
+import queue
+import threading
+import time
+import numpy as np
+from utils.constants import *
+from utils.log import get_logger, setup_logging, fields
+from utils.telemetry import metrics
+
+log = get_logger("stats")
+
+MATCHES_LOGGED = metrics.counter("pong_stats_matches_logged_total", "Matches appended to the match log")
+
+MAGIC = b"PONGSTAT"
+VERSION = 1
+HEADER = np.dtype([("magic", "S8"), ("version", "<u4"), ("record_size", "<u4")])
+
+MATCH_DTYPE = np.dtype([
+    ("ended", "<f8"),          # Unix time the match ended
+    ("day", "<i4"),            # Local calendar day (date.toordinal) the match ended
+    ("duration", "<f4"),       # Seconds from start to the winning point
+    ("table", "<u2"),          # Table number on a tournament host, otherwise 0
+    ("mode", "u1"),            # Index into MODES
+    ("winner", "u1"),          # Winning player, 1-4
+    ("scores", "<u2", 2),      # Players 1 and 2; in an arena the winner's and the best other score
+    ("longest_rally", "<u2"),  # Most paddle hits in one rally
+    ("streak", "<u2"),         # Consecutive wins of the winning side at this table, this one included
+    ("top_speed", "<f4"),      # Fastest ball speed reached
+])
+
+MODES = ("local", "single", "network", "tables", "arena")
+
+BOARDS = ("rally", "speed", "streak")  # Longest rally, top speed, win streak
+
+
+def _day_name(ordinal):
+    return datetime.date.fromordinal(int(ordinal)).isoformat()
+
+
+def read_matches(directory):
+    """Every logged match as a read-only structured array (empty if there is no log)."""
+    path = os.path.join(directory, "matches.bin")
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return np.zeros(0, dtype=MATCH_DTYPE)
+    # A record cut short by a crash is ignored
+    count = (size - HEADER.itemsize) // MATCH_DTYPE.itemsize
+    if count <= 0:
+        return np.zeros(0, dtype=MATCH_DTYPE)
+    header = np.fromfile(path, dtype=HEADER, count=1)[0]
+    if header["magic"] != MAGIC or header["version"] != VERSION or header["record_size"] != MATCH_DTYPE.itemsize:
+        raise ValueError(f"{path} is not a version {VERSION} match log")
+    return np.memmap(path, dtype=MATCH_DTYPE, mode="r", offset=HEADER.itemsize, shape=(count,))
+
+
+def load_leaderboards(directory, day=None):
+    """Top entries per board for one day (a date, default today) or for all time (day="all").
+
+    Returns {"rally": [...], "speed": [...], "streak": [...]}, best first; each
+    entry is a dict with value, record, table, mode, winner and ended.
+    """
+    if day is None:
+        day = datetime.date.today()
+    name = "all" if day == "all" else day.isoformat()
+    try:
+        with open(os.path.join(directory, "index", f"{name}.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {board: [] for board in BOARDS}
+
+
+def _write_json(path, data):
+    """Replace path atomically, so readers never see a half-written index."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+class LeaderboardIndex:
+    """In-memory top-N tables mirrored to index/*.json."""
+    def __init__(self, directory, size=LEADERBOARD_SIZE):
+        self.directory = os.path.join(directory, "index")
+        self.size = size
+        self.records = 0   # Log records reflected in the index
+        self.streaks = {}  # "table" -> [winning side, streak length, first record of the streak]
+        self.days = {}     # Day name or "all" -> boards, only the ones touched or loaded
+        self.dirty = set()
+
+    def load(self):
+        """Read state.json; False if the index has to be rebuilt."""
+        try:
+            with open(os.path.join(self.directory, "state.json")) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if state.get("version") != VERSION or state.get("size") != self.size:
+            return False
+        self.records = state["records"]
+        self.streaks = state["streaks"]
+        return True
+
+    def boards(self, name):
+        boards = self.days.get(name)
+        if boards is None:
+            try:
+                with open(os.path.join(self.directory, f"{name}.json")) as f:
+                    boards = json.load(f)
+            except (OSError, ValueError):
+                boards = {board: [] for board in BOARDS}
+            self.days[name] = boards
+        return boards
+
+    def _insert(self, board, entry, key):
+        """Keep entry if it ranks; key identifies an entry that may improve later (a running streak)."""
+        for i, other in enumerate(board):
+            if other["key"] == key:
+                if entry["value"] <= other["value"]:
+                    return False
+                del board[i]
+                break
+        else:
+            if len(board) >= self.size and entry["value"] <= board[-1]["value"]:
+                return False
+        entry["key"] = key
+        board.append(entry)
+        board.sort(key=lambda e: (-e["value"], e["record"]))
+        del board[self.size:]
+        return True
+
+    def add(self, index, match):
+        """Fold record number index into the boards; the streak is taken from the index state."""
+        if index < self.records:
+            return match["streak"]  # Already covered (catching up after a crash)
+        table = str(int(match["table"]))
+        winner = int(match["winner"])
+        side, length, first = self.streaks.get(table, (0, 0, index))
+        if side == winner:
+            length += 1
+        else:
+            length, first = 1, index
+        self.streaks[table] = [winner, length, first]
+
+        base = {"record": index, "table": int(match["table"]), "mode": MODES[int(match["mode"])],
+                "winner": winner, "ended": float(match["ended"])}
+        values = {"rally": int(match["longest_rally"]), "speed": round(float(match["top_speed"]), 2),
+                  "streak": length}
+        for name in (_day_name(match["day"]), "all"):
+            boards = self.boards(name)
+            for board, value in values.items():
+                if value <= 0:
+                    continue
+                # A streak is one entry that grows while it lasts
+                key = first if board == "streak" else index
+                if self._insert(boards[board], dict(base, value=value), key):
+                    self.dirty.add(name)
+        self.records = index + 1
+        return length
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        for name in self.dirty:
+            _write_json(os.path.join(self.directory, f"{name}.json"), self.days[name])
+        self.dirty.clear()
+        # Written last: after a crash in between, the boards are caught up again from here
+        _write_json(os.path.join(self.directory, "state.json"),
+                    {"version": VERSION, "size": self.size, "records": self.records, "streaks": self.streaks})
+
+    def rebuild(self, matches):
+        """Recreate every index file from the full log."""
+        self.records = 0
+        self.streaks = {}
+        self.days = {}
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.directory, name))
+        for index in range(len(matches)):
+            self.add(index, matches[index])
+        self.dirty = set(self.days)
+        self.save()
+
+
+class MatchLog:
+    """Appends finished matches to the log on a background thread; record() never blocks."""
+    def __init__(self, directory=STATS_DIR):
+        self.directory = directory
+        self.path = os.path.join(directory, "matches.bin")
+        self.index = LeaderboardIndex(directory)
+        self.records = 0
+        self.queue = queue.Queue()
+        self.thread = None
+        self.file = None
+
+    def open(self):
+        """Create the log if needed, bring the indexes up to date and start the writer."""
+        os.makedirs(self.directory, exist_ok=True)
+        matches = read_matches(self.directory)
+        start = time.perf_counter()
+        if not self.index.load() or self.index.records > len(matches):
+            self.index.rebuild(matches)
+            log.info("Rebuilt leaderboard indexes", extra=fields(matches=len(matches),
+                                                                  ms=round((time.perf_counter() - start) * 1000)))
+        elif self.index.records < len(matches):
+            for index in range(self.index.records, len(matches)):
+                self.index.add(index, matches[index])
+            self.index.save()
+        self.records = len(matches)
+        del matches
+
+        new = not os.path.exists(self.path) or os.path.getsize(self.path) < HEADER.itemsize
+        self.file = open(self.path, "r+b" if not new else "wb")
+        if new:
+            np.array([(MAGIC, VERSION, MATCH_DTYPE.itemsize)], dtype=HEADER).tofile(self.file)
+        # Drop a partial record left by a crash, so new records stay aligned
+        self.file.truncate(HEADER.itemsize + self.records * MATCH_DTYPE.itemsize)
+        self.file.seek(0, os.SEEK_END)
+        self.thread = threading.Thread(target=self._run, name="match-log", daemon=True)
+        self.thread.start()
+        return self
+
+    def record(self, game_logic, winner, mode="local", table=0):
+        """Queue the match game_logic just finished; call before restart_game()."""
+        ended = time.time()
+        self.queue.put((ended, datetime.date.fromtimestamp(ended).toordinal(),
+                        time.monotonic() - game_logic.match_started, table, MODES.index(mode), winner,
+                        self._scores(game_logic.scores, winner), game_logic.longest_rally, 0,
+                        game_logic.top_speed))
+
+    @staticmethod
+    def _scores(scores, winner):
+        if len(scores) == 2:
+            return tuple(scores)
+        others = scores[:winner - 1] + scores[winner:]
+        return scores[winner - 1], max(others)
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.file.flush()
+                self.index.save()
+                break
+            try:
+                match = np.array([item], dtype=MATCH_DTYPE)[0]
+                match["streak"] = self.index.add(self.records, match)
+                self.file.write(match.tobytes())
+                self.records += 1
+                MATCHES_LOGGED.inc()
+                # A burst (many tables finishing at once) is written out once
+                if self.queue.empty():
+                    self.file.flush()
+                    self.index.save()
+            except (OSError, ValueError) as e:
+                log.error("Could not log match: %s", e)
+
+    def close(self):
+        if self.thread:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the leaderboards of a match log")
+    parser.add_argument("directory", nargs="?", default=STATS_DIR)
+    parser.add_argument("--day", type=datetime.date.fromisoformat, help="YYYY-MM-DD (default: today)")
+    parser.add_argument("--rebuild", action="store_true", help="Recreate the indexes from the log first")
+    args = parser.parse_args()
+    setup_logging(fmt=LOG_CLI_FORMAT)
+
+    if args.rebuild:
+        start = time.perf_counter()
+        matches = read_matches(args.directory)
+        LeaderboardIndex(args.directory).rebuild(matches)
+        log.info("Rebuilt indexes from %d matches in %.0f ms", len(matches), (time.perf_counter() - start) * 1000)
+
+    day = args.day or datetime.date.today()
+    for title, which in ((day.isoformat(), day), ("All time", "all")):
+        start = time.perf_counter()
+        boards = load_leaderboards(args.directory, which)
+        log.info("%s (loaded in %.2f ms)", title, (time.perf_counter() - start) * 1000)
+        for board, entries in boards.items():
+            log.info("  %s: %s", board, ", ".join(
+                f"{entry['value']} (P{entry['winner']}, table {entry['table']})" for entry in entries) or "-")
+
+
+if __name__ == "__main__":
+    main()
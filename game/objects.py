@@ -2,14 +2,19 @@ import pygame
 import random
 import math
 from utils.constants import *
+from utils.log import get_logger, fields
+from utils.assets import assets
+
+log = get_logger("ball", rate_limit=True)
 
 class Ball:
-    def __init__(self, x, y):
+    def __init__(self, x, y, rng=None, speed=BALL_SPEED):
         self.rect = pygame.Rect(x - BALL_SIZE // 2, y - BALL_SIZE // 2, BALL_SIZE, BALL_SIZE)
-        self.base_speed = BALL_SPEED
-        self.current_speed = BALL_SPEED
-        self.speed_x = self.current_speed * random.choice((1, -1))
-        self.speed_y = self.current_speed * random.choice((1, -1))
+        self.rng = rng or random  # Seeded random.Random for deterministic (networked) play
+        self.base_speed = speed
+        self.current_speed = self.base_speed
+        self.speed_x = self.current_speed * self.rng.choice((1, -1))
+        self.speed_y = self.current_speed * self.rng.choice((1, -1))
         self.hit_count = 0  # Track paddle hits
         self.speed_flash_timer = 0  # For visual feedback
         
@@ -33,12 +38,20 @@ class Ball:
     def bounce_y(self):
         self.speed_y *= -1
     
-    def bounce_x(self):
+    def bounce_x(self, announce=True):
         """Bounce off paddle and increase speed."""
         self.speed_x *= -1
-        self.increase_speed()
+        self.increase_speed(announce)
+    
+    def bounce_off(self, paddle, announce=True):
+        """Bounce off any paddle (top and bottom ones flip the vertical direction) and increase speed."""
+        if paddle.vertical:
+            self.bounce_x(announce)
+        else:
+            self.speed_y *= -1
+            self.increase_speed(announce)
     
-    def increase_speed(self):
+    def increase_speed(self, announce=True):
         """Increase ball speed after paddle hit."""
         self.hit_count += 1
         
@@ -57,14 +70,17 @@ class Ball:
         # Trigger visual feedback
         self.speed_flash_timer = SPEED_FLASH_DURATION
         
-        print(f"Ball speed increased! Hit #{self.hit_count}, Speed: {self.current_speed:.1f}")
+        if announce:
+            log.info("Ball speed increased", extra=fields(hit_count=self.hit_count, speed=self.current_speed))
     
-    def reset(self, x, y):
-        """Reset ball to center and restore base speed."""
+    def reset(self, x, y, speed=None):
+        """Reset ball to center and restore base speed (or serve at a new one)."""
         self.rect.center = (x, y)
+        if speed is not None:
+            self.base_speed = speed
         self.current_speed = self.base_speed
-        self.speed_x = self.current_speed * random.choice((1, -1))
-        self.speed_y = self.current_speed * random.choice((1, -1))
+        self.speed_x = self.current_speed * self.rng.choice((1, -1))
+        self.speed_y = self.current_speed * self.rng.choice((1, -1))
         self.hit_count = 0
         self.speed_flash_timer = 0
         self.trail_positions = []
@@ -72,6 +88,8 @@ class Ball:
     
     def get_speed_level(self):
         """Get current speed as a percentage of max speed."""
+        if self.base_speed >= BALL_MAX_SPEED:
+            return 1.0  # Served at top speed, nothing left to gain
         return (self.current_speed - self.base_speed) / (BALL_MAX_SPEED - self.base_speed)
     
     def draw(self, surface):
@@ -113,7 +131,11 @@ class Ball:
             surface.blit(glow_surface, glow_rect.topleft)
         
         # Draw main ball
-        pygame.draw.ellipse(surface, ball_color, self.rect)
+        skin = assets.image("ball", self.rect.size)
+        if skin:
+            surface.blit(skin, self.rect)
+        else:
+            pygame.draw.ellipse(surface, ball_color, self.rect)
         
         # Draw speed indicator dots around ball
         if self.hit_count > 0:
@@ -124,27 +146,63 @@ class Ball:
                 pygame.draw.circle(surface, SPEED_INDICATOR_COLOR, (int(dot_x), int(dot_y)), 3)
 
 class Paddle:
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y - PADDLE_HEIGHT // 2, PADDLE_WIDTH, PADDLE_HEIGHT)
-        self.target_y = float(y)
-        self.smooth_y = float(y)
-        self.last_valid_y = float(y)
+    """A paddle on one edge of the field.
+
+    Left and right paddles (x is their left edge, y their centre) move
+    vertically. Top and bottom paddles lie flat (x is their centre, y their top
+    edge) and move horizontally; for them the *_y positions below are x
+    coordinates, i.e. positions along the paddle's track.
+    """
+    def __init__(self, x, y, side="left"):
+        self.side = side
+        self.vertical = side in ("left", "right")
+        if self.vertical:
+            self.rect = pygame.Rect(x, y - PADDLE_HEIGHT // 2, PADDLE_WIDTH, PADDLE_HEIGHT)
+            position = y
+        else:
+            self.rect = pygame.Rect(x - PADDLE_HEIGHT // 2, y, PADDLE_HEIGHT, PADDLE_WIDTH)
+            position = x
+        self.target_y = float(position)
+        self.smooth_y = float(position)
+        self.last_valid_y = float(position)
+    
+    @property
+    def position(self):
+        """Centre of the paddle along its track."""
+        return self.rect.centery if self.vertical else self.rect.centerx
+    
+    @position.setter
+    def position(self, value):
+        if self.vertical:
+            self.rect.centery = value
+        else:
+            self.rect.centerx = value
+    
+    def facing(self, ball):
+        """True while the ball is moving towards this paddle's edge."""
+        if self.vertical:
+            return ball.speed_x < 0 if self.side == "left" else ball.speed_x > 0
+        return ball.speed_y < 0 if self.side == "top" else ball.speed_y > 0
         
     def move_to(self, y, screen_height):
-        """Set target position for smooth movement."""
+        """Set target position for smooth movement (screen_height: length of the paddle's track)."""
         clamped_y = max(PADDLE_HEIGHT // 2, min(y, screen_height - PADDLE_HEIGHT // 2))
         self.target_y = float(clamped_y)
         self.last_valid_y = float(clamped_y)
     
-    def update_smooth_movement(self):
-        """Apply smooth interpolation to paddle movement."""
+    def update_smooth_movement(self, lerp=PADDLE_LERP_FACTOR):
+        """Apply smooth interpolation to paddle movement (lerp: lerp_factor() of the match's paddle speed)."""
         if PADDLE_SMOOTHING_ENABLED:
             # Smooth interpolation towards target
-            self.smooth_y += (self.target_y - self.smooth_y) * PADDLE_LERP_FACTOR
-            self.rect.centery = int(self.smooth_y)
+            self.smooth_y += (self.target_y - self.smooth_y) * lerp
+            position = int(self.smooth_y)
         else:
             # Direct movement (old behavior)
-            self.rect.centery = int(self.target_y)
+            position = int(self.target_y)
+        if self.vertical:
+            self.rect.centery = position
+        else:
+            self.rect.centerx = position
     
     def predict_movement(self):
         """Predict next position if no gesture is detected."""
@@ -152,8 +210,26 @@ class Paddle:
         self.target_y = self.last_valid_y
     
     def draw(self, surface):
+        skin = assets.image("paddle", self.rect.size, rotated=not self.vertical)
+        if skin:
+            surface.blit(skin, self.rect)
+            return
         # Add subtle glow effect for better visibility
         glow_rect = pygame.Rect(self.rect.x - 2, self.rect.y - 2, 
                                self.rect.width + 4, self.rect.height + 4)
         pygame.draw.rect(surface, PADDLE_GLOW_COLOR, glow_rect, border_radius=3)
         pygame.draw.rect(surface, WHITE, self.rect, border_radius=2)
+
+def lerp_factor(paddle_speed=PADDLE_SPEED):
+    """Share of the distance to its target a paddle covers each frame."""
+    return min(1.0, PADDLE_LERP_FACTOR * paddle_speed)
+
+def create_paddles(num_players, width, height):
+    """Paddles for players 1..num_players on the edges named in PLAYER_SIDES."""
+    anchors = {
+        "left": (PADDLE_OFFSET, height // 2),
+        "right": (width - PADDLE_OFFSET - PADDLE_WIDTH, height // 2),
+        "top": (width // 2, PADDLE_OFFSET),
+        "bottom": (width // 2, height - PADDLE_OFFSET - PADDLE_WIDTH),
+    }
+    return [Paddle(*anchors[side], side) for side in PLAYER_SIDES[:num_players]]
@@ -0,0 +1,291 @@
+"""Record camera sessions to disk and replay them through the live capture/Hands interfaces.
+
+A recording is an .npz file holding, for every camera tick, the capture time,
+whether each camera's read succeeded, and each player's (21, 3) hand landmarks (NaN when
+no hand was seen), plus the simulation seed, field size and match rules
+(winning score, ball and paddle speed). Camera frames are optional:
+MJPEG-encoded inside the .npz, or raw BGR in a side file that replay
+memory-maps.
+
+Record while playing:
+    python main.py --record session.npz [--record-frames mjpeg]
+Replay in the game window, or headless as fast as possible:
+    python main.py --replay session.npz
+    python -m game.recording session.npz
+"""
+import argparse
+import os
+import time
+import cv2
+import numpy as np
+from utils.constants import *
+from utils.log import get_logger, setup_logging
+from .landmarks import LANDMARK_COUNT, landmarks_to_array, result_from_array
+
+FRAME_FORMATS = RECORDING_FRAME_FORMATS
+DEFAULT_RULES = {"winning_score": WINNING_SCORE, "ball_speed": BALL_SPEED, "paddle_speed": PADDLE_SPEED}
+NO_HAND = np.full((LANDMARK_COUNT, 3), np.nan, dtype=np.float32)
+
+log = get_logger("recording")
+
+
+def _raw_path(path, player_id):
+    return f"{os.path.splitext(path)[0]}.p{player_id}.raw"
+
+
+class SessionRecorder:
+    """Collects per-tick landmarks (and optionally frames) and writes them on close()."""
+    def __init__(self, path, num_players, seed, field_size, frame_format=None, rules=None):
+        if frame_format not in (None,) + FRAME_FORMATS:
+            raise ValueError(f"Unknown frame format: {frame_format}")
+        self.path = path
+        self.num_players = num_players
+        self.seed = seed
+        self.field_size = field_size
+        self.rules = rules or DEFAULT_RULES  # The GameLogic's winning_score, ball_speed and paddle_speed
+        self.frame_format = frame_format
+        self.timestamps = []
+        self.valid = []
+        self.landmarks = []
+        self.start_time = None
+
+        self.frame_shape = None
+        self.jpeg_chunks = [[] for _ in range(num_players)]
+        self.jpeg_offsets = [[0] for _ in range(num_players)]
+        self.raw_files = None
+        if frame_format == "raw":
+            self.raw_files = [open(_raw_path(path, p), "wb") for p in range(num_players)]
+
+    def record(self, results, frames):
+        """Store one camera tick; frames are None when the camera read failed."""
+        now = time.perf_counter()
+        if self.start_time is None:
+            self.start_time = now
+        self.timestamps.append(now - self.start_time)
+        self.valid.append([frame is not None for frame in frames])
+
+        tick = np.empty((self.num_players, LANDMARK_COUNT, 3), dtype=np.float32)
+        for player_id, result in enumerate(results):
+            hands = result.multi_hand_landmarks if result else None
+            tick[player_id] = landmarks_to_array(hands[0]) if hands else NO_HAND
+        self.landmarks.append(tick)
+
+        if self.frame_format:
+            for player_id, frame in enumerate(frames):
+                self._record_frame(player_id, frame)
+
+    def _record_frame(self, player_id, frame):
+        if frame is not None and self.frame_shape is None:
+            self.frame_shape = frame.shape
+        if self.frame_format == "mjpeg":
+            data = b""
+            if frame is not None:
+                ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, RECORDING_JPEG_QUALITY])
+                data = encoded.tobytes() if ok else b""
+            self.jpeg_chunks[player_id].append(data)
+            self.jpeg_offsets[player_id].append(self.jpeg_offsets[player_id][-1] + len(data))
+        else:
+            # Keep one fixed-size slot per tick so replay can index the memory map directly
+            if frame is None or frame.shape != self.frame_shape:
+                frame = np.zeros(self.frame_shape or (CAMERA_CAPTURE_HEIGHT, CAMERA_CAPTURE_WIDTH, 3), np.uint8)
+            self.raw_files[player_id].write(np.ascontiguousarray(frame, dtype=np.uint8).tobytes())
+
+    def close(self, final_checksum=None):
+        """Write the recording; final_checksum lets replays verify they ended in the same state."""
+        if self.raw_files:
+            for f in self.raw_files:
+                f.close()
+        count = len(self.timestamps)
+        data = {
+            "timestamps": np.array(self.timestamps, dtype=np.float64),
+            "valid": np.array(self.valid, dtype=bool),
+            "landmarks": (np.stack(self.landmarks) if count else
+                          np.empty((0, self.num_players, LANDMARK_COUNT, 3), np.float32)),
+            "seed": np.int64(self.seed),
+            "field_size": np.array(self.field_size, dtype=np.int32),
+            "frame_format": np.str_(self.frame_format or ""),
+            "frame_shape": np.array(self.frame_shape or (0, 0, 0), dtype=np.int32),
+            "final_checksum": np.int64(-1 if final_checksum is None else final_checksum),
+            # As given, so an int speed isn't replayed as a float (the state checksums would differ)
+            **{name: np.asarray(value) for name, value in self.rules.items()},
+        }
+        if self.frame_format == "mjpeg":
+            for player_id in range(self.num_players):
+                data[f"jpeg{player_id}"] = np.frombuffer(b"".join(self.jpeg_chunks[player_id]), dtype=np.uint8)
+                data[f"jpeg{player_id}_offsets"] = np.array(self.jpeg_offsets[player_id], dtype=np.int64)
+        np.savez_compressed(self.path, **data)
+        log.info("Recorded %d ticks to %s", count, self.path)
+
+
+class Recording:
+    """A loaded session; tracks the next tick each player's ReplayCapture will return."""
+    def __init__(self, path):
+        with np.load(path) as data:
+            self.timestamps = data["timestamps"]
+            self.valid = data["valid"]
+            self.landmarks = data["landmarks"]
+            self.seed = int(data["seed"])
+            self.field_size = tuple(int(v) for v in data["field_size"])
+            self.frame_format = str(data["frame_format"]) or None
+            self.frame_shape = tuple(int(v) for v in data["frame_shape"])
+            self.final_checksum = int(data["final_checksum"])
+            if self.final_checksum < 0:
+                self.final_checksum = None
+            self.num_players = self.landmarks.shape[1]
+            # Older recordings were made with the rules from utils/constants.py
+            self.rules = {name: data[name].item() if name in data else default
+                          for name, default in DEFAULT_RULES.items()}
+            if self.valid.ndim == 1:
+                # Older recordings kept one flag per tick for all cameras
+                self.valid = np.repeat(self.valid[:, None], self.num_players, axis=1)
+            self.jpeg = [(data[f"jpeg{p}"], data[f"jpeg{p}_offsets"]) for p in range(self.num_players)
+                         if self.frame_format == "mjpeg"]
+
+        self.raw = None
+        if self.frame_format == "raw":
+            shape = (len(self), *self.frame_shape)
+            self.raw = [np.memmap(_raw_path(path, p), dtype=np.uint8, mode="r", shape=shape)
+                        for p in range(self.num_players)]
+
+        self.blank_frame = np.full((CAMERA_CAPTURE_HEIGHT, CAMERA_CAPTURE_WIDTH, 3), 32, dtype=np.uint8)
+        self.cursor = [0] * self.num_players
+        # Hands results are built once up front so replay cost is just the lookup
+        self.results = [[result_from_array(self.landmarks[i, p]) for i in range(len(self))]
+                        for p in range(self.num_players)]
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def duration(self):
+        return float(self.timestamps[-1]) if len(self) else 0.0
+
+    @property
+    def finished(self):
+        return min(self.cursor) >= len(self)
+
+    def frame(self, player_id, index):
+        """BGR frame for a tick; a blank frame when frames weren't recorded."""
+        if self.frame_format == "mjpeg":
+            chunks, offsets = self.jpeg[player_id]
+            start, end = offsets[index], offsets[index + 1]
+            if end > start:
+                return cv2.imdecode(chunks[start:end], cv2.IMREAD_COLOR)
+        elif self.frame_format == "raw":
+            return np.array(self.raw[player_id][index])
+        return self.blank_frame
+
+    def hands_factory(self, player_id):
+        """GestureDetector hands_factory returning recorded results instead of running MediaPipe."""
+        return ReplayHands(self, player_id)
+
+
+class ReplayCapture:
+    """Drop-in for a cv2.VideoCapture from setup_cameras() that plays back a Recording."""
+    def __init__(self, recording, player_id):
+        self.recording = recording
+        self.player_id = player_id
+        self.opened = True
+
+    def isOpened(self):
+        return self.opened
+
+    def read(self):
+        recording = self.recording
+        index = recording.cursor[self.player_id]
+        if not self.opened or index >= len(recording):
+            return False, None
+        recording.cursor[self.player_id] = index + 1
+        if not recording.valid[index, self.player_id]:
+            return False, None
+        return True, recording.frame(self.player_id, index)
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.recording))
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.recording.cursor[self.player_id])
+        if prop == cv2.CAP_PROP_FPS:
+            return float(CAMERA_FPS)
+        return 0.0
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            self.recording.cursor[self.player_id] = int(value)
+            return True
+        return False
+
+    def release(self):
+        self.opened = False
+
+
+class ReplayHands:
+    """Drop-in for mediapipe Hands returning the result recorded with the frame just read."""
+    def __init__(self, recording, player_id):
+        self.recording = recording
+        self.player_id = player_id
+
+    def process(self, rgb):
+        index = self.recording.cursor[self.player_id] - 1
+        return self.recording.results[self.player_id][index]
+
+    def close(self):
+        pass
+
+
+def replay_headless(path, winning_score=None):
+    """Re-run a recorded session through GameLogic without a window or frame pacing.
+
+    The match is played with the recorded rules; winning_score overrides the
+    recorded one.
+    """
+    from .game_logic import GameLogic
+    from net.netplay import state_checksum
+
+    recording = Recording(path)
+    width, height = recording.field_size
+    single_player = recording.num_players == 1
+    rules = dict(recording.rules)
+    if winning_score is not None:
+        rules["winning_score"] = winning_score
+    game_logic = GameLogic(width, height, single_player, seed=recording.seed,
+                           num_cameras=recording.num_players, hands_factory=recording.hands_factory,
+                           num_players=max(2, recording.num_players), **rules)
+    caps = [ReplayCapture(recording, p) for p in range(recording.num_players)]
+
+    matches = 0
+    start = time.perf_counter()
+    # main.py restarts the match when the menu starts it, which serves a new ball before the first tick
+    game_logic.restart_game()
+    while not recording.finished:
+        # Same order as the game loop: a finished match restarts before the next tick is played
+        if game_logic.check_game_over():
+            matches += 1
+            game_logic.restart_game()
+        results, frames = game_logic.process_cameras(caps)
+        if any(frame is not None for frame in frames):
+            game_logic.update_paddle_positions(results)
+        game_logic.update_ball(notify=False)
+    elapsed = time.perf_counter() - start
+
+    checksum = state_checksum(game_logic.save_state())
+    speedup = recording.duration / elapsed if elapsed > 0 else float("inf")
+    log.info("Replayed %d ticks (%.1f s recorded) in %.2f s (%.1fx real time); score %s, %d finished matches",
+             len(recording), recording.duration, elapsed, speedup, "-".join(map(str, game_logic.scores)), matches)
+    if recording.final_checksum is not None:
+        status = "matches" if checksum == recording.final_checksum else "DIFFERS from"
+        log.info("Final state checksum %08x %s the recorded %08x", checksum, status, recording.final_checksum)
+    return checksum
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded session headless")
+    parser.add_argument("path", help="Recording (.npz) written with main.py --record")
+    parser.add_argument("--winning-score", type=int, help="Override the recorded winning score")
+    args = parser.parse_args()
+    setup_logging(fmt=LOG_CLI_FORMAT)
+    replay_headless(args.path, args.winning_score)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""Headless batch simulation of Pong matches.
+
+Mirrors the rules in ``Ball``, ``Paddle`` and ``GameLogic`` with NumPy arrays so
+thousands of independent matches can be stepped at once without pygame surfaces
+or cameras. Used to balance ball speed and paddle size offline.
+
+Example:
+    python -m game.simulation --games 10000 --rallies 100000 --sweep ball_speed=5,7,9
+"""
+import argparse
+import itertools
+import time
+import numpy as np
+from utils.constants import *
+from utils.log import get_logger, setup_logging
+
+log = get_logger("simulation")
+
+
+def _round_half_away(values):
+    """Round like pygame.Rect does when assigned a float coordinate."""
+    return np.trunc(values + np.copysign(0.5, values))
+
+
+def _per_game(value, num_games):
+    """Broadcast a scalar or per-game parameter to a float array of length N."""
+    return np.broadcast_to(np.asarray(value, dtype=np.float64), (num_games,)).copy()
+
+
+class TrackingController:
+    """Scripted player that follows the ball with a reaction delay and aim error."""
+    def __init__(self, reaction_ticks=6, aim_error=0.25, seed=None):
+        self.reaction_ticks = reaction_ticks
+        self.aim_error = aim_error  # Standard deviation as a fraction of paddle height
+        self.rng = np.random.default_rng(seed)
+        self.history = None
+        self.offset = None
+        self.cursor = 0
+
+    def __call__(self, sim, player_id):
+        ball_y = sim.ball_y + sim.ball_size // 2
+        if self.history is None:
+            self.history = np.repeat(ball_y[None, :], self.reaction_ticks + 1, axis=0).astype(np.float64)
+            self.offset = np.zeros(sim.num_games)
+        # Ring buffer of the last reaction_ticks + 1 ball positions
+        self.cursor = (self.cursor + 1) % len(self.history)
+        self.history[self.cursor] = ball_y
+        delayed = self.history[(self.cursor - self.reaction_ticks) % len(self.history)]
+
+        # Pick a new aim offset for every rally the player is involved in
+        fresh = sim.rally_ticks == 0
+        if fresh.any():
+            self.offset[fresh] = self.rng.normal(0.0, self.aim_error, fresh.sum()) * sim.paddle_height[fresh]
+        return delayed + self.offset
+
+
+class RecordedController:
+    """Replays recorded paddle targets, looping when the recording runs out.
+
+    ``trajectory`` is either shape (T,) shared by every game or (N, T) per game,
+    in pixels or, with ``normalized=True``, as a fraction of screen height. NaN
+    means no hand was detected on that tick (the paddle keeps its last target).
+    """
+    def __init__(self, trajectory, normalized=False):
+        self.trajectory = np.asarray(trajectory, dtype=np.float64)
+        self.normalized = normalized
+
+    def __call__(self, sim, player_id):
+        length = self.trajectory.shape[-1]
+        column = self.trajectory[..., sim.tick % length]
+        if self.normalized:
+            column = column * sim.height
+        return np.broadcast_to(column, (sim.num_games,))
+
+
+class RallyStats:
+    """Per-rally results collected by BatchSimulator."""
+    def __init__(self, hits, ticks, peak_speed, game_index):
+        self.hits = hits
+        self.ticks = ticks
+        self.peak_speed = peak_speed
+        self.game_index = game_index
+
+    def __len__(self):
+        return len(self.hits)
+
+    def select(self, mask):
+        """Return the subset of rallies matching a boolean mask."""
+        return RallyStats(self.hits[mask], self.ticks[mask], self.peak_speed[mask], self.game_index[mask])
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """Summarize rally length and speed distributions."""
+        if len(self) == 0:
+            return {'rallies': 0}
+        result = {
+            'rallies': len(self),
+            'mean_hits': float(self.hits.mean()),
+            'mean_ticks': float(self.ticks.mean()),
+            'mean_peak_speed': float(self.peak_speed.mean()),
+        }
+        for p in percentiles:
+            result[f'hits_p{p}'] = float(np.percentile(self.hits, p))
+            result[f'ticks_p{p}'] = float(np.percentile(self.ticks, p))
+            result[f'speed_p{p}'] = float(np.percentile(self.peak_speed, p))
+        return result
+
+    def hit_histogram(self, max_hits=30):
+        """Count rallies by number of paddle hits, clipping the tail into the last bin."""
+        return np.bincount(np.minimum(self.hits, max_hits), minlength=max_hits + 1)
+
+
+class BatchSimulator:
+    """Steps N independent matches with the same rules as GameLogic.
+
+    Every gameplay parameter may be a scalar or an array with one value per game,
+    which lets a whole parameter sweep run as a single batch.
+    """
+    def __init__(self, num_games, width=1920, height=1080, ball_speed=BALL_SPEED,
+                 speed_increase=BALL_SPEED_INCREASE, max_speed=BALL_MAX_SPEED,
+                 paddle_height=PADDLE_HEIGHT, lerp_factor=PADDLE_LERP_FACTOR,
+                 smoothing=PADDLE_SMOOTHING_ENABLED, seed=None):
+        self.num_games = num_games
+        self.width = width
+        self.height = height
+        self.ball_size = BALL_SIZE
+        self.paddle_width = PADDLE_WIDTH
+        self.base_speed = _per_game(ball_speed, num_games)
+        self.speed_increase = _per_game(speed_increase, num_games)
+        self.max_speed = _per_game(max_speed, num_games)
+        self.paddle_height = _per_game(paddle_height, num_games).astype(np.int64)
+        self.lerp_factor = lerp_factor if smoothing else 1.0
+        self.rng = np.random.default_rng(seed)
+
+        self.paddle_x = np.array([PADDLE_OFFSET, width - PADDLE_OFFSET - PADDLE_WIDTH])
+        self.target_y = np.full((2, num_games), float(height // 2))
+        self.smooth_y = np.full((2, num_games), float(height // 2))
+
+        self.ball_x = np.zeros(num_games, dtype=np.int64)
+        self.ball_y = np.zeros(num_games, dtype=np.int64)
+        self.speed_x = np.zeros(num_games)
+        self.speed_y = np.zeros(num_games)
+        self.current_speed = np.zeros(num_games)
+        self.hit_count = np.zeros(num_games, dtype=np.int64)
+        self.rally_ticks = np.zeros(num_games, dtype=np.int64)
+        self.scores = np.zeros((2, num_games), dtype=np.int64)
+        self.tick = 0
+
+        self.recording = np.ones(num_games, dtype=bool)  # Games whose finished rallies are kept
+        self.game_rallies = np.zeros(num_games, dtype=np.int64)
+        self._rallies = []
+        self._rally_count = 0
+        self._reset_ball(np.ones(num_games, dtype=bool))
+
+    def _reset_ball(self, mask):
+        """Mirror Ball.reset for the games selected by mask."""
+        count = int(mask.sum())
+        self.ball_x[mask] = self.width // 2 - self.ball_size // 2
+        self.ball_y[mask] = self.height // 2 - self.ball_size // 2
+        self.current_speed[mask] = self.base_speed[mask]
+        self.speed_x[mask] = self.base_speed[mask] * self.rng.choice((1, -1), count)
+        self.speed_y[mask] = self.base_speed[mask] * self.rng.choice((1, -1), count)
+        self.hit_count[mask] = 0
+        self.rally_ticks[mask] = 0
+
+    def _move_paddles(self, controllers):
+        """Mirror Paddle.move_to, predict_movement and update_smooth_movement."""
+        for player_id, controller in enumerate(controllers):
+            target = np.asarray(controller(self, player_id), dtype=np.float64)
+            half = self.paddle_height // 2
+            clamped = np.clip(target, half, self.height - half)
+            detected = ~np.isnan(target)
+            self.target_y[player_id] = np.where(detected, clamped, self.target_y[player_id])
+        self.smooth_y += (self.target_y - self.smooth_y) * self.lerp_factor
+
+    def _paddle_collision(self, player_id):
+        """Vectorized pygame.Rect.colliderect between the ball and one paddle."""
+        paddle_top = self.smooth_y[player_id].astype(np.int64) - self.paddle_height // 2
+        paddle_x = self.paddle_x[player_id]
+        return ((self.ball_x < paddle_x + self.paddle_width) &
+                (self.ball_x + self.ball_size > paddle_x) &
+                (self.ball_y < paddle_top + self.paddle_height) &
+                (self.ball_y + self.ball_size > paddle_top))
+
+    def _bounce_x(self, mask):
+        """Mirror Ball.bounce_x and Ball.increase_speed."""
+        self.hit_count[mask] += 1
+        new_speed = np.minimum(self.base_speed[mask] + self.hit_count[mask] * self.speed_increase[mask],
+                               self.max_speed[mask])
+        multiplier = new_speed / self.current_speed[mask]
+        self.speed_x[mask] *= -multiplier
+        self.speed_y[mask] *= multiplier
+        self.current_speed[mask] = new_speed
+
+    def step(self, controllers):
+        """Advance every match by one frame: paddles first, then the ball."""
+        self._move_paddles(controllers)
+
+        self.ball_x = _round_half_away(self.ball_x + self.speed_x).astype(np.int64)
+        self.ball_y = _round_half_away(self.ball_y + self.speed_y).astype(np.int64)
+        self.rally_ticks += 1
+
+        # Wall collisions
+        wall = (self.ball_y <= 0) | (self.ball_y + self.ball_size >= self.height)
+        self.speed_y[wall] *= -1
+
+        # Paddle collisions (paddle 2 is only checked when paddle 1 misses, like GameLogic)
+        hit1 = self._paddle_collision(0)
+        bounce1 = hit1 & (self.speed_x < 0)
+        bounce2 = ~hit1 & self._paddle_collision(1) & (self.speed_x > 0)
+        bounce = bounce1 | bounce2
+        if bounce.any():
+            self._bounce_x(bounce)
+
+        # Scoring
+        left = self.ball_x <= 0
+        right = ~left & (self.ball_x + self.ball_size >= self.width)
+        scored = left | right
+        if scored.any():
+            self.scores[1] += left
+            self.scores[0] += right
+            index = np.flatnonzero(scored & self.recording)
+            if len(index):
+                self._rallies.append((self.hit_count[index], self.rally_ticks[index],
+                                      self.current_speed[index], index))
+                self._rally_count += len(index)
+                self.game_rallies[index] += 1
+            self._reset_ball(scored)
+        self.tick += 1
+
+    def run(self, controllers, rallies=None, ticks=None):
+        """Step until at least ``rallies`` rallies finished or ``ticks`` frames elapsed."""
+        if rallies is None and ticks is None:
+            raise ValueError("Either rallies or ticks must be given")
+        start_count = self.rally_count()
+        start_tick = self.tick
+        while True:
+            if rallies is not None and self.rally_count() - start_count >= rallies:
+                break
+            if ticks is not None and self.tick - start_tick >= ticks:
+                break
+            self.step(controllers)
+        return self.stats()
+
+    def rally_count(self):
+        """Number of finished rallies recorded so far."""
+        return self._rally_count
+
+    def stats(self):
+        """Collect all finished rallies into a RallyStats."""
+        if not self._rallies:
+            empty = np.zeros(0, dtype=np.int64)
+            return RallyStats(empty, empty, np.zeros(0), empty)
+        hits, ticks, speed, index = (np.concatenate(column) for column in zip(*self._rallies))
+        return RallyStats(hits, ticks, speed, index)
+
+
+def sweep(param_grid, rallies, games_per_config=1000, controller_factory=None, seed=None, **kwargs):
+    """Run every combination of ``param_grid`` as one batch and summarize each.
+
+    ``param_grid`` maps BatchSimulator parameter names to lists of values.
+    ``rallies`` is shared out evenly: a config stops recording once it has its
+    share, so slow configs aren't summarized from a fraction of the fast
+    ones' samples. Returns a list of (params, summary) tuples in grid order.
+    """
+    names = list(param_grid)
+    configs = list(itertools.product(*(param_grid[name] for name in names)))
+    num_games = len(configs) * games_per_config
+    config_index = np.repeat(np.arange(len(configs)), games_per_config)
+
+    params = {name: np.array([config[i] for config in configs])[config_index] for i, name in enumerate(names)}
+    sim = BatchSimulator(num_games, seed=seed, **params, **kwargs)
+
+    if controller_factory is None:
+        controller_factory = lambda player_id: TrackingController(seed=None if seed is None else seed + player_id + 1)
+    controllers = [controller_factory(0), controller_factory(1)]
+    quota = -(-rallies // len(configs))
+    while True:
+        collected = np.bincount(config_index, weights=sim.game_rallies, minlength=len(configs))
+        done = collected >= quota
+        if done.all():
+            break
+        # Finished configs keep stepping with the batch but stop adding rallies
+        sim.recording = ~done[config_index]
+        sim.step(controllers)
+    stats = sim.stats()
+
+    results = []
+    for i, config in enumerate(configs):
+        subset = stats.select(config_index[stats.game_index] == i)
+        results.append((dict(zip(names, config)), subset.summary()))
+    return results
+
+
+def _parse_sweep(specs):
+    """Parse ``name=v1,v2`` command line sweep specs."""
+    grid = {}
+    for spec in specs:
+        name, values = spec.split('=', 1)
+        grid[name] = [float(value) for value in values.split(',')]
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Pong balance simulator")
+    parser.add_argument('--games', type=int, default=10000, help="Matches simulated in parallel")
+    parser.add_argument('--rallies', type=int, default=100000, help="Rallies to collect, shared evenly by the configs")
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    parser.add_argument('--reaction', type=int, default=6, help="Scripted player reaction delay in frames")
+    parser.add_argument('--aim-error', type=float, default=0.25, help="Aim error as a fraction of paddle height")
+    parser.add_argument('--sweep', action='append', default=[],
+                        help="Parameter sweep, e.g. ball_speed=5,7,9 (repeatable)")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+    setup_logging(fmt=LOG_CLI_FORMAT)
+
+    grid = _parse_sweep(args.sweep) or {'ball_speed': [BALL_SPEED]}
+    games_per_config = max(1, args.games // len(list(itertools.product(*grid.values()))))
+    factory = lambda player_id: TrackingController(args.reaction, args.aim_error,
+                                                   None if args.seed is None else args.seed + player_id + 1)
+
+    start = time.perf_counter()
+    results = sweep(grid, args.rallies, games_per_config, factory, args.seed,
+                    width=args.width, height=args.height)
+    elapsed = time.perf_counter() - start
+
+    for params, summary in results:
+        label = ", ".join(f"{name}={value:g}" for name, value in params.items())
+        if summary['rallies'] == 0:
+            log.info("%s: no finished rallies", label)
+            continue
+        log.info(f"{label}: {summary['rallies']} rallies, "
+                 f"hits p50/p90/p99 {summary['hits_p50']:.0f}/{summary['hits_p90']:.0f}/{summary['hits_p99']:.0f}, "
+                 f"rally frames p50 {summary['ticks_p50']:.0f}, "
+                 f"peak speed p50/p99 {summary['speed_p50']:.1f}/{summary['speed_p99']:.1f}")
+    log.info("Simulated in %.2fs", elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import threading
+import time
+from utils.log import get_logger
+from utils.audio import sounds
+from utils.assets import assets
+
+log = get_logger("startup")
+
+class StartupLoader:
+    """Opens the cameras and builds the hand-tracking graphs off the main thread.
+
+    The menu is drawn while this runs. Camera opening and the MediaPipe
+    import/graph construction are independent, so they run in parallel;
+    the graphs then get one warm-up inference. ``status`` is a short text
+    for the menu and ``ready`` is set when loading finished or failed
+    (``error`` holds the reason).
+    """
+    def __init__(self, num_cameras, replay_path=None, rescan_cameras=False, screen_size=None):
+        self.num_cameras = num_cameras
+        self.replay_path = replay_path
+        self.rescan_cameras = rescan_cameras
+        self.screen_size = screen_size  # Skins are pre-scaled for this display
+        self.status = "Starting"
+        self.error = None
+        self.ready = threading.Event()
+        self.elapsed = None
+        self.caps = []  # One capture per local player
+        self.detector = None
+        self.recording = None
+        self.thread = threading.Thread(target=self._run, name="startup", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            # Sound effects and skins are decoded before the first match, never during it
+            sounds.load()
+            if self.screen_size:
+                assets.preload(self.screen_size, self.num_cameras)
+            if self.replay_path:
+                self._load_replay()
+            else:
+                self._load_cameras()
+        except Exception as e:
+            log.exception("Startup failed")
+            self.error = str(e)
+        self.elapsed = time.perf_counter() - start
+        self.ready.set()
+
+    def _load_cameras(self):
+        from utils.helpers import setup_cameras
+
+        camera_errors = []
+        def open_cameras():
+            try:
+                self.caps = setup_cameras(self.num_cameras, self.rescan_cameras)
+            except Exception as e:
+                camera_errors.append(e)  # Re-raised below, where _run reports startup errors
+        camera_thread = threading.Thread(target=open_cameras, name="camera-open", daemon=True)
+        camera_thread.start()
+
+        self.status = "Loading hand tracking"
+        self.detector = self._build_detector(self.num_cameras)
+        self.status = "Warming up hand tracking"
+        self.detector.warm_up()
+
+        self.status = "Opening cameras"
+        camera_thread.join()
+        if camera_errors:
+            raise camera_errors[0]
+        if not self.caps or not self.caps[0].isOpened():
+            raise RuntimeError("No camera found! Please connect at least one camera.")
+
+    def _load_replay(self):
+        from .recording import Recording, ReplayCapture
+        self.status = "Loading recording"
+        self.recording = Recording(self.replay_path)
+        if self.screen_size:
+            # An arena recording also draws flat paddles
+            assets.preload(self.screen_size, self.recording.num_players)
+        self.caps = [ReplayCapture(self.recording, p) for p in range(self.recording.num_players)]
+        self.detector = self._build_detector(self.recording.num_players, self.recording.hands_factory)
+        self.detector.warm_up()
+
+    def _build_detector(self, num_players, hands_factory=None):
+        # Importing the game modules here also pulls in cv2 off the main thread
+        from .game_logic import GameLogic
+        from .gestures import GestureDetector
+        return GestureDetector(num_players, hands_factory)
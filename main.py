@@ -1,33 +1,245 @@
+import time
+STARTED = time.perf_counter()  # Time to first frame and to ready are measured from here
+
+import argparse
+import random
 import pygame
 import sys
-from utils.helpers import setup_fullscreen_display, setup_cameras, cleanup_resources, cvimage_to_pygame
+# Only light modules are imported up front; cv2, mediapipe and the game modules
+# are loaded by StartupLoader while the menu is already on screen
+from utils.helpers import setup_fullscreen_display, cleanup_resources, cvimage_to_pygame
 from utils.constants import *
-from game.game_logic import GameLogic
 from ui.hud import GameHUD
 from ui.menu import Menu
-from ui.components import WinnerDisplay
+from ui.components import WinnerDisplay, Text
+from ui.leaderboard import LeaderboardScreen
+from ui.profiler_overlay import ProfilerOverlay
+from game.startup import StartupLoader
+from game.idle import IdleMode
+from game.objects import lerp_factor
+from utils.profiler import profiler
+from utils.profile_capture import ProfileCapture
+from utils.latency import latency
+from utils.audio import sounds
+from utils.config import ConfigWatcher, settings, match_rules
+from utils.assets import assets
+from utils.telemetry import metrics, TelemetryExporter, export_profiler
+from utils.log import get_logger, setup_logging, shutdown_logging, fields
+
+FRAMES = metrics.counter("pong_frames_total", "Frames rendered")
+FPS_GAUGE = metrics.gauge("pong_fps", "Frames rendered in the last second")
+FRAME_TIME = metrics.histogram("pong_frame_seconds", "Wall time between frames", TELEMETRY_FRAME_BUCKETS)
+MATCHES = [metrics.counter("pong_matches_total", "Matches finished", winner=str(p)) for p in range(1, MAX_PLAYERS + 1)]
+FIRST_FRAME = metrics.gauge("pong_startup_first_frame_seconds", "Process start to first menu frame")
+READY = metrics.gauge("pong_startup_ready_seconds", "Process start to cameras and hand tracking ready")
+
+log = get_logger("main", rate_limit=True)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Hand Gesture Pong")
+    parser.add_argument("--single-player", action="store_true",
+                        help="Play against the computer with one camera")
+    parser.add_argument("--players", type=int, choices=range(2, MAX_PLAYERS + 1), default=2,
+                        help="Players (and cameras) in a local match; 3 and 4 add paddles on the top and bottom")
+    network = parser.add_mutually_exclusive_group()
+    network.add_argument("--host", type=int, nargs="?", const=NET_DEFAULT_PORT, metavar="PORT",
+                         help="Host a networked match on this UDP port")
+    network.add_argument("--join", metavar="HOST[:PORT]",
+                         help="Join a networked match hosted on another machine")
+    parser.add_argument("--port", type=int, default=0,
+                        help="Local UDP port when joining (default: any)")
+    parser.add_argument("--spectators", type=int, nargs="?", const=SPECTATOR_PORT, metavar="PORT",
+                        help="Broadcast the match to TCP/WebSocket spectators on this port")
+    parser.add_argument("--record", metavar="PATH",
+                        help="Record camera landmarks for the session to an .npz file")
+    parser.add_argument("--record-frames", choices=RECORDING_FRAME_FORMATS,
+                        help="Also keep camera frames in the recording (MJPEG or raw)")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="Play a recorded session instead of using the cameras")
+    parser.add_argument("--highlights", nargs="?", const=HIGHLIGHT_DIR, metavar="DIR",
+                        help="Save a video of the deciding rally and winner screen of every match")
+    parser.add_argument("--stats", nargs="?", const=STATS_DIR, metavar="DIR",
+                        help="Log every match and show leaderboards (L in the menu)")
+    parser.add_argument("--no-instant-replay", action="store_true",
+                        help="Don't replay each rally after a point is scored")
+    parser.add_argument("--rescan-cameras", action="store_true",
+                        help="Probe all camera devices again instead of using the cached ones")
+    parser.add_argument("--telemetry", nargs="?", const=TELEMETRY_PATH, metavar="PATH",
+                        help="Export metrics to a rotating JSONL file and a local Prometheus endpoint")
+    parser.add_argument("--metrics-port", type=int, default=TELEMETRY_PORT,
+                        help="Port for the Prometheus endpoint with --telemetry (0 disables it)")
+    parser.add_argument("--log-file", metavar="PATH", help="Also write the log to this file")
+    parser.add_argument("--profile-dir", default=PROFILE_DIR, metavar="DIR",
+                        help=f"Where F4 saves profile captures (default {PROFILE_DIR}/)")
+    parser.add_argument("--measure-latency", action="store_true",
+                        help="Measure capture-to-screen latency per player and print it on exit")
+    args = parser.parse_args()
+    if (args.record or args.replay) and (args.host is not None or args.join is not None):
+        parser.error("--record and --replay only work for local matches")
+    if args.record and args.replay:
+        parser.error("--record and --replay are mutually exclusive")
+    if args.players > 2 and (args.single_player or args.host is not None or args.join is not None
+                             or args.spectators is not None):
+        parser.error("--players only works for local matches without spectators")
+    return args
+
+def connect_network(args, win, width, height):
+    """Show a waiting screen and handshake with the peer."""
+    from net.netplay import NetSession, parse_address
+    if args.host is not None:
+        session = NetSession(args.host)
+        message = f"Waiting for opponent on port {args.host}..."
+    else:
+        session = NetSession(args.port, parse_address(args.join))
+        message = f"Connecting to {args.join}..."
+    
+    win.fill(BLACK)
+    Text(message, settings.font_size // 2, LIGHT_GRAY).draw(win, width // 2, height // 2, center=True)
+    pygame.display.update()
+    
+    field_width, field_height, seed, rules = session.connect(width, height, match_rules(), on_wait=pygame.event.pump)
+    return session, field_width, field_height, seed, rules
+
+def centered_field(screen, width, height, field_width, field_height):
+    """Subsurface of the given size in the middle of the screen."""
+    return screen.subsurface(pygame.Rect((width - field_width) // 2, (height - field_height) // 2,
+                                         field_width, field_height))
+
+def wait_for_startup(loader, screen, width, height):
+    """Show the loader's progress until cameras and hand tracking are ready."""
+    while not loader.ready.wait(0.05):
+        pygame.event.pump()
+        screen.fill(BLACK)
+        Text(f"{loader.status}...", settings.font_size // 2, LIGHT_GRAY).draw(screen, width // 2, height // 2, center=True)
+        pygame.display.update()
+
+def create_game(args, loader, screen, width, height):
+    """Build the match once the loader is done; returns (win, game_logic, hud, session)."""
+    from game.game_logic import GameLogic
+    
+    # Networked play: both peers simulate the same field, so draw into a centered area of that size
+    if args.host is not None or args.join is not None:
+        session, field_width, field_height, seed, rules = connect_network(args, screen, width, height)
+        win = centered_field(screen, width, height, field_width, field_height)
+        game_logic = GameLogic(field_width, field_height, seed=seed, num_cameras=1,
+                               gesture_detector=loader.detector, **rules)
+        session.attach(game_logic)
+        hud = GameHUD(field_width, field_height, (session.local_player == 0, session.local_player == 1))
+        return win, game_logic, hud, session
+    
+    replay = loader.recording
+    if replay:
+        # The replay must simulate the recorded field size to play out identically
+        field_width, field_height = replay.field_size
+        if field_width > width or field_height > height:
+            raise RuntimeError(f"Recording needs a {field_width}x{field_height} field, display is {width}x{height}")
+        args.single_player = replay.num_players == 1
+        args.players = max(2, replay.num_players)
+        game_logic = GameLogic(field_width, field_height, args.single_player, seed=replay.seed,
+                               num_cameras=replay.num_players, gesture_detector=loader.detector,
+                               num_players=args.players, **replay.rules)
+        win = centered_field(screen, width, height, field_width, field_height)
+    else:
+        from game.recording import SessionRecorder
+        # Recorded sessions need a known seed so replays serve the same balls
+        seed = random.getrandbits(32) if args.record else None
+        rules = match_rules()
+        game_logic = GameLogic(width, height, args.single_player, seed=seed, gesture_detector=loader.detector,
+                               num_players=args.players, **rules)
+        if args.record:
+            game_logic.recorder = SessionRecorder(args.record, 1 if args.single_player else args.players, seed,
+                                                  (width, height), args.record_frames, rules)
+        win = screen
+    if not args.no_instant_replay or args.highlights:
+        from game.instant_replay import ReplayBuffer
+        game_logic.history = ReplayBuffer()
+    hud = GameHUD(game_logic.width, game_logic.height, [True] + [not args.single_player] * (args.players - 1))
+    return win, game_logic, hud, None
+
+def open_match_log(args, loader):
+    """The --stats match log for a new game; replays aren't logged."""
+    if not args.stats or loader.recording:
+        return None
+    from game.match_stats import MatchLog
+    return MatchLog(args.stats).open()
 
 def main():
-    # Setup
-    win, WIDTH, HEIGHT = setup_fullscreen_display()
-    cap0, cap1 = setup_cameras()
+    args = parse_args()
+    setup_logging(path=args.log_file)
+    networked = args.host is not None or args.join is not None
+    
+    # config.ini overrides the defaults from utils/constants.py and is watched for edits
+    config = ConfigWatcher()
+    config.load()
+    # The mixer buffer size has to be requested before pygame.init()
+    sounds.configure(settings.enable_sounds, settings.sound_volume)
+    
+    # Put the menu on screen before anything slow happens
+    screen, WIDTH, HEIGHT = setup_fullscreen_display()
+    menu = Menu(WIDTH, HEIGHT)
+    menu.draw(screen)
+    pygame.display.update()
+    FIRST_FRAME.set(time.perf_counter() - STARTED)
+    log.info("First frame after %.0f ms", FIRST_FRAME.value * 1000)
     
-    # Check if cameras are working
-    if not cap0.isOpened():
-        print("Error: No camera found! Please connect at least one camera.")
-        pygame.quit()
-        sys.exit()
+    # Cameras, MediaPipe and the warm-up inference load while the menu animates
+    loader = StartupLoader(1 if args.single_player or networked else args.players, args.replay, args.rescan_cameras,
+                           (WIDTH, HEIGHT))
+    loader.start()
     
+    # Menu and winner screens drop to a low frame rate and release cameras when nobody is around
+    idle = IdleMode()
     clock = pygame.time.Clock()
+    latency.enabled = args.measure_latency
     
-    # Game components
-    game_logic = GameLogic(WIDTH, HEIGHT)
-    hud = GameHUD(WIDTH, HEIGHT)
-    menu = Menu(WIDTH, HEIGHT)
-    winner_display = WinnerDisplay(WIDTH, HEIGHT)
+    # Filled in by create_game once the loader is ready
+    win, game_logic, hud, session, winner_display = screen, None, None, None, None
+    instant_replay = None
+    highlights = None
+    start_pending = False
+    
+    # Match log, appended to off the render thread; opened with the game
+    match_log = None
+    leaderboard = LeaderboardScreen(WIDTH, HEIGHT) if args.stats else None
+    
+    # A networked match starts straight away, so it has to wait for the cameras here
+    if networked:
+        wait_for_startup(loader, screen, WIDTH, HEIGHT)
+        try:
+            if loader.error:
+                raise RuntimeError(loader.error)
+            win, game_logic, hud, session = create_game(args, loader, screen, WIDTH, HEIGHT)
+        except (ConnectionError, RuntimeError) as e:
+            log.error("%s", e)
+            cleanup_resources(loader.caps)
+            sys.exit()
+        winner_display = WinnerDisplay(game_logic.width, game_logic.height)
+        match_log = open_match_log(args, loader)
+        READY.set(time.perf_counter() - STARTED)
+    
+    profiler_overlay = ProfilerOverlay(profiler)
+    show_profiler = False
+    # F4 records cProfile stats and sampled stacks of the next few seconds, whatever the screen
+    capture = ProfileCapture(args.profile_dir)
+    capture_badge = Text("PROFILING", 24, RED)
+    
+    # Telemetry keeps the stage profiler recording; F3 then only toggles the overlay
+    telemetry = None
+    if args.telemetry:
+        profiler.enabled = True
+        export_profiler(metrics, profiler)
+        telemetry = TelemetryExporter(metrics, args.telemetry, args.metrics_port)
+        telemetry.start()
+    
+    # Optional spectator broadcast runs on its own thread; the loop only hands it snapshots
+    spectators = None
+    if args.spectators is not None:
+        from net.spectator import SpectatorServer
+        spectators = SpectatorServer(port=args.spectators)
+        spectators.start()
     
     # Game state
-    game_state = "menu"  # "menu", "playing", "winner"
+    game_state = "playing" if session else "menu"  # "menu", "playing", "instant_replay", "winner", "leaderboard"
     running = True
     
     # Frame skipping for camera processing
@@ -39,12 +251,13 @@ def main():
     fps_counter = 0
     current_fps = 60
     
-    # Initialize camera surfaces to avoid NameError
-    cam_surface0 = None
-    cam_surface1 = None
+    # Latest camera surface per player (kept when a camera misses a tick)
+    cam_surfaces = [None] * MAX_PLAYERS
     
     while running:
-        clock.tick(FPS)
+        FRAME_TIME.observe(clock.tick(idle.fps) / 1000)
+        FRAMES.inc()
+        frame_start = profiler.start()
         events = pygame.event.get()
         
         # Calculate FPS
@@ -52,21 +265,91 @@ def main():
         current_time = pygame.time.get_ticks()
         if current_time - last_fps_time >= 1000:  # Update every second
             current_fps = fps_counter
+            FPS_GAUGE.set(current_fps)
             fps_counter = 0
             last_fps_time = current_time
         
         for event in events:
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                show_profiler = not show_profiler if telemetry else profiler.toggle()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                capture.toggle(game_state)
+        capture.update(game_state)
+        idle.handle_events(events)
+        
+        # Apply edits to config.ini; each setting's scope says what has to be redone
+        scopes = {setting.scope for setting in config.poll()}
+        if "ui" in scopes:
+            menu = Menu(WIDTH, HEIGHT)
+            if game_logic:
+                hud = GameHUD(hud.width, hud.height, hud.cameras)
+                if game_state != "winner":
+                    winner_display = WinnerDisplay(game_logic.width, game_logic.height)
+            if leaderboard:
+                leaderboard = LeaderboardScreen(WIDTH, HEIGHT)
+                if game_state == "leaderboard":
+                    leaderboard.show(args.stats)
+        if scopes & {"ui", "match"} and game_logic and not (session or game_logic.recorder or loader.recording):
+            # Networked, recorded and replayed matches keep the rules they started with
+            for name, value in match_rules().items():
+                setattr(game_logic, name, value)
+        if "hands" in scopes and game_logic and game_logic.gesture_detector:
+            game_logic.gesture_detector.rebuild()
+        if "camera" in scopes:
+            for cap in set(loader.caps):
+                if hasattr(cap, "reconfigure"):
+                    cap.reconfigure()
+        if "audio" in scopes:
+            sounds.update(settings.enable_sounds, settings.sound_volume)
+        if "restart" in scopes:
+            log.info("Display settings in config.ini take effect after a restart")
         
         if game_state == "menu":
-            menu.draw(win)
+            if game_logic is None and loader.ready.is_set() and not loader.error:
+                try:
+                    win, game_logic, hud, session = create_game(args, loader, screen, WIDTH, HEIGHT)
+                    winner_display = WinnerDisplay(game_logic.width, game_logic.height)
+                    if not args.no_instant_replay:
+                        from game.instant_replay import InstantReplay
+                        instant_replay = InstantReplay(game_logic.history, game_logic.width, game_logic.height)
+                    if args.highlights:
+                        # Clips are rendered and encoded in another process
+                        from game.highlights import HighlightExporter
+                        highlights = HighlightExporter(args.highlights, (game_logic.width, game_logic.height))
+                        highlights.start()
+                    match_log = open_match_log(args, loader)
+                    READY.set(time.perf_counter() - STARTED)
+                    log.info("Ready after %.0f ms (background loading took %.0f ms)",
+                             READY.value * 1000, loader.elapsed * 1000)
+                except RuntimeError as e:
+                    log.error("%s", e)
+                    loader.error = str(e)
+            
+            if loader.error:
+                menu.set_status(loader.error, "error")
+            elif game_logic is None:
+                menu.set_status("Starting as soon as the cameras are ready" if start_pending else loader.status)
+            else:
+                menu.set_status("Ready - press SPACE to start", "ready")
+            
+            menu.draw(screen)
             menu_action = menu.handle_events(events)
             if menu_action == "start":
-                game_logic.restart_game()
-                game_state = "playing"
+                start_pending = not loader.error
             elif menu_action == "quit":
                 running = False
+            elif menu_action == "leaderboard" and leaderboard:
+                leaderboard.show(args.stats)
+                game_state = "leaderboard"
+            
+            if start_pending and game_logic is not None:
+                start_pending = False
+                screen.fill(BLACK)  # The field may not cover the whole screen
+                game_logic.restart_game()
+                sounds.play("game_start")
+                game_state = "playing"
                 
         elif game_state == "playing":
             # Handle game controls separately
@@ -77,73 +360,189 @@ def main():
             
             # Process camera feeds with optimized frequency
             frame_skip_counter += 1
-            gesture1_detected = False
-            gesture2_detected = False
+            detected = [False] * game_logic.num_players
+            
+            if session:
+                # Networked: track only the local player; the session steps the shared simulation
+                local_position = None
+                results, frames = game_logic.process_cameras(loader.caps[:1])
+                if frames[0] is not None:
+                    landmarks = results[0].multi_hand_landmarks if results[0] else None
+                    local_position = game_logic.gesture_detector.get_paddle_position(landmarks, game_logic.height, 0)
+                    t = profiler.start()
+                    cam_surfaces[session.local_player] = cvimage_to_pygame(frames[0])
+                    profiler.stop("convert", t)
+                    detected[session.local_player] = landmarks is not None
+                
+                session.advance(local_position)
+                if not session.connected:
+                    log.warning("Network peer disconnected")
+                    running = False
             
-            if frame_skip_counter >= camera_process_interval:
-                result0, result1, frame0, frame1 = game_logic.process_cameras(cap0, cap1)
+            elif frame_skip_counter >= camera_process_interval:
+                results, frames = game_logic.process_cameras(loader.caps)
                 frame_skip_counter = 0
                 
-                if frame0 is not None and frame1 is not None:
+                # A camera that failed this tick only stalls its own player
+                if any(frame is not None for frame in frames):
                     # Update paddle positions with smoothing
-                    game_logic.update_paddle_positions(result0, result1)
+                    game_logic.update_paddle_positions(results)
                     
                     # Check gesture detection status
-                    gesture1_detected = result0 and result0.multi_hand_landmarks is not None
-                    gesture2_detected = result1 and result1.multi_hand_landmarks is not None
+                    for player_id, result in enumerate(results):
+                        detected[player_id] = bool(result and result.multi_hand_landmarks is not None)
                     
                     # Convert camera frames for display
-                    cam_surface0 = cvimage_to_pygame(frame0)
-                    cam_surface1 = cvimage_to_pygame(frame1)
+                    t = profiler.start()
+                    for player_id, frame in enumerate(frames):
+                        if frame is not None:
+                            cam_surfaces[player_id] = cvimage_to_pygame(frame)
+                    profiler.stop("convert", t)
+                
+                if loader.recording and loader.recording.finished:
+                    log.info("Replay finished")
+                    running = False
             else:
                 # Update paddle smoothing even when not processing cameras
-                game_logic.paddle1.update_smooth_movement()
-                game_logic.paddle2.update_smooth_movement()
+                lerp = lerp_factor(game_logic.paddle_speed)
+                for paddle in game_logic.paddles:
+                    paddle.update_smooth_movement(lerp)
             
             # Always update ball regardless of camera processing
-            game_logic.update_ball()
+            points = sum(game_logic.scores)
+            if not session:
+                t = profiler.start()
+                game_logic.update_ball()
+                profiler.stop("update_ball", t)
             
-            # Update speed notifications
-            game_logic.update_speed_notifications()
+            # Update notifications
+            game_logic.notifications.update()
             
             # Check for winner
             winner = game_logic.check_game_over()
             if winner:
                 winner_display.show_winner(winner)
+                sounds.play("game_over")
+                MATCHES[winner - 1].inc()
+                log.info("Match finished", extra=fields(winner=winner, scores=game_logic.scores))
+                if match_log:
+                    mode = ("network" if session else "single" if args.single_player else
+                            "arena" if game_logic.num_players > 2 else "local")
+                    match_log.record(game_logic, winner, mode)
+                if highlights:
+                    highlights.begin(f"match-{time.strftime('%Y%m%d-%H%M%S')}-p{winner}", game_logic.history)
                 game_state = "winner"
+            elif instant_replay and sum(game_logic.scores) > points and instant_replay.start():
+                game_state = "instant_replay"
+            
+            if spectators:
+                spectators.publish(game_logic)
             
             # Draw everything
-            win.fill(BLACK)
-            game_logic.paddle1.draw(win)
-            game_logic.paddle2.draw(win)
+            background = assets.image("background", win.get_size(), alpha=False)
+            if background:
+                win.blit(background, (0, 0))
+            else:
+                win.fill(BLACK)
+            for paddle in game_logic.paddles:
+                paddle.draw(win)
             game_logic.ball.draw(win)
             
-            # Draw speed notifications
-            game_logic.draw_speed_notifications(win)
+            # Draw notifications
+            game_logic.notifications.draw(win)
             
             # Update camera status and draw HUD (now with ball reference)
-            hud.update_camera_status(gesture1_detected, gesture2_detected)
-            hud.draw(win, game_logic.score1, game_logic.score2, cam_surface0, cam_surface1, current_fps, game_logic.ball)
+            t = profiler.start()
+            hud.update_camera_status(detected)
+            if session and session.local_player == 1:
+                hud.update_camera_health([None] + loader.caps)
+            else:
+                hud.update_camera_health(loader.caps)
+            hud.draw(win, game_logic.scores, cam_surfaces, current_fps, game_logic.ball)
+            profiler.stop("hud", t)
+            
+        elif game_state == "instant_replay":
+            # The live match is paused; the replay only reads the ring buffer
+            for event in events:
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
+                        running = False
+                    elif event.key == pygame.K_SPACE:
+                        game_state = "playing"
+            
+            instant_replay.draw(win)
+            if not instant_replay.update():
+                game_state = "playing"
             
         elif game_state == "winner":
             try:
                 # Handle winner display input - only advance on SPACE press
                 if winner_display.handle_input(events):
                     game_state = "menu"
+                    if session:
+                        running = False  # A networked session ends with the match
                 
                 # Update winner display animations
                 winner_display.update()
                 winner_display.draw(win)
+                if highlights:
+                    highlights.capture(win)
+                    if game_state != "winner":
+                        highlights.finish()
                 
             except Exception as e:
-                print(f"Error in winner state: {e}")
+                log.error("Error in winner state: %s", e)
                 # Fallback: return to menu
                 game_state = "menu"
         
+        elif game_state == "leaderboard":
+            if leaderboard.handle_input(events):
+                game_state = "menu"
+            leaderboard.draw(screen)
+        
+        if highlights:
+            highlights.poll()
+        idle.update(game_state in ("menu", "winner", "leaderboard"), loader.caps,
+                    game_logic.gesture_detector if game_logic else None)
+        
+        if show_profiler:
+            profiler_overlay.draw(win)
+        if capture.active:
+            capture_badge.draw(screen, screen.get_width() - 80, 20, center=True)
+        
+        t = profiler.start()
         pygame.display.update()
+        profiler.stop("present", t)
+        if game_logic:
+            latency.present(game_logic.paddles)
+        profiler.stop("frame", frame_start)
     
     # Cleanup
-    cleanup_resources(cap0, cap1)
+    capture.close()
+    if telemetry:
+        telemetry.stop()
+    if latency.enabled:
+        paddle_speed = game_logic.paddle_speed if game_logic else settings.paddle_speed
+        log.info("Motion-to-photon latency\n%s", latency.report(lerp_factor(paddle_speed), settings.fps))
+    sound_report = sounds.report()
+    if sound_report:
+        log.info("%s", sound_report)
+    idle_report = idle.report()
+    if idle_report:
+        log.info("%s", idle_report)
+    if game_logic and game_logic.recorder:
+        from net.netplay import state_checksum
+        game_logic.recorder.close(state_checksum(game_logic.save_state()))
+    if highlights:
+        highlights.close()
+    if match_log:
+        match_log.close()
+    if spectators:
+        spectators.stop()
+    if session:
+        session.close()
+    cleanup_resources(loader.caps)
+    shutdown_logging()
     sys.exit()
 
 if __name__ == "__main__":
@@ -0,0 +1,433 @@
+"""Peer-to-peer networked play over UDP with input delay and rollback.
+
+Each machine captures and tracks only its local player and sends timestamped,
+quantized paddle targets to the peer. Both peers run the same deterministic
+GameLogic (seeded ball resets, fixed tick, the host's match rules). Missing remote input is predicted;
+when the real input arrives and differs, the game is rolled back to the first
+mispredicted tick and re-simulated.
+
+Two headless peers can be run on one machine to exercise the protocol:
+    python -m net.netplay --host 47800 --frames 1800
+    python -m net.netplay --join 127.0.0.1:47800 --frames 1800 --latency 60 --loss 0.05
+"""
+import argparse
+import math
+import random
+import socket
+import struct
+import time
+import zlib
+from utils.constants import *
+from utils.log import get_logger, setup_logging, fields
+
+log = get_logger("net")
+
+MAGIC = b'HP'
+PROTOCOL_VERSION = 2
+MSG_HELLO, MSG_WELCOME, MSG_INPUT, MSG_BYE = range(1, 5)
+
+HEADER = struct.Struct('!2sBB')          # magic, version, message type
+HELLO = struct.Struct('!HH')             # joiner field width, height
+WELCOME = struct.Struct('!HHIBdd')       # agreed field width, height, seed, winning score, ball and paddle speed
+INPUT = struct.Struct('!IIiiIiB')        # send ms, echo ms, ack tick, check tick, crc, start tick, count
+
+NO_INPUT = 0xFFFF                        # No hand detected: paddle keeps its last target
+INPUT_SCALE = 0xFFFE                     # Positions are sent as a fraction of field height
+
+
+def encode_position(y, height):
+    """Quantize a paddle target to 16 bits; both peers simulate the quantized value."""
+    if y is None:
+        return NO_INPUT
+    return max(0, min(INPUT_SCALE, int(round(y / height * INPUT_SCALE))))
+
+
+def decode_position(code, height):
+    """Inverse of encode_position."""
+    if code == NO_INPUT:
+        return None
+    return code * height / INPUT_SCALE
+
+
+def _unpack_welcome(payload):
+    """(width, height, seed, rules) from a WELCOME payload."""
+    *field, winning_score, ball_speed, paddle_speed = WELCOME.unpack_from(payload)
+    return (*field, {"winning_score": winning_score, "ball_speed": ball_speed, "paddle_speed": paddle_speed})
+
+
+def _now_ms():
+    return int(time.monotonic() * 1000) & 0xFFFFFFFF
+
+
+def state_checksum(state):
+    """CRC of a GameLogic.save_state snapshot, used to detect desyncs."""
+    return zlib.crc32(repr(state).encode())
+
+
+class NetSession:
+    """One side of a two-player UDP match.
+
+    The host (no remote address) plays the left paddle, the joiner the right.
+    Call connect() once, attach() the GameLogic built from its result, then
+    advance() once per frame with the local paddle target.
+    """
+    def __init__(self, local_port=0, remote_addr=None, input_delay=NET_INPUT_DELAY,
+                 max_rollback=NET_MAX_ROLLBACK):
+        self.is_host = remote_addr is None
+        self.local_player = 0 if self.is_host else 1
+        self.remote_addr = remote_addr
+        self.input_delay = input_delay
+        self.max_rollback = max_rollback
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('', local_port))
+        self.sock.setblocking(False)
+
+        self.game_logic = None
+        self.height = None
+        self.tick = 0
+        self.welcome = None
+
+        # Ticks below the input delay have no input from either side
+        self.local_inputs = {t: NO_INPUT for t in range(input_delay)}
+        self.remote_inputs = {t: NO_INPUT for t in range(input_delay)}
+        self.predicted = {}
+        self.snapshots = {}
+        self.remote_confirmed = input_delay - 1
+        self.peer_ack = input_delay - 1
+        self.rollback_from = None
+        self.pruned_below = 0
+
+        # Desync detection
+        self.checksums = {}
+        self.peer_checksums = {}
+        self.last_checksum = (-1, 0)
+        self.last_verified = -1
+        self.next_checksum_tick = 0
+
+        # Link state
+        self.peer_time = 0
+        self.rtt_ms = None
+        self.last_receive = time.monotonic()
+        self.peer_left = False
+
+        # Testing aids: artificial one-way latency (seconds) and packet loss ratio
+        self.fake_latency = 0.0
+        self.fake_loss = 0.0
+        self.outbox = []
+
+        self.stats = {
+            'rollbacks': 0, 'rollback_frames': 0, 'max_rollback': 0, 'stalls': 0,
+            'packets_sent': 0, 'packets_received': 0, 'checksums_verified': 0, 'desyncs': 0,
+        }
+
+    # Connection ------------------------------------------------------------------
+
+    def connect(self, width, height, rules, timeout=NET_CONNECT_TIMEOUT, on_wait=None):
+        """Handshake with the peer and agree on field size, seed and match rules.
+
+        Returns (width, height, seed, rules). The field is the smaller of both
+        screens so that both peers simulate identical geometry; the rules
+        (utils.config.match_rules) are the host's.
+        """
+        deadline = time.monotonic() + timeout
+        next_hello = 0.0
+        while time.monotonic() < deadline:
+            if on_wait:
+                on_wait()
+            self._flush_outbox()
+            if not self.is_host and time.monotonic() >= next_hello:
+                self._send(HEADER.pack(MAGIC, PROTOCOL_VERSION, MSG_HELLO) + HELLO.pack(width, height))
+                next_hello = time.monotonic() + 0.2
+            for msg_type, payload, addr in self._receive():
+                if self.is_host and msg_type == MSG_HELLO:
+                    peer_width, peer_height = HELLO.unpack_from(payload)
+                    self.remote_addr = addr
+                    field = (min(width, peer_width), min(height, peer_height), random.getrandbits(32))
+                    welcome = WELCOME.pack(*field, rules["winning_score"], rules["ball_speed"], rules["paddle_speed"])
+                    self.welcome = HEADER.pack(MAGIC, PROTOCOL_VERSION, MSG_WELCOME) + welcome
+                    self._send(self.welcome)
+                    # Play with the values as sent (e.g. 7.0, not 7) so both states are identical
+                    return _unpack_welcome(welcome)
+                if not self.is_host and msg_type == MSG_WELCOME:
+                    return _unpack_welcome(payload)
+            time.sleep(0.01)
+        raise ConnectionError("Timed out waiting for network peer")
+
+    def attach(self, game_logic):
+        """Bind the deterministic GameLogic this session drives."""
+        self.game_logic = game_logic
+        self.height = game_logic.height
+        self.last_receive = time.monotonic()
+
+    @property
+    def connected(self):
+        return not self.peer_left and time.monotonic() - self.last_receive < NET_PEER_TIMEOUT
+
+    def close(self):
+        """Tell the peer we're leaving and release the socket."""
+        if self.remote_addr:
+            bye = HEADER.pack(MAGIC, PROTOCOL_VERSION, MSG_BYE)
+            for _ in range(3):
+                self._send_now(bye)
+        self.sock.close()
+
+    # Per-frame -------------------------------------------------------------------
+
+    def advance(self, local_position):
+        """Submit local input and step the simulation by one tick.
+
+        Returns False when the frame was stalled because the peer is more than
+        max_rollback ticks behind.
+        """
+        input_tick = self.tick + self.input_delay
+        if input_tick not in self.local_inputs:
+            self.local_inputs[input_tick] = encode_position(local_position, self.height)
+
+        self.service()
+        if self.rollback_from is not None:
+            self._rollback()
+
+        if self.tick - self.remote_confirmed > self.max_rollback:
+            self.stats['stalls'] += 1
+            return False
+
+        self._simulate_tick(notify=True)
+        self._update_checksums()
+        self._prune()
+        return True
+
+    def service(self):
+        """Exchange packets without advancing; also used to linger at the end of a match."""
+        self._flush_outbox()
+        for msg_type, payload, addr in self._receive():
+            if addr != self.remote_addr:
+                continue
+            if msg_type == MSG_INPUT:
+                self._handle_input(payload)
+            elif msg_type == MSG_HELLO and self.welcome:
+                self._send(self.welcome)  # Our WELCOME was lost
+            elif msg_type == MSG_BYE:
+                self.peer_left = True
+        self._send_inputs()
+
+    # Simulation --------------------------------------------------------------------
+
+    def _simulate_tick(self, notify):
+        tick = self.tick
+        self.snapshots[tick] = self.game_logic.save_state()
+
+        remote = self.remote_inputs.get(tick)
+        if remote is None:
+            # Predict that the peer holds its last confirmed input
+            remote = self.remote_inputs[self.remote_confirmed]
+            self.predicted[tick] = remote
+        local = self.local_inputs.get(tick, NO_INPUT)
+
+        local_pos = decode_position(local, self.height)
+        remote_pos = decode_position(remote, self.height)
+        if self.local_player == 0:
+            self.game_logic.step((local_pos, remote_pos), notify)
+        else:
+            self.game_logic.step((remote_pos, local_pos), notify)
+        self.tick += 1
+
+    def _rollback(self):
+        """Restore the first mispredicted tick and re-simulate up to the present."""
+        start = self.rollback_from
+        self.rollback_from = None
+        if start >= self.tick:
+            return
+        target = self.tick
+        self.game_logic.load_state(self.snapshots[start])
+        self.tick = start
+        while self.tick < target:
+            self._simulate_tick(notify=False)
+
+        depth = target - start
+        self.stats['rollbacks'] += 1
+        self.stats['rollback_frames'] += depth
+        self.stats['max_rollback'] = max(self.stats['max_rollback'], depth)
+
+    def _update_checksums(self):
+        """Checksum snapshots once every input before them is confirmed."""
+        while (self.next_checksum_tick <= self.remote_confirmed + 1 and
+               self.next_checksum_tick in self.snapshots):
+            tick = self.next_checksum_tick
+            crc = state_checksum(self.snapshots[tick])
+            self.checksums[tick] = crc
+            self.checksums.pop(tick - NET_CHECKSUM_INTERVAL * 16, None)  # Peer reports lag a little
+            self.last_checksum = (tick, crc)
+            if tick in self.peer_checksums:
+                self._compare_checksum(tick, self.peer_checksums.pop(tick))
+            self.next_checksum_tick += NET_CHECKSUM_INTERVAL
+
+    def _compare_checksum(self, tick, crc):
+        self.last_verified = tick
+        if self.checksums.get(tick) == crc:
+            self.stats['checksums_verified'] += 1
+        else:
+            self.stats['desyncs'] += 1
+            log.warning("Network desync detected", extra=fields(tick=tick))
+
+    def _prune(self):
+        """Drop history that can no longer be rolled back to or resent."""
+        floor = min(self.remote_confirmed, self.peer_ack, self.next_checksum_tick - 1) - 1
+        for tick in range(self.pruned_below, max(self.pruned_below, floor)):
+            self.snapshots.pop(tick, None)
+            self.predicted.pop(tick, None)
+            self.local_inputs.pop(tick, None)
+            self.remote_inputs.pop(tick, None)
+        self.pruned_below = max(self.pruned_below, floor)
+
+    # Wire --------------------------------------------------------------------------
+
+    def _handle_input(self, payload):
+        send_ms, echo_ms, ack, check_tick, crc, start_tick, count = INPUT.unpack_from(payload)
+        codes = struct.unpack_from(f'!{count}H', payload, INPUT.size)
+
+        self.last_receive = time.monotonic()
+        self.peer_time = send_ms
+        self.peer_ack = max(self.peer_ack, ack)
+        if echo_ms:
+            rtt = (_now_ms() - echo_ms) & 0xFFFFFFFF
+            self.rtt_ms = rtt if self.rtt_ms is None else self.rtt_ms * 0.9 + rtt * 0.1
+
+        for offset, code in enumerate(codes):
+            tick = start_tick + offset
+            if tick in self.remote_inputs or tick < self.pruned_below:
+                continue
+            self.remote_inputs[tick] = code
+            if tick in self.predicted and self.predicted[tick] != code:
+                self.rollback_from = tick if self.rollback_from is None else min(self.rollback_from, tick)
+            self.predicted.pop(tick, None)
+        while self.remote_confirmed + 1 in self.remote_inputs:
+            self.remote_confirmed += 1
+
+        if check_tick > self.last_verified:
+            if check_tick in self.checksums:
+                self._compare_checksum(check_tick, crc)
+            elif check_tick >= self.next_checksum_tick:
+                self.peer_checksums[check_tick] = crc
+
+    def _send_inputs(self):
+        if not self.remote_addr:
+            return
+        newest = self.tick + self.input_delay
+        start = max(self.peer_ack + 1, newest - NET_INPUT_WINDOW + 1)
+        codes = [self.local_inputs.get(tick, NO_INPUT) for tick in range(start, newest + 1)]
+        check_tick, crc = self.last_checksum
+        packet = (HEADER.pack(MAGIC, PROTOCOL_VERSION, MSG_INPUT) +
+                  INPUT.pack(_now_ms(), self.peer_time, self.remote_confirmed, check_tick, crc,
+                             start, len(codes)) +
+                  struct.pack(f'!{len(codes)}H', *codes))
+        self._send(packet)
+
+    def _receive(self):
+        """Yield (type, payload, addr) for every valid datagram waiting on the socket."""
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionResetError:
+                continue  # Windows reports ICMP port unreachable this way
+            if len(data) < HEADER.size:
+                continue
+            magic, version, msg_type = HEADER.unpack_from(data)
+            if magic != MAGIC or version != PROTOCOL_VERSION:
+                continue
+            self.stats['packets_received'] += 1
+            yield msg_type, data[HEADER.size:], addr
+
+    def _send(self, data):
+        if self.fake_loss and random.random() < self.fake_loss:
+            return
+        if self.fake_latency:
+            self.outbox.append((time.monotonic() + self.fake_latency, data))
+            return
+        self._send_now(data)
+
+    def _send_now(self, data):
+        try:
+            self.sock.sendto(data, self.remote_addr)
+            self.stats['packets_sent'] += 1
+        except OSError:
+            pass  # Peer not listening yet; inputs are resent next frame
+
+    def _flush_outbox(self):
+        now = time.monotonic()
+        while self.outbox and self.outbox[0][0] <= now:
+            self._send_now(self.outbox.pop(0)[1])
+
+
+def parse_address(text, default_port=NET_DEFAULT_PORT):
+    """Parse 'host[:port]' into a socket address tuple."""
+    host, _, port = text.rpartition(':')
+    if not host:
+        host, port = text, default_port
+    # Resolve now so replies can be matched against the sender address
+    return (socket.gethostbyname(host), int(port))
+
+
+def main():
+    """Headless peer for testing two processes over localhost."""
+    from game.game_logic import GameLogic
+    from utils.config import match_rules
+
+    parser = argparse.ArgumentParser(description="Headless networked Pong peer")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--host', type=int, metavar='PORT', help="Listen for a peer on PORT")
+    group.add_argument('--join', metavar='HOST:PORT', help="Connect to a hosting peer")
+    parser.add_argument('--port', type=int, default=0, help="Local UDP port when joining")
+    parser.add_argument('--frames', type=int, default=1800, help="Ticks to simulate")
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--latency', type=float, default=0.0, help="Artificial one-way latency in ms")
+    parser.add_argument('--loss', type=float, default=0.0, help="Artificial packet loss ratio")
+    args = parser.parse_args()
+    setup_logging(fmt=LOG_CLI_FORMAT)
+
+    if args.host is not None:
+        session = NetSession(args.host)
+    else:
+        session = NetSession(args.port, parse_address(args.join))
+    session.fake_latency = args.latency / 1000.0
+    session.fake_loss = args.loss
+
+    width, height, seed, rules = session.connect(args.width, args.height, match_rules())
+    game_logic = GameLogic(width, height, seed=seed, num_cameras=0, **rules)
+    session.attach(game_logic)
+    log.info("Connected as player %d: field %dx%d, seed %d", session.local_player + 1, width, height, seed,
+             extra=fields(**rules))
+
+    # Scripted local player: chase the ball with a slow wobble so rallies end
+    paddle = game_logic.paddle1 if session.local_player == 0 else game_logic.paddle2
+    frame_time = 1.0 / FPS
+    next_frame = time.perf_counter()
+    while session.tick < args.frames and session.connected:
+        wobble = math.sin(session.tick * 0.05 + session.local_player) * PADDLE_HEIGHT * 0.6
+        target = game_logic.ball.rect.centery + wobble
+        if (session.tick // 120) % 5 == 4:
+            target = None  # Simulate a lost hand now and then
+        session.advance(target)
+
+        next_frame += frame_time
+        time.sleep(max(0.0, next_frame - time.perf_counter()))
+
+    # Linger so the peer receives our last inputs and checksums
+    linger_until = time.monotonic() + 1.0
+    while time.monotonic() < linger_until and session.connected:
+        session.service()
+        session._update_checksums()
+        time.sleep(0.01)
+
+    rtt = f"{session.rtt_ms:.1f} ms" if session.rtt_ms is not None else "n/a"
+    log.info("Tick %d, score %d:%d, paddle y %d, last checksum %s, rtt %s", session.tick,
+             game_logic.score1, game_logic.score2, paddle.rect.y, session.last_checksum, rtt)
+    log.info(", ".join(f"{name} {value}" for name, value in session.stats.items()))
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
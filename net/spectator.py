@@ -0,0 +1,343 @@
+"""Spectator broadcast server for venue screens and remote viewers.
+
+The game loop only appends a small tuple to a bounded deque; an asyncio loop on
+a background thread encodes it into compact binary snapshots and fans them out
+to TCP or WebSocket clients. Snapshots are keyframes (all fields) or deltas
+against the latest keyframe, so a viewer that drops frames only needs the next
+keyframe to resync. Each viewer has its own bounded queue: a slow viewer loses
+frames instead of stalling the others or the renderer.
+
+Wire format (raw TCP): every message is a big-endian uint16 length followed by
+the payload. WebSocket clients get the same payload as binary frames.
+    keyframe: '!BI' (1, seq) + 15 x int16 fields
+    delta:    '!BIIH' (2, seq, keyframe seq, changed mask) + zigzag varint
+              differences from the keyframe for each changed field
+
+Fields: ball x, y, w, h, paddle1 x, y, w, h, paddle2 x, y, w, h, score1, score2, hit_count.
+
+Print a live match from another terminal:
+    python -m net.spectator --connect 127.0.0.1:47900
+"""
+import argparse
+import asyncio
+import base64
+import collections
+import hashlib
+import socket
+import struct
+import threading
+import time
+from utils.constants import *
+from utils.log import get_logger, setup_logging
+
+log = get_logger("spectator")
+
+MSG_KEYFRAME = 1
+MSG_DELTA = 2
+NUM_FIELDS = 15
+FIELD_NAMES = (
+    'ball_x', 'ball_y', 'ball_w', 'ball_h',
+    'paddle1_x', 'paddle1_y', 'paddle1_w', 'paddle1_h',
+    'paddle2_x', 'paddle2_y', 'paddle2_w', 'paddle2_h',
+    'score1', 'score2', 'hit_count',
+)
+
+KEYFRAME = struct.Struct('!BI%dh' % NUM_FIELDS)
+DELTA_HEADER = struct.Struct('!BIIH')
+LENGTH = struct.Struct('!H')
+WEBSOCKET_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+def game_state_fields(game_logic):
+    """Flatten the broadcast fields from GameLogic; cheap enough for the render thread."""
+    return (*game_logic.ball.rect, *game_logic.paddle1.rect, *game_logic.paddle2.rect,
+            game_logic.score1, game_logic.score2, game_logic.ball.hit_count)
+
+
+def _zigzag_varint(value):
+    value = (value << 1) ^ (value >> 63)
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return out
+
+
+def _read_zigzag_varint(data, offset):
+    shift = result = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return (result >> 1) ^ -(result & 1), offset
+
+
+class SnapshotEncoder:
+    """Turns field tuples into keyframe or delta payloads."""
+    def __init__(self, keyframe_interval=SPECTATOR_KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.seq = 0
+        self.keyframe = None
+        self.keyframe_seq = 0
+        self.keyframe_payload = None
+
+    def encode(self, fields):
+        """Return (payload, is_keyframe) for the next snapshot."""
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        if self.keyframe is None or self.seq - self.keyframe_seq >= self.keyframe_interval:
+            self.keyframe = fields
+            self.keyframe_seq = self.seq
+            self.keyframe_payload = KEYFRAME.pack(MSG_KEYFRAME, self.seq, *fields)
+            return self.keyframe_payload, True
+
+        mask = 0
+        body = bytearray()
+        for index, (value, base) in enumerate(zip(fields, self.keyframe)):
+            if value != base:
+                mask |= 1 << index
+                body += _zigzag_varint(value - base)
+        return DELTA_HEADER.pack(MSG_DELTA, self.seq, self.keyframe_seq, mask) + body, False
+
+
+class SnapshotDecoder:
+    """Client-side decoder; returns a field dict or None until a keyframe is seen."""
+    def __init__(self):
+        self.keyframe = None
+        self.keyframe_seq = None
+
+    def decode(self, payload):
+        if payload[0] == MSG_KEYFRAME:
+            _, seq, *fields = KEYFRAME.unpack(payload)
+            self.keyframe, self.keyframe_seq = fields, seq
+            return dict(zip(FIELD_NAMES, fields), seq=seq)
+
+        _, seq, keyframe_seq, mask = DELTA_HEADER.unpack_from(payload)
+        if keyframe_seq != self.keyframe_seq:
+            return None  # Missed the keyframe this delta is based on
+        fields = list(self.keyframe)
+        offset = DELTA_HEADER.size
+        for index in range(NUM_FIELDS):
+            if mask & (1 << index):
+                diff, offset = _read_zigzag_varint(payload, offset)
+                fields[index] += diff
+        return dict(zip(FIELD_NAMES, fields), seq=seq)
+
+
+class _Viewer:
+    """One connected spectator with its own bounded outgoing queue."""
+    def __init__(self, writer, websocket):
+        self.writer = writer
+        self.websocket = websocket
+        self.queue = asyncio.Queue(SPECTATOR_CLIENT_QUEUE)
+        self.synced = False  # Has the keyframe the next delta refers to
+        self.stalled_since = None
+        self.dropped = 0
+
+    def offer(self, frame, is_keyframe):
+        """Queue a frame without waiting; drop it if the viewer is behind."""
+        if not is_keyframe and not self.synced:
+            return
+        try:
+            self.queue.put_nowait(frame)
+            self.stalled_since = None
+            if is_keyframe:
+                self.synced = True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if is_keyframe:
+                self.synced = False
+            if self.stalled_since is None:
+                self.stalled_since = time.monotonic()
+
+
+class SpectatorServer:
+    """Background asyncio server publishing game snapshots to many viewers."""
+    def __init__(self, host='0.0.0.0', port=SPECTATOR_PORT, rate=SPECTATOR_RATE):
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.pending = collections.deque(maxlen=1)  # Only the newest state matters
+        self.encoder = SnapshotEncoder()
+        self.viewers = set()
+        self.loop = None
+        self.thread = None
+        self.ready = threading.Event()
+        self.stats = {'snapshots': 0, 'bytes_out': 0, 'viewers_peak': 0, 'frames_dropped': 0}
+
+    def start(self):
+        """Start the server thread and wait until it is listening."""
+        self.thread = threading.Thread(target=self._run, name="spectator-server", daemon=True)
+        self.thread.start()
+        self.ready.wait(5.0)
+
+    def publish(self, game_logic):
+        """Called from the game loop; never blocks."""
+        self.pending.append(game_state_fields(game_logic))
+
+    def stop(self):
+        if self.loop and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if self.thread:
+            self.thread.join(timeout=2.0)
+
+    @property
+    def viewer_count(self):
+        return len(self.viewers)
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            server = self.loop.run_until_complete(
+                asyncio.start_server(self._handle_client, self.host, self.port,
+                                     reuse_address=True, backlog=SPECTATOR_MAX_CLIENTS))
+        except OSError as e:
+            log.warning("Spectator server could not listen on port %d: %s", self.port, e)
+            self.ready.set()
+            return
+        self.port = server.sockets[0].getsockname()[1]
+        self.ready.set()
+        self.loop.create_task(self._broadcast())
+        try:
+            self.loop.run_forever()
+        finally:
+            server.close()
+            for viewer in list(self.viewers):
+                viewer.writer.close()
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.close()
+
+    async def _broadcast(self):
+        """Encode the newest state at a fixed rate and offer it to every viewer."""
+        interval = 1.0 / self.rate
+        last_fields = None
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                fields = self.pending.pop()
+            except IndexError:
+                fields = last_fields  # Game paused; keep viewers fed so they can resync
+            if fields is None or not self.viewers:
+                continue
+            last_fields = fields
+
+            payload, is_keyframe = self.encoder.encode(fields)
+            raw_frame = LENGTH.pack(len(payload)) + payload
+            ws_frame = _websocket_frame(payload)
+            self.stats['snapshots'] += 1
+
+            now = time.monotonic()
+            for viewer in list(self.viewers):
+                viewer.offer(ws_frame if viewer.websocket else raw_frame, is_keyframe)
+                if viewer.stalled_since and now - viewer.stalled_since > SPECTATOR_STALL_TIMEOUT:
+                    viewer.writer.close()
+                    self.viewers.discard(viewer)
+            self.stats['frames_dropped'] = sum(viewer.dropped for viewer in self.viewers)
+
+    async def _handle_client(self, reader, writer):
+        if len(self.viewers) >= SPECTATOR_MAX_CLIENTS:
+            writer.close()
+            return
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        websocket = False
+        try:
+            # WebSocket clients speak first; raw TCP viewers just listen
+            first = await asyncio.wait_for(reader.readexactly(4), timeout=0.5)
+            if first == b'GET ':
+                websocket = await self._websocket_handshake(reader, writer)
+                if not websocket:
+                    writer.close()
+                    return
+        except asyncio.TimeoutError:
+            pass
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+
+        viewer = _Viewer(writer, websocket)
+        if self.encoder.keyframe_payload:
+            payload = self.encoder.keyframe_payload
+            viewer.offer(_websocket_frame(payload) if websocket else LENGTH.pack(len(payload)) + payload, True)
+        self.viewers.add(viewer)
+        self.stats['viewers_peak'] = max(self.stats['viewers_peak'], len(self.viewers))
+
+        # A closed connection ends the input reader, which stops this writer loop
+        drain_input = asyncio.ensure_future(self._discard_input(reader))
+        drain_input.add_done_callback(lambda _: writer_task.cancel())
+        writer_task = asyncio.current_task()
+        try:
+            while True:
+                frame = await viewer.queue.get()
+                writer.write(frame)
+                self.stats['bytes_out'] += len(frame)
+                await writer.drain()  # Backpressure only ever waits on this viewer's task
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            pass
+        finally:
+            drain_input.cancel()
+            self.viewers.discard(viewer)
+            writer.close()
+
+    async def _discard_input(self, reader):
+        """Read and ignore client traffic so a closed connection is noticed."""
+        while await reader.read(1024):
+            pass
+
+    async def _websocket_handshake(self, reader, writer):
+        request = b'GET ' + await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), timeout=5.0)
+        key = None
+        for line in request.split(b'\r\n'):
+            name, _, value = line.partition(b':')
+            if name.strip().lower() == b'sec-websocket-key':
+                key = value.strip()
+        if key is None:
+            return False
+        accept = base64.b64encode(hashlib.sha1(key + WEBSOCKET_GUID).digest())
+        writer.write(b'HTTP/1.1 101 Switching Protocols\r\n'
+                     b'Upgrade: websocket\r\nConnection: Upgrade\r\n'
+                     b'Sec-WebSocket-Accept: ' + accept + b'\r\n\r\n')
+        await writer.drain()
+        return True
+
+
+def _websocket_frame(payload):
+    """Unmasked single-fragment binary frame (server to client)."""
+    length = len(payload)
+    if length < 126:
+        return bytes((0x82, length)) + payload
+    return bytes((0x82, 126)) + LENGTH.pack(length) + payload
+
+
+def main():
+    """Minimal raw TCP viewer that prints decoded snapshots."""
+    from net.netplay import parse_address
+
+    parser = argparse.ArgumentParser(description="Hand Gesture Pong spectator client")
+    parser.add_argument('--connect', default=f"127.0.0.1:{SPECTATOR_PORT}", metavar='HOST:PORT')
+    args = parser.parse_args()
+    setup_logging(fmt=LOG_CLI_FORMAT)
+
+    decoder = SnapshotDecoder()
+    with socket.create_connection(parse_address(args.connect, SPECTATOR_PORT)) as sock:
+        stream = sock.makefile('rb')
+        while True:
+            header = stream.read(LENGTH.size)
+            if len(header) < LENGTH.size:
+                break
+            state = decoder.decode(stream.read(LENGTH.unpack(header)[0]))
+            if state:
+                log.info("#%(seq)d ball (%(ball_x)d, %(ball_y)d) paddles %(paddle1_y)d/%(paddle2_y)d "
+                         "score %(score1)d:%(score2)d hits %(hit_count)d", state)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""Headless tournament host refereeing many tables in one process.
+
+Every table is an independent GameLogic (no window, no cameras, its own seed and
+winning score). A single asyncio scheduler steps all tables once per tick and
+records how long each table's step took. Remote camera clients send paddle
+positions for their (table, player) over UDP and receive the table state back.
+
+Host 64 tables and print latency reports:
+    python -m net.table_host --tables 64
+Feed a table from a camera (or --scripted for load testing without one):
+    python -m net.table_host --client 127.0.0.1:48000 --table 3 --player 1
+Measure per-table cost and tables-per-core capacity without networking:
+    python -m net.table_host --tables 200 --bench 10
+"""
+import argparse
+import array
+import asyncio
+import math
+import random
+import socket
+import struct
+import time
+from utils.constants import *
+from utils.log import get_logger, setup_logging
+from game.game_logic import GameLogic
+from net.netplay import encode_position, decode_position, parse_address, NO_INPUT
+from net.spectator import game_state_fields, NUM_FIELDS
+
+MAGIC = b'HT'
+MSG_TABLE_INPUT = 1
+MSG_TABLE_STATE = 2
+
+HEADER = struct.Struct('!2sB')
+TABLE_INPUT = struct.Struct('!HBIH')                   # table, player, seq, position code
+TABLE_STATE = struct.Struct('!HI%dh' % NUM_FIELDS)     # table, tick, state fields
+
+log = get_logger("tables")
+
+
+class Table:
+    """One match plus the latest input from each of its camera clients."""
+    def __init__(self, table_id, width, height, winning_score, seed):
+        self.table_id = table_id
+        self.game_logic = GameLogic(width, height, seed=seed, num_cameras=0, winning_score=winning_score)
+        self.inputs = [NO_INPUT, NO_INPUT]
+        self.input_seq = [-1, -1]
+        self.input_time = [0.0, 0.0]
+        self.clients = [None, None]
+        self.matches_played = 0
+        self.match_log = None  # Optional MatchLog receiving every finished match
+        self.latency_ns = array.array('q', bytes(8 * TABLE_LATENCY_SAMPLES))
+        self.latency_count = 0
+
+    def set_input(self, player, seq, code, addr, now):
+        """Store a client's position, ignoring reordered older packets."""
+        if seq <= self.input_seq[player] and self.clients[player] == addr:
+            return
+        self.input_seq[player] = seq
+        self.inputs[player] = code
+        self.input_time[player] = now
+        self.clients[player] = addr
+
+    def step(self, now):
+        """Advance the match one tick; returns the winner when a match ends."""
+        height = self.game_logic.height
+        positions = [decode_position(code, height) if now - seen < TABLE_INPUT_TIMEOUT else None
+                     for code, seen in zip(self.inputs, self.input_time)]
+        self.game_logic.step(positions, notify=False)
+        winner = self.game_logic.check_game_over()
+        if winner:
+            self.matches_played += 1
+            if self.match_log:
+                self.match_log.record(self.game_logic, winner, "tables", self.table_id)
+            self.game_logic.restart_game()
+        return winner
+
+    def record_latency(self, elapsed_ns):
+        self.latency_ns[self.latency_count % TABLE_LATENCY_SAMPLES] = elapsed_ns
+        self.latency_count += 1
+
+    def latency_samples(self):
+        return sorted(self.latency_ns[:min(self.latency_count, TABLE_LATENCY_SAMPLES)])
+
+
+def _percentile(sorted_values, p):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))]
+
+
+class TableHost(asyncio.DatagramProtocol):
+    """Steps N tables on one asyncio scheduler and relays inputs and state over UDP."""
+    def __init__(self, num_tables, width=1280, height=720, winning_score=WINNING_SCORE,
+                 tick_rate=FPS, seed=None):
+        rng = random.Random(seed)
+        self.tables = [Table(i, width, height, winning_score, rng.getrandbits(32)) for i in range(num_tables)]
+        self.tick_rate = tick_rate
+        self.tick = 0
+        self.transport = None
+        self.state_every = max(1, round(tick_rate / TABLE_STATE_RATE))
+        self.overruns = 0
+        self.busy_ns = 0
+
+    # UDP -------------------------------------------------------------------------
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        if len(data) < HEADER.size + TABLE_INPUT.size:
+            return
+        magic, msg_type = HEADER.unpack_from(data)
+        if magic != MAGIC or msg_type != MSG_TABLE_INPUT:
+            return
+        table_id, player, seq, code = TABLE_INPUT.unpack_from(data, HEADER.size)
+        if table_id < len(self.tables) and player < 2:
+            self.tables[table_id].set_input(player, seq, code, addr, time.monotonic())
+
+    def _send_state(self, table):
+        packet = (HEADER.pack(MAGIC, MSG_TABLE_STATE) +
+                  TABLE_STATE.pack(table.table_id, self.tick & 0xFFFFFFFF, *game_state_fields(table.game_logic)))
+        for addr in table.clients:
+            if addr is not None:
+                self.transport.sendto(packet, addr)
+
+    # Scheduling --------------------------------------------------------------------
+
+    def step_all(self, now):
+        """Step every table once, timing each one individually."""
+        send_state = self.transport is not None and self.tick % self.state_every == 0
+        clock = time.perf_counter_ns
+        tick_start = clock()
+        for table in self.tables:
+            start = clock()
+            table.step(now)
+            table.record_latency(clock() - start)
+            if send_state:
+                self._send_state(table)
+        self.busy_ns += clock() - tick_start
+        self.tick += 1
+
+    async def run(self, duration=None, report_interval=TABLE_REPORT_INTERVAL):
+        """Fixed-rate tick loop; reports per-table latency periodically."""
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.tick_rate
+        start = next_tick = next_report = loop.time()
+        while duration is None or loop.time() - start < duration:
+            self.step_all(time.monotonic())
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                self.overruns += 1
+                next_tick = loop.time()  # Don't try to catch up a backlog of ticks
+            if loop.time() >= next_report + report_interval:
+                next_report = loop.time()
+                log.info(self.report(loop.time() - start))
+            # Yield even when late so datagrams are still received
+            await asyncio.sleep(max(0.0, delay))
+
+    def report(self, elapsed):
+        """One-line latency summary across all tables."""
+        p50s, p99s = [], []
+        for table in self.tables:
+            samples = table.latency_samples()
+            p50s.append(_percentile(samples, 50))
+            p99s.append(_percentile(samples, 99))
+        p50s.sort()
+        utilization = self.busy_ns / 1e9 / elapsed if elapsed > 0 else 0.0
+        matches = sum(table.matches_played for table in self.tables)
+        connected = sum(1 for table in self.tables for addr in table.clients if addr)
+        return (f"{len(self.tables)} tables, tick {self.tick}: per-table step p50 {_percentile(p50s, 50) / 1000:.1f} us, "
+                f"p99 {max(p99s, default=0) / 1000:.1f} us (worst table), "
+                f"core utilization {utilization:.0%}, overruns {self.overruns}, "
+                f"clients {connected}, matches {matches}")
+
+
+def run_host(args):
+    host = TableHost(args.tables, args.width, args.height, args.winning_score, seed=args.seed)
+    match_log = None
+    if args.stats:
+        from game.match_stats import MatchLog
+        match_log = MatchLog(args.stats).open()
+        for table in host.tables:
+            table.match_log = match_log
+
+    async def serve():
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: host, local_addr=('0.0.0.0', args.port))
+        log.info("Hosting %d tables on UDP port %d", args.tables, args.port)
+        start = time.perf_counter()
+        try:
+            await host.run(args.duration)
+        finally:
+            log.info(host.report(time.perf_counter() - start))
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if match_log:
+            match_log.close()
+
+
+def run_bench(args):
+    """Free-running benchmark with scripted inputs: how many tables fit on one core?"""
+    host = TableHost(args.tables, args.width, args.height, args.winning_score, seed=args.seed)
+    for table in host.tables:
+        table.input_time = [math.inf, math.inf]  # Scripted inputs never time out
+    now = -math.inf
+
+    start = time.perf_counter()
+    while time.perf_counter() - start < args.bench:
+        for table in host.tables:
+            ball_y = table.game_logic.ball.rect.centery
+            wobble = math.sin(host.tick * 0.05 + table.table_id) * PADDLE_HEIGHT * 0.6
+            code = encode_position(ball_y + wobble, table.game_logic.height)
+            table.inputs = [code, code]
+        host.step_all(now)
+    elapsed = time.perf_counter() - start
+
+    ticks_per_second = host.tick / elapsed
+    table_ticks_per_second = ticks_per_second * args.tables
+    log.info(host.report(elapsed))
+    log.info(f"{table_ticks_per_second:,.0f} table-ticks/s on one core -> "
+             f"{table_ticks_per_second / FPS:,.0f} concurrent tables at {FPS} Hz")
+
+
+def run_client(args):
+    """Camera client for one seat at one table."""
+    address = parse_address(args.client, TABLE_HOST_PORT)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+
+    cap = detector = None
+    if not args.scripted:
+        from utils.helpers import setup_cameras
+        from game.gestures import GestureDetector
+        caps = setup_cameras(1)
+        if not caps:
+            raise SystemExit("No camera found")
+        cap = caps[0]
+        detector = GestureDetector(1)
+
+    seq = 0
+    ball_y = args.height // 2
+    next_frame = time.perf_counter()
+    while True:
+        if args.scripted:
+            position = ball_y + math.sin(seq * 0.05) * PADDLE_HEIGHT * 0.6
+        else:
+            ret, frame = cap.read()
+            position = None
+            if ret:
+                result, _ = detector.process_frame(frame, 0)
+                position = detector.get_paddle_position(
+                    result.multi_hand_landmarks if result else None, args.height, 0)
+        packet = HEADER.pack(MAGIC, MSG_TABLE_INPUT) + TABLE_INPUT.pack(
+            args.table, args.player, seq, encode_position(position, args.height))
+        sock.sendto(packet, address)
+        seq += 1
+
+        # Follow the ball from host state updates (used by the scripted player)
+        try:
+            while True:
+                data = sock.recv(256)
+                if data[:2] == MAGIC and data[2] == MSG_TABLE_STATE:
+                    fields = TABLE_STATE.unpack_from(data, HEADER.size)[2:]
+                    ball_y = fields[1] + fields[3] // 2
+        except (BlockingIOError, ConnectionResetError):
+            pass
+
+        next_frame += 1.0 / CAMERA_FPS
+        time.sleep(max(0.0, next_frame - time.perf_counter()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless multi-table Pong host")
+    parser.add_argument('--tables', type=int, default=16)
+    parser.add_argument('--port', type=int, default=TABLE_HOST_PORT)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--winning-score', type=int, default=WINNING_SCORE)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--duration', type=float, default=None, help="Seconds to host before exiting")
+    parser.add_argument('--bench', type=float, metavar='SECONDS',
+                        help="Measure per-table cost with scripted inputs instead of hosting")
+    parser.add_argument('--client', metavar='HOST:PORT', help="Run as a camera client for one seat")
+    parser.add_argument('--table', type=int, default=0)
+    parser.add_argument('--player', type=int, choices=(0, 1), default=0)
+    parser.add_argument('--scripted', action='store_true', help="Client sends synthetic input instead of a camera")
+    parser.add_argument('--stats', nargs='?', const=STATS_DIR, metavar='DIR',
+                        help="Append every finished match to the match log in DIR")
+    args = parser.parse_args()
+    setup_logging(fmt=LOG_CLI_FORMAT)
+
+    if args.client:
+        run_client(args)
+    elif args.bench:
+        run_bench(args)
+    else:
+        run_host(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,15 @@ import pygame
 import math
 import random
 from utils.constants import *
+from utils.log import get_logger, fields
+from utils.assets import assets
+from utils.config import settings
+
+log = get_logger("ui", rate_limit=True)
 
 class Text:
-    def __init__(self, text, size=FONT_SIZE, color=WHITE):
-        self.font = pygame.font.SysFont('Arial', size, bold=True)
+    def __init__(self, text, size=None, color=WHITE):
+        self.font = pygame.font.SysFont('Arial', size or settings.font_size, bold=True)
         self.color = color
         self.original_color = color
         self.flash_timer = 0
@@ -41,18 +46,25 @@ class Text:
             screen.blit(self.surface, (x, y))
 
 class EnhancedCameraDisplay:
-    def __init__(self, width=CAMERA_DISPLAY_WIDTH, height=CAMERA_DISPLAY_HEIGHT):
-        self.width = width
-        self.height = height
+    def __init__(self, width=None, height=None):
+        self.width = width or settings.camera_display_size[0]
+        self.height = height or settings.camera_display_size[1]
         self.border_color = CAMERA_BORDER_INACTIVE
         self.gesture_detected = False
         self.pulse_timer = 0
+        self.health = "ok"  # Camera supervisor state: "ok", "failing" or "reconnecting"
+        self.reconnect_attempts = 0
     
     def set_gesture_status(self, detected):
         """Update gesture detection status."""
         self.gesture_detected = detected
         self.border_color = CAMERA_BORDER_ACTIVE if detected else CAMERA_BORDER_INACTIVE
     
+    def set_camera_health(self, health, attempts=0):
+        """Update the camera's health as reported by its supervisor."""
+        self.health = health
+        self.reconnect_attempts = attempts
+    
     def update(self):
         """Update animations."""
         self.pulse_timer += 1
@@ -60,7 +72,11 @@ class EnhancedCameraDisplay:
     def draw(self, screen, surface, x, y, player_name="Player"):
         # Draw background
         bg_rect = pygame.Rect(x - 5, y - 25, self.width + 10, self.height + 35)
-        pygame.draw.rect(screen, DARK_GRAY, bg_rect, border_radius=10)
+        skin = assets.image("camera_frame", bg_rect.size)
+        if skin:
+            screen.blit(skin, bg_rect)
+        else:
+            pygame.draw.rect(screen, DARK_GRAY, bg_rect, border_radius=10)
         
         # Draw player label with gesture status
         label_font = pygame.font.SysFont('Arial', 20, bold=True)
@@ -119,7 +135,30 @@ class EnhancedCameraDisplay:
             error_font = pygame.font.SysFont('Arial', 16)
             error_text = error_font.render("No Camera", True, RED)
             error_rect = error_text.get_rect(center=no_feed_rect.center)
-            screen.blit(error_text, error_rect)
+            if self.health == "ok":
+                screen.blit(error_text, error_rect)
+        
+        if self.health != "ok":
+            self.draw_health(screen, x, y)
+    
+    def draw_health(self, screen, x, y):
+        """Dim the (stale) feed and say what the camera supervisor is doing."""
+        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 170))
+        screen.blit(overlay, (x, y))
+        
+        font = pygame.font.SysFont('Arial', 16, bold=True)
+        if self.health == "reconnecting":
+            dots = "." * (self.pulse_timer // 15 % 4)
+            lines = [f"Reconnecting{dots}"]
+            if self.reconnect_attempts:
+                lines.append(f"attempt {self.reconnect_attempts}")
+        else:
+            lines = ["Camera not responding"]
+        center_y = y + self.height // 2 - (len(lines) - 1) * 10
+        for i, line in enumerate(lines):
+            text = font.render(line, True, YELLOW)
+            screen.blit(text, text.get_rect(center=(x + self.width // 2, center_y + i * 20)))
 
 class MenuButton:
     def __init__(self, text, x, y, width, height, action):
@@ -168,8 +207,8 @@ class WinnerDisplay:
     def __init__(self, width, height):
         self.width = width
         self.height = height
-        self.winner_text = Text("", FONT_SIZE * 2, WHITE)
-        self.instruction_text = Text("Press SPACE to continue", FONT_SIZE // 2, LIGHT_GRAY)
+        self.winner_text = Text("", settings.font_size * 2, WHITE)
+        self.instruction_text = Text("Press SPACE to continue", settings.font_size // 2, LIGHT_GRAY)
         self.is_active = False
         self.fade_alpha = 0
         self.celebration_particles = []
@@ -185,7 +224,7 @@ class WinnerDisplay:
             self.animation_timer = 0
             self.create_celebration_particles()
         except Exception as e:
-            print(f"Error in show_winner: {e}")
+            log.error("Error in show_winner: %s", e, extra=fields(player=player_number))
             self.is_active = True  # Still show the winner screen without particles
     
     def create_celebration_particles(self):
@@ -204,7 +243,7 @@ class WinnerDisplay:
                 }
                 self.celebration_particles.append(particle)
         except Exception as e:
-            print(f"Error creating particles: {e}")
+            log.error("Error creating particles: %s", e)
             self.celebration_particles = []  # Ensure it's at least an empty list
     
     def update(self):
@@ -246,7 +285,7 @@ class WinnerDisplay:
                         particle['vy'] = random.uniform(-5, 5)
                         
                 except Exception as e:
-                    print(f"Error updating particle {i}: {e}")
+                    log.error("Error updating particle: %s", e, extra=fields(particle=i))
                     particles_to_remove.append(i)
             
             # Remove problematic particles
@@ -263,7 +302,7 @@ class WinnerDisplay:
             return False  # Never auto-close
             
         except Exception as e:
-            print(f"Error in winner display update: {e}")
+            log.error("Error in winner display update: %s", e)
             return False
     
     def handle_input(self, events):
@@ -275,7 +314,7 @@ class WinnerDisplay:
                     return True  # Indicate that we should transition to menu
             return False
         except Exception as e:
-            print(f"Error handling winner display input: {e}")
+            log.error("Error handling winner display input: %s", e)
             return False
     
     def close(self):
@@ -285,7 +324,7 @@ class WinnerDisplay:
             self.celebration_particles.clear()
             self.animation_timer = 0
         except Exception as e:
-            print(f"Error closing winner display: {e}")
+            log.error("Error closing winner display: %s", e)
     
     def draw(self, screen):
         """Draw the winner screen with effects."""
@@ -308,7 +347,7 @@ class WinnerDisplay:
                             pygame.draw.circle(screen, particle['color'], 
                                              (int(particle['x']), int(particle['y'])), 3)
                 except Exception as e:
-                    print(f"Error drawing particle: {e}")
+                    log.error("Error drawing particle: %s", e)
                     continue
             
             # Draw winner text
@@ -320,7 +359,7 @@ class WinnerDisplay:
             return True
             
         except Exception as e:
-            print(f"Error drawing winner screen: {e}")
+            log.error("Error drawing winner screen: %s", e)
             # Still try to draw basic text
             try:
                 self.winner_text.draw(screen, self.width // 2, self.height // 2 - 50, center=True)
@@ -328,43 +367,3 @@ class WinnerDisplay:
             except:
                 pass
             return True
-
-class SpeedNotification:
-    """Display speed increase notifications."""
-    def __init__(self, width, height):
-        self.width = width
-        self.height = height
-        self.notifications = []
-    
-    def add_speed_notification(self, hit_count, speed):
-        """Add a speed increase notification."""
-        notification = {
-            'text': f"SPEED UP! {speed:.1f}x",
-            'timer': 60,  # Show for 1 second at 60 FPS
-            'y_offset': 0,
-            'alpha': 255
-        }
-        self.notifications.append(notification)
-    
-    def update(self):
-        """Update all notifications."""
-        for notification in self.notifications[:]:
-            notification['timer'] -= 1
-            notification['y_offset'] += 2  # Move up
-            notification['alpha'] = max(0, int(255 * (notification['timer'] / 60)))
-            
-            if notification['timer'] <= 0:
-                self.notifications.remove(notification)
-    
-    def draw(self, screen):
-        """Draw all active notifications."""
-        font = pygame.font.SysFont('Arial', 32, bold=True)
-        
-        for notification in self.notifications:
-            text_surface = font.render(notification['text'], True, SPEED_INDICATOR_COLOR)
-            text_surface.set_alpha(notification['alpha'])
-            
-            text_rect = text_surface.get_rect(
-                center=(self.width // 2, self.height // 2 - 100 - notification['y_offset'])
-            )
-            screen.blit(text_surface, text_rect)
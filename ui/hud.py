@@ -2,17 +2,24 @@ import pygame
 import math
 from .components import Text, EnhancedCameraDisplay
 from utils.constants import *
+from utils.config import settings
 
 class GameHUD:
-    def __init__(self, width, height):
+    """Scores, speed meter and one camera tile per player along the top of the field.
+
+    cameras says, per player, whether it has a local camera tile (a CPU or
+    remote opponent has none); its length is the number of players.
+    """
+    def __init__(self, width, height, cameras=(True, True)):
         self.width = width
         self.height = height
-        self.score1_text = Text("0", FONT_SIZE * 2, WHITE)
-        self.score2_text = Text("0", FONT_SIZE * 2, WHITE)
-        self.separator_text = Text(":", FONT_SIZE * 2, GRAY)
-        
-        self.camera_display1 = EnhancedCameraDisplay()
-        self.camera_display2 = EnhancedCameraDisplay()
+        self.cameras = tuple(cameras)
+        self.score_texts = [Text("0", settings.font_size * 2, WHITE) for _ in self.cameras]
+        self.separator_text = Text(":", settings.font_size * 2, GRAY)
+        self.camera_displays = [EnhancedCameraDisplay() for _ in self.cameras]
+        self.camera_labels = [f"Player {player_id + 1}" for player_id in range(len(self.cameras))]
+        # A top paddle (3+ players) would sit under the score row, so the HUD moves down
+        self.top = PADDLE_OFFSET + PADDLE_WIDTH if len(self.cameras) > 2 else 0
         
         # Status indicators
         self.status_font = pygame.font.SysFont('Arial', 20, bold=True)
@@ -20,25 +27,26 @@ class GameHUD:
         self.speed_display = Text("SPEED: 1.0x", 24, WHITE)
         
         # Animation variables
-        self.score_pulse = [0, 0]  # For each player
+        self.score_pulse = [0] * len(self.cameras)  # For each player
         
-    def update_scores(self, score1, score2):
+    def update_scores(self, scores):
         """Update scores with flash animation on change."""
-        # Check if scores changed
-        if str(score1) != self.score1_text.text:
-            self.score1_text.update_text(score1)
-            self.score1_text.flash()
-            self.score_pulse[0] = 30  # Pulse animation
-        
-        if str(score2) != self.score2_text.text:
-            self.score2_text.update_text(score2)
-            self.score2_text.flash()
-            self.score_pulse[1] = 30  # Pulse animation
+        for player_id, (score, text) in enumerate(zip(scores, self.score_texts)):
+            # Check if score changed
+            if str(score) != text.text:
+                text.update_text(score)
+                text.flash()
+                self.score_pulse[player_id] = 30  # Pulse animation
+    
+    def update_camera_status(self, detected):
+        """Update camera displays with each player's gesture detection status."""
+        for display, gesture_detected in zip(self.camera_displays, detected):
+            display.set_gesture_status(gesture_detected)
     
-    def update_camera_status(self, gesture1_detected, gesture2_detected):
-        """Update camera displays with gesture detection status."""
-        self.camera_display1.set_gesture_status(gesture1_detected)
-        self.camera_display2.set_gesture_status(gesture2_detected)
+    def update_camera_health(self, caps):
+        """Show each player's capture supervisor state (captures without one always count as healthy)."""
+        for display, cap in zip(self.camera_displays, caps):
+            display.set_camera_health(getattr(cap, "health", "ok"), getattr(cap, "attempts", 0))
     
     def update_fps(self, fps):
         """Update FPS display with color coding."""
@@ -62,20 +70,20 @@ class GameHUD:
     
     def update_animations(self):
         """Update HUD animations."""
-        self.score1_text.update()
-        self.score2_text.update()
-        self.camera_display1.update()
-        self.camera_display2.update()
+        for text in self.score_texts:
+            text.update()
+        for display in self.camera_displays:
+            display.update()
         
         # Update score pulse
-        for i in range(2):
+        for i in range(len(self.score_pulse)):
             if self.score_pulse[i] > 0:
                 self.score_pulse[i] -= 1
     
     def draw_speed_meter(self, screen, ball):
         """Draw a visual speed meter."""
         meter_x = self.width // 2 - 100
-        meter_y = 100
+        meter_y = 100 + self.top
         meter_width = 200
         meter_height = 8
         
@@ -84,7 +92,7 @@ class GameHUD:
         pygame.draw.rect(screen, DARK_GRAY, bg_rect, border_radius=4)
         
         # Speed fill
-        speed_percent = (ball.current_speed - ball.base_speed) / (BALL_MAX_SPEED - ball.base_speed)
+        speed_percent = ball.get_speed_level()
         fill_width = int(meter_width * speed_percent)
         
         if fill_width > 0:
@@ -110,10 +118,10 @@ class GameHUD:
         hit_text = pygame.font.SysFont('Arial', 14).render(f"Hits: {ball.hit_count}", True, LIGHT_GRAY)
         screen.blit(hit_text, (meter_x + meter_width - 50, meter_y - 20))
     
-    def draw(self, screen, score1, score2, cam_surface0, cam_surface1, fps=60, ball=None):
-        """Draw the enhanced HUD with speed indicators."""
+    def draw(self, screen, scores, cam_surfaces, fps=60, ball=None):
+        """Draw the enhanced HUD with speed indicators (scores and camera surfaces indexed by player)."""
         # Update scores and displays
-        self.update_scores(score1, score2)
+        self.update_scores(scores)
         self.update_fps(fps)
         if ball:
             self.update_speed_display(ball)
@@ -126,49 +134,35 @@ class GameHUD:
         center_surface.fill(WHITE)
         screen.blit(center_surface, (self.width // 2 - 1, 0))
         
-        # Draw scores with pulse effect
-        score_y = 50
-        
-        # Player 1 score (left side)
-        scale1 = 1.0 + (self.score_pulse[0] / 30.0) * 0.3 if self.score_pulse[0] > 0 else 1.0
-        if scale1 > 1.0:
-            score1_surface = pygame.transform.scale(self.score1_text.surface, 
-                                                   (int(self.score1_text.surface.get_width() * scale1),
-                                                    int(self.score1_text.surface.get_height() * scale1)))
-            score1_rect = score1_surface.get_rect(center=(self.width // 2 - 80, score_y))
-            screen.blit(score1_surface, score1_rect)
-        else:
-            self.score1_text.draw(screen, self.width // 2 - 80, score_y, center=True)
-        
-        # Separator
-        self.separator_text.draw(screen, self.width // 2, score_y, center=True)
-        
-        # Player 2 score (right side)
-        scale2 = 1.0 + (self.score_pulse[1] / 30.0) * 0.3 if self.score_pulse[1] > 0 else 1.0
-        if scale2 > 1.0:
-            score2_surface = pygame.transform.scale(self.score2_text.surface, 
-                                                   (int(self.score2_text.surface.get_width() * scale2),
-                                                    int(self.score2_text.surface.get_height() * scale2)))
-            score2_rect = score2_surface.get_rect(center=(self.width // 2 + 80, score_y))
-            screen.blit(score2_surface, score2_rect)
-        else:
-            self.score2_text.draw(screen, self.width // 2 + 80, score_y, center=True)
+        # Draw scores with pulse effect, in player order, 160 px apart around the centre
+        score_y = 50 + self.top
+        count = len(self.score_texts)
+        for player_id, text in enumerate(self.score_texts):
+            x = self.width // 2 + (2 * player_id - count + 1) * 80
+            if player_id:
+                # Separator
+                self.separator_text.draw(screen, x - 80, score_y, center=True)
+            pulse = self.score_pulse[player_id]
+            scale = 1.0 + (pulse / 30.0) * 0.3 if pulse > 0 else 1.0
+            if scale > 1.0:
+                score_surface = pygame.transform.scale(text.surface,
+                                                       (int(text.surface.get_width() * scale),
+                                                        int(text.surface.get_height() * scale)))
+                screen.blit(score_surface, score_surface.get_rect(center=(x, score_y)))
+            else:
+                text.draw(screen, x, score_y, center=True)
         
         # Draw speed meter (this was missing!)
         if ball:
             self.draw_speed_meter(screen, ball)
         
-        # Draw camera feeds positioned away from paddle areas
-        # Player 1 camera - top center-left (away from left paddle)
-        cam1_x = self.width // 4 - CAMERA_DISPLAY_WIDTH // 2
-        cam1_y = 130  # Below scores, above paddle area
-        
-        # Player 2 camera - top center-right (away from right paddle)  
-        cam2_x = (self.width * 3) // 4 - CAMERA_DISPLAY_WIDTH // 2
-        cam2_y = 130  # Below scores, above paddle area
-        
-        self.camera_display1.draw(screen, cam_surface0, cam1_x, cam1_y, "Player 1")
-        self.camera_display2.draw(screen, cam_surface1, cam2_x, cam2_y, "Player 2")
+        # Draw camera feeds below the scores, spread evenly across the width
+        # (with two players: top center-left and center-right, away from the paddles)
+        cam_y = 130 + self.top
+        for player_id, display in enumerate(self.camera_displays):
+            if self.cameras[player_id]:
+                cam_x = self.width * (2 * player_id + 1) // (2 * count) - display.width // 2
+                display.draw(screen, cam_surfaces[player_id], cam_x, cam_y, self.camera_labels[player_id])
         
         # Draw game status information
         status_y = self.height - 40
@@ -186,6 +180,6 @@ class GameHUD:
         screen.blit(instruction_text, instruction_rect)
         
         # Winning score indicator
-        winning_text = self.status_font.render(f"First to {WINNING_SCORE} wins!", True, YELLOW)
+        winning_text = self.status_font.render(f"First to {settings.winning_score} wins!", True, YELLOW)
         winning_rect = winning_text.get_rect(right=self.width - 20, y=status_y)
         screen.blit(winning_text, winning_rect)
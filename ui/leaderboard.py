@@ -0,0 +1,82 @@
+import time
+import pygame
+from .components import Text
+from utils.constants import *
+from utils.config import settings
+from utils.log import get_logger, fields
+
+log = get_logger("ui")
+
+COLUMNS = (("rally", "Longest rally", "{} hits"), ("speed", "Top speed", "{:.1f}"), ("streak", "Win streak", "{} wins"))
+
+def _player(entry):
+    """Who set an entry: the side that won, plus the table on a tournament host."""
+    if entry["mode"] == "single" and entry["winner"] == 2:
+        return "CPU"
+    if entry["mode"] == "tables":
+        return f"P{entry['winner']}  table {entry['table']}"
+    return f"P{entry['winner']}"
+
+class LeaderboardScreen:
+    """Today's and all-time leaderboards, read from the match log's index files.
+
+    Everything is rendered once when the screen is opened; TAB switches
+    between today and all time.
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.title_text = Text("", settings.font_size // 2, WHITE)
+        self.hint_text = Text("TAB today / all time    SPACE back", 24, GRAY)
+        self.header_font = pygame.font.SysFont('Arial', 30, bold=True)
+        self.entry_font = pygame.font.SysFont('Arial', 24)
+        self.pages = {}
+        self.page = "today"
+
+    def show(self, directory):
+        # Imported here so the menu doesn't pull in NumPy before the game has loaded
+        from game.match_stats import load_leaderboards
+        start = time.perf_counter()
+        boards = {"today": load_leaderboards(directory), "all": load_leaderboards(directory, "all")}
+        log.info("Loaded leaderboards in %.1f ms", (time.perf_counter() - start) * 1000,
+                 extra=fields(directory=directory))
+        self.pages = {page: self._render(page_boards) for page, page_boards in boards.items()}
+        self.page = "today"
+        self.title_text.update_text("Today's best")
+
+    def _render(self, boards):
+        """(surface, position) pairs for one page of three columns."""
+        blits = []
+        column_width = self.width // len(COLUMNS)
+        for i, (board, title, value_format) in enumerate(COLUMNS):
+            x = column_width * i + column_width // 2
+            header = self.header_font.render(title, True, YELLOW)
+            blits.append((header, header.get_rect(center=(x, 200))))
+            entries = boards.get(board, [])
+            if not entries:
+                entries_text = [("No entries yet", GRAY)]
+            else:
+                entries_text = [(f"{rank}. {value_format.format(entry['value'])}  -  {_player(entry)}", LIGHT_GRAY)
+                                for rank, entry in enumerate(entries, 1)]
+            for row, (text, color) in enumerate(entries_text):
+                surface = self.entry_font.render(text, True, color)
+                blits.append((surface, surface.get_rect(center=(x, 250 + row * 34))))
+        return blits
+
+    def handle_input(self, events):
+        """True when the screen should close."""
+        for event in events:
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key == pygame.K_TAB:
+                self.page = "all" if self.page == "today" else "today"
+                self.title_text.update_text("Today's best" if self.page == "today" else "All-time best")
+            elif event.key in (pygame.K_SPACE, pygame.K_ESCAPE, pygame.K_l):
+                return True
+        return False
+
+    def draw(self, screen):
+        screen.fill(BLACK)
+        self.title_text.draw(screen, self.width // 2, 100, center=True)
+        screen.blits(self.pages.get(self.page, ()), doreturn=False)
+        self.hint_text.draw(screen, self.width // 2, self.height - 60, center=True)
@@ -2,13 +2,14 @@ import pygame
 import math
 from .components import Text, MenuButton
 from utils.constants import *
+from utils.config import settings
 
 class Menu:
     def __init__(self, width, height):
         self.width = width
         self.height = height
-        self.title_text = Text("Hand Gesture Pong", FONT_SIZE * 2, WHITE)
-        self.subtitle_text = Text("Use hand gestures to control your paddle", FONT_SIZE // 3, LIGHT_GRAY)
+        self.title_text = Text("Hand Gesture Pong", settings.font_size * 2, WHITE)
+        self.subtitle_text = Text("Use hand gestures to control your paddle", settings.font_size // 3, LIGHT_GRAY)
         
         # Create interactive buttons
         button_width, button_height = 300, 60
@@ -24,6 +25,30 @@ class Menu:
         # Animation variables
         self.title_float = 0
         self.background_particles = self.create_background_particles()
+        
+        # Instruction lines never change, so they are rendered once
+        instructions = [
+            "• Pinch your index finger and thumb together",
+            "• Move your hand up and down to control the paddle",
+            "• Make sure you're in good lighting",
+            f"• First player to {settings.winning_score} points wins!"
+        ]
+        instruction_font = pygame.font.SysFont('Arial', 24)
+        self.instruction_surfaces = []
+        for i, instruction in enumerate(instructions):
+            text_surface = instruction_font.render(instruction, True, GRAY)
+            text_rect = text_surface.get_rect(center=(width // 2, height // 2 - 30 + i * 30))
+            self.instruction_surfaces.append((text_surface, text_rect))
+        
+        # Readiness of cameras and hand tracking, loaded in the background
+        self.status = "Starting"
+        self.status_state = "loading"  # "loading", "ready" or "error"
+        self.status_font = pygame.font.SysFont('Arial', 22, bold=True)
+    
+    def set_status(self, text, state="loading"):
+        """Update the readiness line shown under the buttons."""
+        self.status = text
+        self.status_state = state
     
     def create_background_particles(self):
         """Create floating background particles for visual appeal."""
@@ -78,26 +103,34 @@ class Menu:
         self.subtitle_text.draw(screen, self.width // 2, self.height // 2 - 100, center=True)
         
         # Draw gesture instructions
-        instructions = [
-            "• Pinch your index finger and thumb together",
-            "• Move your hand up and down to control the paddle",
-            "• Make sure you're in good lighting",
-            "• First player to 5 points wins!"
-        ]
-        
-        instruction_font = pygame.font.SysFont('Arial', 24)
-        for i, instruction in enumerate(instructions):
-            text_surface = instruction_font.render(instruction, True, GRAY)
-            text_rect = text_surface.get_rect(center=(self.width // 2, self.height // 2 - 30 + i * 30))
+        for text_surface, text_rect in self.instruction_surfaces:
             screen.blit(text_surface, text_rect)
         
         # Draw buttons
         for button in self.buttons:
             button.draw(screen)
         
+        self.draw_status(screen)
+        
         # Update animations
         self.update_animations()
     
+    def draw_status(self, screen):
+        """Readiness indicator: pulsing dot and text, green once the game can start."""
+        color = {"ready": GREEN, "error": RED}.get(self.status_state, YELLOW)
+        text = self.status
+        if self.status_state == "loading":
+            text += "." * (int(self.title_float * 2) % 4)
+        text_surface = self.status_font.render(text, True, color)
+        y = self.height // 2 + 230
+        text_rect = text_surface.get_rect(midleft=(self.width // 2 - text_surface.get_width() // 2 + 12, y))
+        screen.blit(text_surface, text_rect)
+        
+        radius = 6
+        if self.status_state == "loading":
+            radius = 4 + int(2 * abs(math.sin(self.title_float * 2)))
+        pygame.draw.circle(screen, color, (text_rect.left - 16, y), radius)
+    
     def handle_events(self, events):
         """Handle menu events with mouse and keyboard support."""
         mouse_pos = pygame.mouse.get_pos()
@@ -113,6 +146,8 @@ class Menu:
                     return "start"
                 elif event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
                     return "quit"
+                elif event.key == pygame.K_l:
+                    return "leaderboard"
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_clicked = True
         
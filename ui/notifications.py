@@ -0,0 +1,109 @@
+import pygame
+from collections import OrderedDict
+from utils.constants import *
+
+class NotificationStyle:
+    """How one kind of notification looks and moves."""
+    __slots__ = ("font_size", "color", "duration", "rise", "y")
+
+    def __init__(self, font_size, color, duration, rise, y):
+        self.font_size = font_size
+        self.color = color
+        self.duration = duration  # Frames on screen
+        self.rise = rise          # Pixels moved up per frame
+        self.y = y                # Start height relative to the screen centre
+
+NOTIFICATION_STYLES = {
+    "speed": NotificationStyle(28, SPEED_INDICATOR_COLOR, 90, 1, -150),
+}
+
+class Notification:
+    """One pool slot; surface is shared with every other slot showing the same text.
+
+    The surface is rendered on the first draw, so a headless simulation
+    (without fonts) can still queue messages.
+    """
+    __slots__ = ("active", "text", "style_name", "surface", "style", "timer", "y_offset", "alpha")
+
+    def __init__(self):
+        self.active = False
+        self.text = None
+        self.style_name = None
+        self.surface = None
+        self.style = None
+        self.timer = 0
+        self.y_offset = 0
+        self.alpha = 255
+
+class NotificationPool:
+    """Floating text messages drawn from a fixed set of preallocated slots.
+
+    Each distinct message is rendered once and cached; per frame only the
+    slot's position and alpha change. When every slot is busy the oldest
+    message is replaced, so a burst of messages never allocates.
+    """
+    def __init__(self, width, height, size=NOTIFICATION_POOL_SIZE):
+        self.width = width
+        self.height = height
+        self.slots = [Notification() for _ in range(size)]
+        self.fonts = {}
+        self.surfaces = OrderedDict()  # (text, style name) -> rendered surface, least recently used first
+
+    def _surface(self, text, style_name):
+        key = (text, style_name)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        style = NOTIFICATION_STYLES[style_name]
+        font = self.fonts.get(style.font_size)
+        if font is None:
+            font = self.fonts[style.font_size] = pygame.font.SysFont('Arial', style.font_size, bold=True)
+        surface = font.render(text, True, style.color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > NOTIFICATION_TEXT_CACHE:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def show(self, text, style="speed"):
+        """Start a notification in a free slot (or the one closest to expiring)."""
+        slot = min(self.slots, key=lambda s: s.timer if s.active else -1)
+        slot.text = text
+        slot.style_name = style
+        slot.surface = None
+        slot.style = NOTIFICATION_STYLES[style]
+        slot.timer = slot.style.duration
+        slot.y_offset = 0
+        slot.alpha = 255
+        slot.active = True
+
+    def update(self):
+        """Advance every active notification by one frame."""
+        for slot in self.slots:
+            if slot.active:
+                slot.timer -= 1
+                slot.y_offset += slot.style.rise
+                slot.alpha = max(0, int(255 * (slot.timer / slot.style.duration)))
+                if slot.timer <= 0:
+                    slot.active = False
+
+    def draw(self, screen):
+        for slot in self.slots:
+            if slot.active:
+                surface = slot.surface
+                if surface is None:
+                    surface = slot.surface = self._surface(slot.text, slot.style_name)
+                # Slots showing the same text share a surface, so the alpha is set right before each blit
+                if surface.get_alpha() != slot.alpha:
+                    surface.set_alpha(slot.alpha)
+                rect = surface.get_rect(center=(self.width // 2,
+                                                self.height // 2 + slot.style.y - slot.y_offset))
+                screen.blit(surface, rect)
+
+    def clear(self):
+        for slot in self.slots:
+            slot.active = False
+
+    @property
+    def active_count(self):
+        return sum(slot.active for slot in self.slots)
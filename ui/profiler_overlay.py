@@ -0,0 +1,35 @@
+import pygame
+from utils.constants import *
+
+class ProfilerOverlay:
+    """Table of per-stage p50/p95/p99 timings from the StageProfiler (toggle with F3)."""
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.font = pygame.font.SysFont('Courier New', 16, bold=True)
+        self.surface = None
+        self.last_refresh = 0
+    
+    def draw(self, screen, x=20, y=20):
+        """Blit the cached table, re-rendering it only a couple of times per second."""
+        now = pygame.time.get_ticks()
+        if self.surface is None or now - self.last_refresh >= PROFILER_OVERLAY_REFRESH:
+            self.surface = self.render()
+            self.last_refresh = now
+        screen.blit(self.surface, (x, y))
+    
+    def render(self):
+        """Render the stage table onto a translucent panel."""
+        lines = [f"{'stage':<12}{'p50':>8}{'p95':>8}{'p99':>8}  ms"]
+        for stage, (p50, p95, p99) in self.profiler.summary().items():
+            lines.append(f"{stage:<12}{p50:>8.2f}{p95:>8.2f}{p99:>8.2f}")
+        if len(lines) == 1:
+            lines.append("collecting...")
+        
+        line_height = self.font.get_linesize()
+        text_surfaces = [self.font.render(line, True, YELLOW if i == 0 else WHITE) for i, line in enumerate(lines)]
+        width = max(surface.get_width() for surface in text_surfaces) + 20
+        panel = pygame.Surface((width, line_height * len(lines) + 20), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        for i, surface in enumerate(text_surfaces):
+            panel.blit(surface, (10, 10 + i * line_height))
+        return panel
@@ -0,0 +1,167 @@
+"""Image skins converted to the display format once and cached on disk.
+
+A skin is an optional image in assets/images/ (paddle.png, ball.png,
+camera_frame.png, background.png) that replaces the procedural drawing of
+that element. Loading one means decoding, converting and smooth-scaling it
+to the size it is drawn at; the scaled pixels are then written to
+ASSET_CACHE_DIR as raw RGBA, keyed by a hash of the source file and the
+target size (the arena's flat paddles get their own, turned copy). Later
+boots read those bytes straight into a surface and only convert it to the
+display format. In memory, every (skin, size) is converted once, so drawing
+a frame is a dictionary lookup and a blit.
+
+Pre-build the cache for a resolution (e.g. for a themed build):
+    python -m utils.assets 1920x1080
+"""
+import glob
+import hashlib
+import os
+import struct
+import sys
+import time
+import pygame
+from .constants import (IMAGE_DIR, ASSET_CACHE_DIR, PADDLE_WIDTH, PADDLE_HEIGHT, BALL_SIZE, LOG_CLI_FORMAT,
+                        MAX_PLAYERS)
+from .config import settings
+from .log import get_logger, setup_logging, fields
+
+log = get_logger("assets")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXTENSIONS = (".png", ".jpg", ".bmp", ".webp")
+
+CACHE_VERSION = 1
+HEADER = struct.Struct("<4sBHHB")  # Magic, version, width, height, has alpha
+
+
+def skin_sizes(screen_size, num_players=2):
+    """(skin, size it is drawn at, has alpha, turned a quarter) for a screen of this size."""
+    sizes = [
+        ("paddle", (PADDLE_WIDTH, PADDLE_HEIGHT), True, False),
+        ("ball", (BALL_SIZE, BALL_SIZE), True, False),
+        ("camera_frame", (settings.camera_display_size[0] + 10, settings.camera_display_size[1] + 35), True, False),
+        ("background", tuple(screen_size), False, False),
+    ]
+    if num_players > 2:
+        # The arena's top and bottom paddles lie flat: the paddle skin turned, not stretched
+        sizes.append(("paddle", (PADDLE_HEIGHT, PADDLE_WIDTH), True, True))
+    return sizes
+
+
+class AssetCache:
+    """Converted, pre-scaled skins by (name, size, rotated); None marks a skin without an image."""
+    def __init__(self, directory=IMAGE_DIR, cache_dir=ASSET_CACHE_DIR):
+        self.directory = os.path.join(ROOT, directory)
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.surfaces = {}
+
+    def source(self, name):
+        for extension in EXTENSIONS:
+            path = os.path.join(self.directory, name + extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def image(self, name, size, alpha=True, rotated=False):
+        """The skin scaled to size in the display's pixel format, or None to draw procedurally.
+
+        A rotated skin is scaled to the transposed size and turned a quarter
+        counterclockwise, so a vertical paddle image can be drawn lying flat.
+        """
+        key = (name, size, rotated)
+        try:
+            return self.surfaces[key]
+        except KeyError:
+            pass
+        if pygame.display.get_surface() is None:
+            return None  # Headless (or not set up yet): nothing to convert to
+        path = self.source(name)
+        surface = self._load(name, path, size, alpha, rotated) if path else None
+        self.surfaces[key] = surface
+        return surface
+
+    def preload(self, screen_size, num_players=2):
+        """Load every skin at the size it will be drawn at (call once the display exists)."""
+        for name, size, alpha, rotated in skin_sizes(screen_size, num_players):
+            self.image(name, size, alpha, rotated)
+
+    def _cache_path(self, name, digest, size, alpha, rotated):
+        return os.path.join(self.cache_dir, f"{name}-{digest}-{size[0]}x{size[1]}-{'a' if alpha else 'o'}"
+                                            f"{'-r' if rotated else ''}.raw")
+
+    def _load(self, name, path, size, alpha, rotated=False):
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()[:16]
+        cache_path = self._cache_path(name, digest, size, alpha, rotated)
+        surface = self._read_cache(cache_path, size, alpha)
+        origin = "cache"
+        if surface is None:
+            origin = "source"
+            try:
+                image = pygame.image.load(path, path)
+            except pygame.error as e:
+                log.warning("Could not load skin %s: %s", path, e)
+                return None
+            image = image.convert_alpha() if alpha else image.convert()
+            scaled_size = (size[1], size[0]) if rotated else size
+            surface = pygame.transform.smoothscale(image, scaled_size) if image.get_size() != scaled_size else image
+            if rotated:
+                surface = pygame.transform.rotate(surface, 90)
+            self._write_cache(name, digest, cache_path, surface, alpha)
+        log.info("Loaded skin %s", name, extra=fields(size=f"{size[0]}x{size[1]}", origin=origin, rotated=rotated,
+                                                     ms=round((time.perf_counter() - start) * 1000, 1)))
+        return surface
+
+    def _read_cache(self, cache_path, size, alpha):
+        try:
+            with open(cache_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < HEADER.size:
+            return None
+        magic, version, width, height, has_alpha = HEADER.unpack_from(data)
+        pixels = memoryview(data)[HEADER.size:]
+        if (magic != b"PGAS" or version != CACHE_VERSION or (width, height) != size or has_alpha != alpha
+                or len(pixels) != width * height * (4 if alpha else 3)):
+            return None
+        surface = pygame.image.frombuffer(pixels, size, "RGBA" if alpha else "RGB")
+        # The copy into the display format also detaches the surface from the file data
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def _write_cache(self, name, digest, cache_path, surface, alpha):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Entries for an older version of this image are never read again
+            for stale in glob.glob(os.path.join(self.cache_dir, f"{name}-*.raw")):
+                if f"-{digest}-" not in stale:
+                    os.remove(stale)
+            tmp = f"{cache_path}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(HEADER.pack(b"PGAS", CACHE_VERSION, *surface.get_size(), alpha))
+                f.write(pygame.image.tobytes(surface, "RGBA" if alpha else "RGB"))
+            os.replace(tmp, cache_path)
+        except OSError as e:
+            log.warning("Could not write asset cache %s: %s", cache_path, e)
+
+
+assets = AssetCache()
+
+
+def main():
+    if len(sys.argv) != 2 or "x" not in sys.argv[1]:
+        sys.exit("usage: python -m utils.assets WIDTHxHEIGHT")
+    size = tuple(int(v) for v in sys.argv[1].split("x"))
+    setup_logging(fmt=LOG_CLI_FORMAT)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))  # convert() needs a display; the cache itself is format independent
+    assets.preload(size, MAX_PLAYERS)  # With the arena's flat paddles
+    found = [name for (name, _), surface in assets.surfaces.items() if surface is not None]
+    log.info("Cached %d skins for %dx%d in %s: %s", len(found), *size, assets.cache_dir, ", ".join(found) or "-")
+
+
+if __name__ == "__main__":
+    main()
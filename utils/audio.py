@@ -0,0 +1,151 @@
+"""Sound effects, decoded into memory before the first match.
+
+The mixer is pre-initialized with a small output buffer (AUDIO_BUFFER
+frames) so a sound starts within a few milliseconds of being triggered.
+Every effect is loaded from assets/sounds/<name>.wav or .ogg when present,
+otherwise synthesized with NumPy, and held as a decoded Sound: playing one
+never touches the disk. Each effect owns one reserved mixer channel, so a
+burst of hits restarts that effect instead of taking more channels.
+
+Enabled by enable_sounds/sound_volume in the [Audio] section of config.ini;
+update() applies an edit of either while the game runs.
+"""
+import math
+import os
+import time
+from array import array
+import pygame
+from .constants import AUDIO_FREQUENCY, AUDIO_BUFFER, AUDIO_LATENCY_SAMPLES, AUDIO_VOLUME, SOUND_DIR
+from .log import get_logger, fields
+from .telemetry import metrics
+
+log = get_logger("audio")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Effect -> notes (start Hz, end Hz, seconds) of the square-wave stand-in used without a sound file
+EFFECTS = {
+    "paddle_hit": ((880, 660, 0.05),),
+    "wall_bounce": ((440, 440, 0.035),),
+    "score": ((520, 1040, 0.18),),
+    "game_start": ((523, 523, 0.09), (659, 659, 0.09), (784, 784, 0.16)),
+    "game_over": ((784, 784, 0.12), (659, 659, 0.12), (523, 392, 0.3)),
+}
+
+PLAYED = {name: metrics.counter("pong_sounds_played_total", "Sound effects started", sound=name) for name in EFFECTS}
+
+
+def _synthesize(notes, rate, channels):
+    """Square-wave notes with a short attack and an exponential decay, as 16-bit samples."""
+    import numpy as np
+    parts = []
+    for start_hz, end_hz, seconds in notes:
+        count = int(rate * seconds)
+        t = np.arange(count) / rate
+        phase = 2 * np.pi * np.cumsum(np.linspace(start_hz, end_hz, count)) / rate
+        envelope = np.minimum(1.0, t / 0.002) * np.exp(-4.0 * t / seconds)
+        parts.append(np.sign(np.sin(phase)) * envelope)
+    wave = (np.concatenate(parts) * 0.35 * 32767).astype(np.int16)
+    return np.repeat(wave[:, None], channels, axis=1) if channels > 1 else wave
+
+
+class SoundBank:
+    """Preloaded effects played on reserved channels; every call returns at once while disabled.
+
+    play() also records how long triggering took, which together with the
+    mixer's buffer period gives the hit-to-sound latency.
+    """
+    def __init__(self, samples=AUDIO_LATENCY_SAMPLES):
+        self.enabled = False
+        self.volume = AUDIO_VOLUME
+        self.sounds = {}  # Effect -> (Sound, Channel), filled by load()
+        self.buffer_ms = 0.0
+        self.samples = samples
+        self.dispatch_ns = array('q', bytes(8 * samples))
+        self.count = 0
+
+    def configure(self, enabled, volume=AUDIO_VOLUME):
+        """Call before pygame.init() so the mixer opens with the small buffer."""
+        self.enabled = enabled
+        self.volume = max(0.0, min(1.0, volume))
+        if enabled:
+            pygame.mixer.pre_init(AUDIO_FREQUENCY, -16, 2, AUDIO_BUFFER)
+
+    def update(self, enabled, volume):
+        """Apply a reloaded [Audio] section: sounds are loaded on first enable and kept when muted."""
+        self.volume = max(0.0, min(1.0, volume))
+        for sound, _ in self.sounds.values():
+            sound.set_volume(self.volume)
+        was_enabled, self.enabled = self.enabled, enabled
+        if enabled and not was_enabled and not self.sounds:
+            self.load()
+        elif not enabled and was_enabled:
+            for _, channel in self.sounds.values():
+                channel.stop()
+
+    def load(self, directory=SOUND_DIR):
+        """Decode or synthesize every effect; safe to run off the main thread."""
+        if not self.enabled:
+            return
+        start = time.perf_counter()
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init(AUDIO_FREQUENCY, -16, 2, AUDIO_BUFFER)
+            rate, size, channels = pygame.mixer.get_init()
+        except pygame.error as e:
+            log.warning("No audio device, sounds disabled: %s", e)
+            self.enabled = False
+            return
+        pygame.mixer.set_num_channels(len(EFFECTS))
+        pygame.mixer.set_reserved(len(EFFECTS))
+        sounds = {}
+        synthesized = []
+        for i, (name, notes) in enumerate(EFFECTS.items()):
+            sound = None
+            for extension in (".wav", ".ogg"):
+                path = os.path.join(ROOT, directory, name + extension)
+                if os.path.exists(path):
+                    try:
+                        sound = pygame.mixer.Sound(path)
+                    except pygame.error as e:
+                        log.warning("Could not load %s: %s", path, e)
+                    break
+            if sound is None:
+                if size != -16:
+                    continue  # Synthesized samples are 16-bit
+                sound = pygame.sndarray.make_sound(_synthesize(notes, rate, channels))
+                synthesized.append(name)
+            sound.set_volume(self.volume)
+            sounds[name] = (sound, pygame.mixer.Channel(i))
+        self.sounds = sounds
+        self.buffer_ms = AUDIO_BUFFER / rate * 1000
+        log.info("Loaded %d sounds in %.0f ms", len(sounds), (time.perf_counter() - start) * 1000,
+                 extra=fields(synthesized=synthesized, rate=rate, buffer_ms=round(self.buffer_ms, 1)))
+
+    def play(self, name):
+        """Start an effect now, cutting off the previous play of the same effect."""
+        if not self.enabled:
+            return
+        entry = self.sounds.get(name)
+        if entry is None:
+            return  # Still loading
+        start = time.perf_counter_ns()
+        entry[1].play(entry[0])
+        self.dispatch_ns[self.count % self.samples] = time.perf_counter_ns() - start
+        self.count += 1
+        PLAYED[name].inc()
+
+    def report(self):
+        """Trigger cost percentiles plus the output buffer period, in milliseconds."""
+        if not self.count:
+            return None
+        samples = sorted(self.dispatch_ns[:min(self.count, self.samples)])
+        p50 = samples[len(samples) // 2] / 1e6
+        p99 = samples[min(len(samples) - 1, math.ceil(len(samples) * 0.99) - 1)] / 1e6
+        # A triggered sound is mixed into the next buffer, which plays after the current one
+        return (f"Sound: {self.count} played, trigger p50 {p50:.3f} ms, p99 {p99:.3f} ms, "
+                f"output buffer {self.buffer_ms:.1f} ms; hit-to-sound {p50 + self.buffer_ms:.1f}-"
+                f"{p99 + 2 * self.buffer_ms:.1f} ms plus device latency")
+
+
+sounds = SoundBank()
@@ -0,0 +1,304 @@
+"""Camera discovery and supervision.
+
+Opening a missing or busy camera can block for seconds, and on Linux every
+UVC camera also exposes metadata nodes (/dev/video1, /dev/video3, ...) that
+open but never deliver frames. All candidates are therefore probed at the
+same time, each one has to return a real frame, and the result is cached on
+disk keyed by the set of device nodes present. Later startups open the cached
+devices directly and only probe again when that fails or the devices change.
+
+SupervisedCamera wraps an opened device and reopens it in the background
+when it disappears mid-match (e.g. a USB reset).
+"""
+import glob
+import json
+import os
+import re
+import sys
+import threading
+import time
+from .constants import (CAMERA_CACHE_PATH, CAMERA_PROBE_MAX_INDEX, CAMERA_PROBE_TIMEOUT, CAMERA_PROBE_READS,
+                        CAMERA_FAIL_THRESHOLD, CAMERA_RECONNECT_DELAY, CAMERA_RECONNECT_MAX_DELAY)
+from .config import settings
+from .log import get_logger, fields
+
+log = get_logger("camera")
+
+CACHE_VERSION = 1
+
+def backend():
+    """Capture API for this platform (DirectShow only exists on Windows)."""
+    import cv2
+    if sys.platform.startswith("linux"):
+        return cv2.CAP_V4L2
+    if sys.platform == "win32":
+        return cv2.CAP_DSHOW
+    return cv2.CAP_ANY
+
+def candidate_indices():
+    """Device indices worth probing: the /dev/video* nodes on Linux, a fixed range elsewhere."""
+    if sys.platform.startswith("linux"):
+        nodes = (re.fullmatch(r"/dev/video(\d+)", path) for path in glob.glob("/dev/video*"))
+        return sorted(int(match.group(1)) for match in nodes if match)
+    return list(range(CAMERA_PROBE_MAX_INDEX))
+
+def configure(cap):
+    """Apply the capture settings the game runs with."""
+    import cv2
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, settings.capture_width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, settings.capture_height)
+    cap.set(cv2.CAP_PROP_FPS, settings.capture_fps)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduce buffer to minimize lag
+    # Note: Auto exposure setting may not work on all cameras
+    cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, 0.25)
+
+def _open(index, api):
+    """Open and configure one device; returns (capture, first frame), or (None, None)."""
+    import cv2
+    cap = cv2.VideoCapture(index, api)
+    if not cap.isOpened():
+        cap.release()
+        return None, None
+    configure(cap)
+    # The first reads can fail while the sensor starts streaming
+    for _ in range(CAMERA_PROBE_READS):
+        ok, frame = cap.read()
+        if ok and frame is not None:
+            return cap, frame
+    cap.release()
+    return None, None
+
+def open_camera(index, api=None):
+    """Open a device that is known to work; None if it no longer delivers frames."""
+    return _open(index, backend() if api is None else api)[0]
+
+def probe(index, api):
+    """Capabilities of one device, or None when it can't deliver frames."""
+    import cv2
+    start = time.perf_counter()
+    cap, frame = _open(index, api)
+    if cap is None:
+        return None
+    height, width = frame.shape[:2]
+    info = {
+        "index": index,
+        "backend": api,
+        "width": width,
+        "height": height,
+        "fps": cap.get(cv2.CAP_PROP_FPS),
+        "matches": (width, height) == (settings.capture_width, settings.capture_height),
+        "probe_ms": round((time.perf_counter() - start) * 1000),
+    }
+    cap.release()
+    return info
+
+def probe_all(indices, timeout=CAMERA_PROBE_TIMEOUT):
+    """Probe every index concurrently; devices still blocked after timeout are skipped.
+
+    A blocked open can't be interrupted, so probes run on daemon threads that
+    are simply abandoned when they miss the deadline.
+    """
+    api = backend()
+    found = {}
+    lock = threading.Lock()
+
+    def run(index):
+        try:
+            info = probe(index, api)
+        except Exception as e:
+            log.warning("Probing camera failed: %s", e, extra=fields(camera=index))
+            return
+        if info:
+            with lock:
+                found[index] = info
+
+    threads = [threading.Thread(target=run, args=(index,), name=f"camera-probe-{index}", daemon=True)
+               for index in indices]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + timeout
+    for index, thread in zip(indices, threads):
+        thread.join(max(0.0, deadline - time.monotonic()))
+        if thread.is_alive():
+            log.warning("Camera probe timed out", extra=fields(camera=index, timeout=timeout))
+
+    with lock:
+        cameras = list(found.values())
+    # Index order keeps player 1 on the lower-numbered camera, as before
+    cameras.sort(key=lambda info: info["index"])
+    return cameras
+
+def _cache_key(indices):
+    return {
+        "version": CACHE_VERSION,
+        "platform": sys.platform,
+        "devices": indices,
+        "requested": [settings.capture_width, settings.capture_height, settings.capture_fps],
+    }
+
+def load_cache(key, path=CAMERA_CACHE_PATH):
+    """Cached camera list for this device set, or None."""
+    try:
+        with open(os.path.expanduser(path)) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("key") != key:
+        return None
+    return data.get("cameras")
+
+def save_cache(key, cameras, path=CAMERA_CACHE_PATH):
+    path = os.path.expanduser(path)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"key": key, "cameras": cameras}, f, indent=1)
+    except OSError as e:
+        log.warning("Could not write camera cache %s: %s", path, e)
+
+def discover(count, rescan=False):
+    """Open up to count working cameras, using the cache unless rescan is set.
+
+    Returns a list of (capture, info) pairs in device order.
+    """
+    indices = candidate_indices()
+    key = _cache_key(indices)
+    cached = None if rescan else load_cache(key)
+    if cached:
+        opened = [(open_camera(info["index"], info["backend"]), info) for info in cached[:count]]
+        if all(cap is not None for cap, _ in opened):
+            log.info("Using cached cameras", extra=fields(cameras=[info["index"] for _, info in opened]))
+            return opened
+        for cap, _ in opened:
+            if cap is not None:
+                cap.release()
+        log.info("Cached cameras unavailable, probing again")
+
+    start = time.perf_counter()
+    cameras = probe_all(indices)
+    log.info("Probed %d camera candidates in %.0f ms", len(indices), (time.perf_counter() - start) * 1000,
+             extra=fields(found=[info["index"] for info in cameras]))
+    for info in cameras:
+        if not info["matches"]:
+            log.warning("Camera does not support the requested resolution",
+                        extra=fields(camera=info["index"], size=f"{info['width']}x{info['height']}"))
+    if cameras:
+        save_cache(key, cameras)
+
+    opened = []
+    for info in cameras:
+        if len(opened) == count:
+            break
+        cap = open_camera(info["index"], info["backend"])
+        if cap is not None:
+            opened.append((cap, info))
+    return opened
+
+class SupervisedCamera:
+    """A capture that reopens its device in the background after it stops delivering frames.
+
+    Behaves like a cv2.VideoCapture for the game loop. After
+    CAMERA_FAIL_THRESHOLD failed reads in a row the device is released and a
+    daemon thread tries to reopen it with exponential backoff; meanwhile
+    read() fails immediately instead of blocking on the dead device, so the
+    other player's camera keeps running at full rate.
+    """
+    def __init__(self, cap, info):
+        self.cap = cap
+        self.index = info["index"]
+        self.api = info["backend"]
+        self.health = "ok"  # "ok", "failing", "reconnecting" or "paused"
+        self.failures = 0
+        self.attempts = 0   # Reopen attempts since the device was lost
+        self.reconnects = 0
+        self.lock = threading.Lock()
+        self.stop = threading.Event()  # Stops the current reconnect thread
+        self.thread = None
+
+    def isOpened(self):
+        return self.cap is not None or self.health == "reconnecting"
+
+    def read(self):
+        with self.lock:
+            cap = self.cap
+        if cap is None:
+            return False, None
+        ok, frame = cap.read()
+        if ok and frame is not None:
+            self.failures = 0
+            self.health = "ok"
+            return True, frame
+        self.failures += 1
+        self.health = "failing"
+        if self.failures >= CAMERA_FAIL_THRESHOLD:
+            self._lost(cap)
+        return False, None
+
+    def get(self, prop):
+        cap = self.cap
+        return cap.get(prop) if cap is not None else 0.0
+
+    def set(self, prop, value):
+        cap = self.cap
+        return cap.set(prop, value) if cap is not None else False
+
+    def _lost(self, cap):
+        log.warning("Camera stopped delivering frames, reconnecting in the background",
+                    extra=fields(camera=self.index, failures=self.failures))
+        with self.lock:
+            self.cap = None
+        cap.release()
+        self._start_reconnect(CAMERA_RECONNECT_DELAY)
+
+    def _start_reconnect(self, delay):
+        self.health = "reconnecting"
+        self.attempts = 0
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._reconnect, args=(self.stop, delay),
+                                       name=f"camera-reconnect-{self.index}", daemon=True)
+        self.thread.start()
+
+    def _reconnect(self, stop, delay):
+        while not stop.wait(delay):
+            self.attempts += 1
+            try:
+                cap = open_camera(self.index, self.api)
+            except Exception as e:
+                log.warning("Reopening camera failed: %s", e, extra=fields(camera=self.index))
+                cap = None
+            if cap is not None:
+                with self.lock:
+                    if stop.is_set():
+                        cap.release()
+                        return
+                    self.cap = cap
+                self.failures = 0
+                self.reconnects += 1
+                self.health = "ok"
+                log.info("Camera reconnected", extra=fields(camera=self.index, attempts=self.attempts))
+                return
+            # A first attempt made right away (resume) backs off like any other from then on
+            delay = min(max(delay * 2, CAMERA_RECONNECT_DELAY), CAMERA_RECONNECT_MAX_DELAY)
+
+    def reconfigure(self):
+        """Re-apply the capture settings to the open device (after config.ini changed them)."""
+        with self.lock:
+            if self.cap is not None:
+                configure(self.cap)
+
+    def pause(self):
+        """Release the device so it stops streaming; reads fail immediately until resume()."""
+        self.release()
+        self.health = "paused"
+
+    def resume(self):
+        """Reopen a paused device in the background."""
+        if self.health == "paused":
+            self._start_reconnect(0)
+
+    def release(self):
+        self.stop.set()
+        with self.lock:
+            cap, self.cap = self.cap, None
+        if cap is not None:
+            cap.release()
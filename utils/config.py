@@ -0,0 +1,178 @@
+"""Typed settings loaded from config.ini and reloaded while the game runs.
+
+Every option in config.ini is declared once in SETTINGS with its type,
+valid range, default (the matching constant in utils/constants.py) and
+scope, i.e. what has to happen for a new value to take effect:
+
+    live     read where it is used, so the next frame picks it up
+    match    copied into a match when it starts; a local match also takes
+             later edits (from the next serve), networked, recorded and
+             replayed matches keep the values they started with
+    ui       screens are rebuilt with the new sizes
+    hands    the Hands graphs are rebuilt in the background; cameras stay open
+    camera   capture settings are re-applied to the open cameras
+    audio    sounds are loaded or muted, volumes updated
+    restart  only read at startup
+
+Code reads the current values from the ``settings`` singleton. A value that
+is missing, malformed or out of range keeps its previous value and is
+logged; a file that can't be parsed at all (e.g. a half-saved edit) is
+ignored until it is saved again.
+"""
+import configparser
+import os
+import time
+from .constants import (BALL_SPEED, BALL_MAX_SPEED, WINNING_SCORE, PADDLE_SPEED, FPS, PINCH_THRESHOLD,
+                        MIN_DETECTION_CONFIDENCE, MIN_TRACKING_CONFIDENCE, CAMERA_DISPLAY_WIDTH,
+                        CAMERA_DISPLAY_HEIGHT, FONT_SIZE, AUDIO_VOLUME, CAMERA_CAPTURE_WIDTH,
+                        CAMERA_CAPTURE_HEIGHT, CAMERA_FPS, CONFIG_PATH, CONFIG_POLL_INTERVAL)
+from .log import get_logger, fields
+
+log = get_logger("config")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _bool(text):
+    value = text.strip().lower()
+    if value in ("true", "yes", "on", "1"):
+        return True
+    if value in ("false", "no", "off", "0"):
+        return False
+    raise ValueError(f"expected true or false, got {text!r}")
+
+
+def _size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+class Setting:
+    """One option: where it lives in config.ini, how it is parsed and what reloading it takes."""
+    __slots__ = ("name", "section", "parse", "default", "low", "high", "scope")
+
+    def __init__(self, section, name, parse, default, low=None, high=None, scope="live"):
+        self.section = section
+        self.name = name
+        self.parse = parse
+        self.default = default
+        self.low = low
+        self.high = high
+        self.scope = scope
+
+    def convert(self, text):
+        """Parsed and range-checked value; ValueError otherwise."""
+        value = self.parse(text)
+        for part in (value if isinstance(value, tuple) else (value,)):
+            if self.low is not None and part < self.low or self.high is not None and part > self.high:
+                raise ValueError(f"{text!r} is outside {self.low}..{self.high}")
+        return value
+
+
+SETTINGS = (
+    Setting("Game", "ball_speed", float, BALL_SPEED, 1, BALL_MAX_SPEED - 1, "match"),  # Leaves room to speed up
+    Setting("Game", "paddle_speed", float, PADDLE_SPEED, 0.1, 3.0, "match"),   # Scales paddle smoothing
+    Setting("Game", "winning_score", int, WINNING_SCORE, 1, 99, "ui"),       # Also shown on the menu
+    Setting("Game", "fps", int, FPS, 10, 240),
+    Setting("Gestures", "pinch_threshold", float, PINCH_THRESHOLD, 0.01, 0.5),
+    Setting("Gestures", "min_detection_confidence", float, MIN_DETECTION_CONFIDENCE, 0.0, 1.0, "hands"),
+    Setting("Gestures", "min_tracking_confidence", float, MIN_TRACKING_CONFIDENCE, 0.0, 1.0, "hands"),
+    Setting("Gestures", "gesture_sensitivity", float, 1.0, 0.25, 4.0),         # Hand travel scale around the centre
+    Setting("Camera", "capture_width", int, CAMERA_CAPTURE_WIDTH, 160, 1920, "camera"),
+    Setting("Camera", "capture_height", int, CAMERA_CAPTURE_HEIGHT, 120, 1080, "camera"),
+    Setting("Camera", "capture_fps", int, CAMERA_FPS, 5, 120, "camera"),
+    Setting("Display", "fullscreen", _bool, True, scope="restart"),
+    Setting("Display", "camera_display_size", _size, (CAMERA_DISPLAY_WIDTH, CAMERA_DISPLAY_HEIGHT), 40, 1280, "ui"),
+    Setting("Display", "font_size", int, FONT_SIZE, 12, 200, "ui"),
+    Setting("Audio", "enable_sounds", _bool, False, scope="audio"),
+    Setting("Audio", "sound_volume", float, AUDIO_VOLUME, 0.0, 1.0, "audio"),
+)
+
+
+class Settings:
+    """Current value of every Setting, as attributes (settings.ball_speed, ...)."""
+    def __init__(self):
+        for setting in SETTINGS:
+            setattr(self, setting.name, setting.default)
+
+
+settings = Settings()
+
+# Settings the simulation depends on; a match keeps its own copy (see match_rules)
+MATCH_RULES = ("winning_score", "ball_speed", "paddle_speed")
+
+
+def match_rules():
+    """Current values of MATCH_RULES, as GameLogic keyword arguments.
+
+    GameLogic never reads them from ``settings``: networked peers agree on
+    them in the handshake and recordings store them, so a different or
+    edited config.ini can't make two simulations of one match diverge.
+    """
+    return {name: getattr(settings, name) for name in MATCH_RULES}
+
+
+class ConfigWatcher:
+    """Loads config.ini into ``settings`` and picks up later edits.
+
+    poll() is meant for the game loop: it only stats the file every
+    CONFIG_POLL_INTERVAL seconds and returns the settings whose value changed.
+    """
+    def __init__(self, path=CONFIG_PATH, target=settings):
+        self.path = os.path.join(ROOT, path)
+        self.target = target
+        self.mtime = None
+        self.next_check = 0.0
+
+    def load(self):
+        """Read the file and apply valid values; returns the Settings that changed."""
+        try:
+            self.mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return []
+        parser = configparser.ConfigParser()
+        try:
+            parser.read(self.path)
+        except configparser.Error as e:
+            log.warning("Ignoring %s until it is saved again: %s", self.path, e)
+            return []
+
+        known = {(setting.section, setting.name) for setting in SETTINGS}
+        for section in parser.sections():
+            for key in parser[section]:
+                if (section, key) not in known:
+                    log.warning("Unknown setting", extra=fields(section=section, key=key))
+
+        changed = []
+        for setting in SETTINGS:
+            text = parser.get(setting.section, setting.name, fallback=None)
+            if text is None:
+                continue
+            try:
+                value = setting.convert(text)
+            except ValueError as e:
+                log.warning("Invalid setting, keeping %r: %s", getattr(self.target, setting.name), e,
+                            extra=fields(section=setting.section, key=setting.name))
+                continue
+            if value != getattr(self.target, setting.name):
+                setattr(self.target, setting.name, value)
+                changed.append(setting)
+        return changed
+
+    def poll(self):
+        """Settings changed since the last load, or [] (also when it is not time to check yet)."""
+        now = time.monotonic()
+        if now < self.next_check:
+            return []
+        self.next_check = now + CONFIG_POLL_INTERVAL
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return []
+        if mtime == self.mtime:
+            return []
+        changed = self.load()
+        if changed:
+            log.info("Reloaded %s", os.path.basename(self.path),
+                     extra=fields(**{setting.name: getattr(self.target, setting.name) for setting in changed}))
+        return changed
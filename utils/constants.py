@@ -22,13 +22,18 @@ PADDLE_OFFSET = 50
 BORDER_MARGIN = 100
 WINNING_SCORE = 5
 
+# Arena (--players 3 or 4: the extra players defend the top and bottom edges)
+MAX_PLAYERS = 4
+PLAYER_SIDES = ("left", "right", "top", "bottom")  # Edge each player defends, by player number
+PIPELINE_WORKERS = None       # Threads for the per-camera pipelines: None = one per camera up to the CPU count, 0 = in turn
+
 # Gesture detection
 MIN_DETECTION_CONFIDENCE = 0.7
 MIN_TRACKING_CONFIDENCE = 0.7
 PINCH_THRESHOLD = 0.07
 GESTURE_MIN_REGION = 0.05  # Start at 5% from top for maximum height
 GESTURE_MAX_REGION = 0.95  # End at 95% from top for maximum height
-GESTURE_SIDE_MARGIN = 0.05  # 5% margin from left/right sides
+GESTURE_SIDE_MARGIN = 0.05  # 5% margin from left/right sides (the hand's x range for top/bottom paddles)
 
 # Alternative presets (comment/uncomment as needed):
 # GESTURE_MIN_REGION = 0.0   # Full height option
@@ -45,12 +50,27 @@ CAMERA_CAPTURE_WIDTH = 320    # Reduced from 640
 CAMERA_CAPTURE_HEIGHT = 240   # Reduced from 480
 CAMERA_FPS = 30
 
+# Camera discovery
+CAMERA_CACHE_PATH = "~/.cache/hand_gesture_pong/cameras.json"  # Probed devices, reused at startup
+CAMERA_PROBE_TIMEOUT = 3.0    # Seconds to wait for all devices to be probed
+CAMERA_PROBE_READS = 5        # Reads allowed for a device to deliver its first frame
+CAMERA_PROBE_MAX_INDEX = 4    # Indices probed where devices can't be listed (no /dev/video*)
+CAMERA_FAIL_THRESHOLD = 10    # Failed reads in a row before a camera is reopened
+CAMERA_RECONNECT_DELAY = 0.5  # Seconds before the first reopen attempt (doubles per attempt)
+CAMERA_RECONNECT_MAX_DELAY = 8.0  # Longest wait between reopen attempts
+
 # Paddle smoothing
 PADDLE_SMOOTHING_ENABLED = True
 PADDLE_LERP_FACTOR = 0.3      # Increased from 0.25 for more responsiveness
+PADDLE_SPEED = 1.0            # Scales PADDLE_LERP_FACTOR (config.ini paddle_speed)
 MIN_GESTURE_CONFIDENCE = 0.6  # Reduced from 0.8 for better detection
 GESTURE_STABILITY_FRAMES = 2  # Reduced from 3 for faster response
 
+# Computer opponent (single-player mode)
+AI_REACTION_FRAMES = 12       # Frames before the CPU reacts to a new ball direction
+AI_AIM_ERROR = 0.35           # Aim error std-dev as a fraction of paddle height
+AI_SPEED_ERROR_GAIN = 0.5     # Extra aim error per unit of speed multiplier above 1x
+
 # UI settings
 FONT_SIZE = 80
 FPS = 60
@@ -74,3 +94,103 @@ BUTTON_SCALE_FACTOR = 1.1
 # Speed increase visual feedback
 SPEED_FLASH_DURATION = 20     # Flash duration when speed increases
 SPEED_INDICATOR_COLOR = (255, 100, 100)  # Color for speed indicator
+
+# On-screen notifications
+NOTIFICATION_POOL_SIZE = 8    # Messages on screen at once; the oldest is replaced beyond this
+NOTIFICATION_TEXT_CACHE = 32  # Distinct rendered messages kept for reuse
+
+# Networked play
+NET_DEFAULT_PORT = 47800
+NET_INPUT_DELAY = 2           # Frames local input is delayed before it applies
+NET_MAX_ROLLBACK = 8          # Frames we may predict ahead before stalling for the peer
+NET_INPUT_WINDOW = 32         # Unacknowledged inputs resent in every packet
+NET_CONNECT_TIMEOUT = 30.0    # Seconds to wait for the peer during the handshake
+NET_CHECKSUM_INTERVAL = 30    # Frames between desync checksums
+NET_PEER_TIMEOUT = 5.0        # Seconds of silence before the peer is considered gone
+
+# Spectator broadcast
+SPECTATOR_PORT = 47900
+SPECTATOR_RATE = 30           # Snapshots per second sent to viewers
+SPECTATOR_KEYFRAME_INTERVAL = 30  # Snapshots between full keyframes
+SPECTATOR_CLIENT_QUEUE = 16   # Messages buffered per viewer before frames are dropped
+SPECTATOR_MAX_CLIENTS = 500
+SPECTATOR_STALL_TIMEOUT = 10.0  # Seconds a viewer may stay stalled before being dropped
+
+# Multi-table host
+TABLE_HOST_PORT = 48000
+TABLE_INPUT_TIMEOUT = 0.5     # Seconds before a silent camera client counts as "no hand"
+TABLE_STATE_RATE = 30         # State updates per second sent back to camera clients
+TABLE_LATENCY_SAMPLES = 600   # Per-table tick latency samples kept for percentiles
+TABLE_REPORT_INTERVAL = 10.0  # Seconds between latency reports
+
+# Instant replay
+INSTANT_REPLAY_SECONDS = 6    # Ring buffer length; longer rallies replay their last seconds
+INSTANT_REPLAY_SLOWMO_TICKS = 45  # Final ticks of the rally shown in slow motion
+INSTANT_REPLAY_SLOWMO_SPEED = 0.35  # Playback speed for those ticks
+
+# Highlight clips
+HIGHLIGHT_DIR = "highlights"  # Default output directory for --highlights
+HIGHLIGHT_WIDTH = 640         # Clip width; height follows the field's aspect ratio
+HIGHLIGHT_FPS = 30
+HIGHLIGHT_CODEC = "mp4v"      # FourCC passed to cv2.VideoWriter
+HIGHLIGHT_LIVE_SECONDS = 3.0  # Winner screen captured after the regenerated rally
+HIGHLIGHT_FRAME_SLOTS = 24    # Shared-memory slots for live frames in flight; frames beyond this are dropped
+HIGHLIGHT_CONTROL_JOBS = 8    # Extra job queue room for clip start/end messages
+HIGHLIGHT_ENCODER_NICE = 10   # Scheduling priority drop for the encoder process
+HIGHLIGHT_CLOSE_TIMEOUT = 10.0  # Seconds the encoder gets to finish its clip on exit
+
+# Configuration (config.ini overrides the settings it lists; see utils/config.py)
+CONFIG_PATH = "config.ini"    # Relative to the project directory
+CONFIG_POLL_INTERVAL = 1.0    # Seconds between checks for an edited config.ini
+WINDOW_SIZE = (1280, 720)     # Used when fullscreen = false
+
+# Image skins (assets/images/<skin>.png replaces the drawn paddle, ball, camera frame or background)
+IMAGE_DIR = "assets/images"
+ASSET_CACHE_DIR = "~/.cache/hand_gesture_pong/assets"  # Converted, pre-scaled skins keyed by source hash and size
+
+# Audio (enabled from the [Audio] section of config.ini)
+SOUND_DIR = "assets/sounds"   # <effect>.wav/.ogg here replace the synthesized effects
+AUDIO_FREQUENCY = 44100
+AUDIO_BUFFER = 256            # Mixer buffer in sample frames (5.8 ms at 44.1 kHz)
+AUDIO_VOLUME = 0.7            # Used when sound_volume is missing from config.ini
+AUDIO_LATENCY_SAMPLES = 600   # Trigger timings kept for the latency report
+
+# Match statistics and leaderboards
+STATS_DIR = "stats"           # Default directory for --stats
+LEADERBOARD_SIZE = 10         # Entries kept per leaderboard and day
+
+# Idle power mode (menu and winner screens)
+IDLE_TIMEOUT = 30.0           # Seconds without input before the screens go idle
+IDLE_FPS = 10                 # Redraw rate while idle
+IDLE_PREVIEW_INTERVAL = 0.5   # Seconds between hand checks on the first camera while idle
+
+# Frame profiler
+PROFILER_SAMPLES = 600        # Per-stage samples kept (10 s at 60 FPS)
+PROFILER_OVERLAY_REFRESH = 500  # ms between overlay text refreshes
+PROFILE_DIR = "profiles"       # Default output directory for F4 profile captures
+PROFILE_SECONDS = 10.0        # Length of one capture
+PROFILE_SAMPLE_INTERVAL = 0.005  # Seconds between stack samples of every thread
+
+# Session recording
+RECORDING_JPEG_QUALITY = 80   # MJPEG quality for optionally recorded camera frames
+RECORDING_FRAME_FORMATS = ("mjpeg", "raw")
+
+# Motion-to-photon latency measurement
+LATENCY_SAMPLES = 1200        # Samples kept per player and pipeline point
+LATENCY_SETTLE_TOLERANCE = 2  # Pixels from target at which the paddle counts as settled
+LATENCY_MIN_JUMP = 20         # Smallest target jump (pixels) timed until settled
+
+# Telemetry export
+TELEMETRY_PATH = "telemetry.jsonl"
+TELEMETRY_PORT = 9464         # Local Prometheus scrape port (0 disables the endpoint)
+TELEMETRY_INTERVAL = 10.0     # Seconds between JSONL snapshots
+TELEMETRY_MAX_BYTES = 5 * 1024 * 1024  # Rotate the JSONL file at this size
+TELEMETRY_BACKUPS = 3         # Rotated files kept (telemetry.jsonl.1 ... .3)
+TELEMETRY_FRAME_BUCKETS = (0.008, 0.012, 0.0167, 0.02, 0.025, 0.033, 0.05, 0.1, 0.25)  # Seconds
+TELEMETRY_RALLY_BUCKETS = (0, 1, 2, 4, 6, 8, 12, 16, 24, 32)  # Paddle hits per point
+
+# Logging
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+LOG_CLI_FORMAT = "%(message)s"  # Command-line tools print plain report lines
+LOG_RATE_INTERVAL = 1.0       # Seconds per rate-limit window for hot-path log messages
+LOG_RATE_BURST = 5            # Records per message template allowed in each window
@@ -1,62 +1,54 @@
-import cv2
-import numpy as np
+import sys
 import pygame
-from .constants import CAMERA_CAPTURE_WIDTH, CAMERA_CAPTURE_HEIGHT, CAMERA_FPS
+from .log import get_logger, fields
+from .config import settings
+from .constants import WINDOW_SIZE
+
+log = get_logger("camera")
 
 def cvimage_to_pygame(image):
     """Convert OpenCV image to Pygame Surface."""
+    import cv2
+    import numpy as np
     image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
     image = np.rot90(image)
     surface = pygame.surfarray.make_surface(image)
     return surface
 
 def setup_fullscreen_display():
-    """Initialize pygame display in fullscreen mode."""
+    """Initialize pygame display in fullscreen mode (a WINDOW_SIZE window with fullscreen = false)."""
     pygame.init()
-    infoObject = pygame.display.Info()
-    WIDTH, HEIGHT = infoObject.current_w, infoObject.current_h
-    win = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
+    if settings.fullscreen:
+        infoObject = pygame.display.Info()
+        WIDTH, HEIGHT = infoObject.current_w, infoObject.current_h
+        win = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
+    else:
+        WIDTH, HEIGHT = WINDOW_SIZE
+        win = pygame.display.set_mode(WINDOW_SIZE)
     pygame.display.set_caption("Dual Webcam Hand Gesture Pong")
     return win, WIDTH, HEIGHT
 
-def setup_cameras():
-    """Initialize both webcam captures with better error handling and performance optimization."""
-    cap0 = cv2.VideoCapture(0)
-    cap1 = cv2.VideoCapture(2)
-    
-    # Test camera 0
-    if not cap0.isOpened():
-        print("Warning: Camera 0 not found, trying alternative...")
-        cap0 = cv2.VideoCapture(0, cv2.CAP_DSHOW)  # Windows specific
-    
-    # Test camera 1 (if not available, use camera 0 for both)
-    if not cap1.isOpened():
-        print("Warning: Camera 1 not found, using camera 0 for both players")
-        cap1 = cv2.VideoCapture(0)
-    
-    # Set camera properties for better performance (reduced resolution)
-    for cap in [cap0, cap1]:
-        if cap.isOpened():
-            # Lower resolution for better performance
-            cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_CAPTURE_WIDTH)
-            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_CAPTURE_HEIGHT)
-            cap.set(cv2.CAP_PROP_FPS, CAMERA_FPS)
-            
-            # Additional performance optimizations
-            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduce buffer to minimize lag
-            # Note: Auto exposure setting may not work on all cameras
-            try:
-                cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, 0.25)
-            except:
-                pass  # Ignore if not supported
+def setup_cameras(num_cameras=2, rescan=False):
+    """Open the cameras found by camera discovery (see utils/cameras.py); one capture per player.
     
-    return cap0, cap1
+    Each capture is a SupervisedCamera, which reopens the device in the
+    background if it disappears mid-match. With fewer working cameras than
+    players, players share cameras (with one camera, everybody uses it). The
+    list is empty when no camera works at all.
+    """
+    from .cameras import discover, SupervisedCamera
+    cameras = [SupervisedCamera(cap, info) for cap, info in discover(num_cameras, rescan)]
+    if cameras and len(cameras) < num_cameras:
+        log.warning("Fewer cameras than players, some players share a camera",
+                    extra=fields(cameras=[camera.index for camera in cameras], players=num_cameras))
+    return [cameras[player_id % len(cameras)] for player_id in range(num_cameras)] if cameras else []
 
-def cleanup_resources(cap0, cap1):
+def cleanup_resources(caps):
     """Clean up camera and pygame resources."""
-    if cap0:
-        cap0.release()
-    if cap1:
-        cap1.release()
-    cv2.destroyAllWindows()
+    for cap in set(caps):
+        cap.release()
+    # Only touch OpenCV if startup got far enough to import it
+    cv2 = sys.modules.get("cv2")
+    if cv2:
+        cv2.destroyAllWindows()
     pygame.quit()
@@ -0,0 +1,126 @@
+import math
+import time
+from array import array
+from .constants import (LATENCY_SAMPLES, LATENCY_SETTLE_TOLERANCE, LATENCY_MIN_JUMP, PADDLE_LERP_FACTOR, FPS,
+                        MAX_PLAYERS)
+
+# Points a captured frame passes on its way to the screen, in pipeline order
+MARKS = (
+    "inference",  # Hands.process returned for this frame
+    "target",     # update_paddle_positions set the paddle target from it
+    "present",    # pygame.display.update showed the first frame drawn with it
+    "settled",    # the smoothed paddle reached the target after a jump
+)
+
+class LatencyTracker:
+    """Motion-to-photon latency per player, measured from each frame's capture time.
+
+    process_cameras stamps every frame with capture() and later marks; the game
+    loop calls present() right after pygame.display.update. "settled" samples
+    only come from jumps of at least LATENCY_MIN_JUMP pixels, timed until the
+    paddle is within LATENCY_SETTLE_TOLERANCE of its target. Like the frame
+    profiler, every call returns immediately while disabled.
+    """
+    def __init__(self, num_players=MAX_PLAYERS, samples=LATENCY_SAMPLES):
+        self.enabled = False
+        self.samples = samples
+        self.num_players = num_players
+        self.buffers = {(p, mark): array('q', bytes(8 * samples)) for p in range(num_players) for mark in MARKS}
+        self.counts = dict.fromkeys(self.buffers, 0)
+        self.jumps = [array('d') for _ in range(num_players)]
+        self.captured = [0] * num_players   # Capture time of each player's newest frame
+        self.unpresented = [False] * num_players
+        self.settling = [0] * num_players   # Capture time of the jump being timed, 0 if none
+
+    def reset(self):
+        for key in self.counts:
+            self.counts[key] = 0
+        for jumps in self.jumps:
+            del jumps[:]
+        self.captured = [0] * self.num_players
+        self.unpresented = [False] * self.num_players
+        self.settling = [0] * self.num_players
+
+    def _record(self, player_id, mark, elapsed):
+        key = (player_id, mark)
+        count = self.counts[key]
+        self.buffers[key][count % self.samples] = elapsed
+        self.counts[key] = count + 1
+
+    def capture(self, player_id, at=None):
+        """Stamp a frame as it comes off the camera (at: perf_counter_ns of the read, default now)."""
+        if not self.enabled:
+            return
+        self.captured[player_id] = at or time.perf_counter_ns()
+        self.unpresented[player_id] = True
+
+    def mark(self, player_id, mark, at=None):
+        """Record how long after capture the newest frame reached this point (at, default now)."""
+        if self.enabled and self.captured[player_id]:
+            self._record(player_id, mark, (at or time.perf_counter_ns()) - self.captured[player_id])
+
+    def target_set(self, player_id, paddle):
+        """The paddle target was updated from the newest frame; start timing a jump."""
+        if not self.enabled or not self.captured[player_id]:
+            return
+        self._record(player_id, "target", time.perf_counter_ns() - self.captured[player_id])
+        distance = abs(paddle.target_y - paddle.smooth_y)
+        if not self.settling[player_id] and distance >= LATENCY_MIN_JUMP:
+            self.settling[player_id] = self.captured[player_id]
+            self.jumps[player_id].append(distance)
+
+    def present(self, paddles):
+        """Call right after the display update; paddles are indexed by player."""
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        for player_id, paddle in enumerate(paddles[:self.num_players]):
+            if self.unpresented[player_id]:
+                self._record(player_id, "present", now - self.captured[player_id])
+                self.unpresented[player_id] = False
+            if self.settling[player_id] and abs(paddle.position - paddle.target_y) <= LATENCY_SETTLE_TOLERANCE:
+                self._record(player_id, "settled", now - self.settling[player_id])
+                self.settling[player_id] = 0
+
+    def percentiles(self, player_id, mark, points=(50, 95, 99)):
+        """Requested percentiles in milliseconds, or None without samples."""
+        key = (player_id, mark)
+        count = min(self.counts[key], self.samples)
+        if count == 0:
+            return None
+        values = sorted(self.buffers[key][:count])
+        return tuple(values[min(count - 1, count * p // 100)] / 1e6 for p in points)
+
+    def expected_settle_frames(self, distance, lerp=PADDLE_LERP_FACTOR):
+        """Frames a lerp of this factor alone needs to close a jump to within the settle tolerance."""
+        if distance <= LATENCY_SETTLE_TOLERANCE:
+            return 0
+        if lerp >= 1:
+            return 1
+        return math.ceil(math.log(LATENCY_SETTLE_TOLERANCE / distance) / math.log(1 - lerp))
+
+    def report(self, lerp=PADDLE_LERP_FACTOR, fps=FPS):
+        """Multi-line summary of capture-to-X latency for every player with samples.
+
+        lerp and fps are what the game ran with (game.objects.lerp_factor() of
+        the match's paddle_speed, and settings.fps) for the settle estimate.
+        """
+        lines = [f"{'player':<8}{'capture to':<12}{'p50':>8}{'p95':>8}{'p99':>8}{'n':>7}  ms"]
+        for player_id in range(self.num_players):
+            for mark in MARKS:
+                stats = self.percentiles(player_id, mark)
+                if stats:
+                    n = self.counts[(player_id, mark)]
+                    lines.append(f"{player_id + 1:<8}{mark:<12}{stats[0]:>8.1f}{stats[1]:>8.1f}{stats[2]:>8.1f}{n:>7}")
+            jumps = sorted(self.jumps[player_id])
+            if jumps:
+                median_jump = jumps[len(jumps) // 2]
+                frames = self.expected_settle_frames(median_jump, lerp)
+                lines.append(f"        lerp alone settles a {median_jump:.0f} px jump in {frames} frames "
+                              f"({frames * 1000 / fps:.0f} ms at {fps} FPS, lerp factor {lerp:.2f})")
+        if len(lines) == 1:
+            lines.append("no samples")
+        return "\n".join(lines)
+
+# Shared instance used by the game loop and GameLogic
+latency = LatencyTracker()
@@ -0,0 +1,107 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from .constants import LOG_FORMAT, LOG_RATE_INTERVAL, LOG_RATE_BURST
+
+ROOT_LOGGER = "pong"
+
+def get_logger(name, rate_limit=False):
+    """Logger under the game's namespace; rate_limit caps repeats of each message per interval."""
+    logger = logging.getLogger(f"{ROOT_LOGGER}.{name}")
+    if rate_limit and not any(isinstance(f, RateLimitFilter) for f in logger.filters):
+        logger.addFilter(RateLimitFilter())
+    return logger
+
+def fields(**values):
+    """Structured fields for a log call: ``log.info("Hit", extra=fields(hit_count=3))``."""
+    return {"fields": values}
+
+class RateLimitFilter(logging.Filter):
+    """Lets LOG_RATE_BURST records per message template through each interval.
+
+    Runs on the calling thread, so it only does a dict lookup and a clock read.
+    The count of dropped records is attached to the next record that passes.
+    """
+    def __init__(self, interval=LOG_RATE_INTERVAL, burst=LOG_RATE_BURST):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self.windows = {}  # template -> [window start, passed, suppressed]
+
+    def filter(self, record):
+        now = time.monotonic()
+        window = self.windows.get(record.msg)
+        if window is None or now - window[0] >= self.interval:
+            suppressed = window[2] if window else 0
+            self.windows[record.msg] = [now, 1, 0]
+            if suppressed:
+                record.suppressed = suppressed
+            return True
+        if window[1] < self.burst:
+            window[1] += 1
+            return True
+        window[2] += 1
+        return False
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves all message formatting to the listener thread.
+
+    The stock handler formats the message in prepare(), i.e. on the game
+    thread; records here stay in-process, so they can be queued untouched.
+    """
+    def prepare(self, record):
+        return record
+
+class StructuredFormatter(logging.Formatter):
+    """Appends structured fields (and suppressed-repeat counts) as key=value pairs."""
+    def format(self, record):
+        text = super().format(record)
+        extra = dict(getattr(record, "fields", None) or {})
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            extra["suppressed"] = suppressed
+        if extra:
+            text += " " + " ".join(f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}"
+                                   for key, value in extra.items())
+        return text
+
+_listener = None
+
+def setup_logging(level=logging.INFO, path=None, fmt=LOG_FORMAT):
+    """Route the game's loggers through a queue drained by a background listener.
+
+    Safe to call more than once; later calls replace the previous handlers.
+    """
+    global _listener
+    shutdown_logging()
+
+    formatter = StructuredFormatter(fmt, "%H:%M:%S")
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if path:
+        handlers.append(logging.FileHandler(path))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger(ROOT_LOGGER)
+    root.handlers[:] = [DeferredQueueHandler(log_queue)]
+    root.setLevel(level)
+    root.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,132 @@
+"""On-demand profile captures of the running game (F4).
+
+A capture runs for PROFILE_SECONDS and records two views of the same
+stretch of play:
+
+    .pstats     cProfile of the game thread (exact call counts and times;
+                open with python -m pstats or snakeviz)
+    .collapsed  stacks of every thread, sampled every PROFILE_SAMPLE_INTERVAL,
+                one "state;thread;frame;...;frame count" line per stack,
+                ready for flamegraph.pl or speedscope
+
+Both files are named after the capture time and the game state it started
+in; each sampled stack is rooted at the state it was taken in, so a capture
+that spans the menu and a match splits cleanly. The camera pipelines run on
+their own threads and only show up in the samples. Stopping hands the data
+to a writer thread, so the game loop never waits for the files.
+"""
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from .constants import PROFILE_DIR, PROFILE_SECONDS, PROFILE_SAMPLE_INTERVAL
+from .log import get_logger, fields
+
+log = get_logger("profile")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ProfileCapture:
+    """cProfile plus a stack sampler for a few seconds; start/stop and update() run on the game thread."""
+    def __init__(self, directory=PROFILE_DIR, seconds=PROFILE_SECONDS, interval=PROFILE_SAMPLE_INTERVAL):
+        self.directory = directory
+        self.seconds = seconds
+        self.interval = interval
+        self.state = None   # Game state, read by the sampler to tag each stack
+        self.profile = None
+        self.end = 0.0
+        self.name = None
+        self.sampler = None
+        self.stopping = None
+        self.stacks = None
+        self.writers = []
+        self.labels = {}    # Code object -> frame label, shared by all captures
+
+    @property
+    def active(self):
+        return self.profile is not None
+
+    def toggle(self, state):
+        """Start a capture in this game state, or end the running one early."""
+        if self.active:
+            self.stop()
+        else:
+            self.start(state)
+
+    def start(self, state):
+        self.state = state
+        self.name = f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{state}"
+        self.stacks = Counter()
+        self.stopping = threading.Event()
+        self.sampler = threading.Thread(target=self._sample, args=(self.stacks, self.stopping),
+                                        name="profile-sampler", daemon=True)
+        self.sampler.start()
+        self.end = time.monotonic() + self.seconds
+        log.info("Profiling for %.0f s", self.seconds, extra=fields(state=state, name=self.name))
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def update(self, state):
+        """Once per frame: tags the samples with the current state and ends a capture that ran its time."""
+        self.state = state
+        if self.profile is not None and time.monotonic() >= self.end:
+            self.stop()
+
+    def stop(self):
+        self.profile.disable()
+        self.stopping.set()
+        writer = threading.Thread(target=self._write, args=(self.profile, self.sampler, self.stacks, self.name),
+                                  name="profile-writer", daemon=True)
+        writer.start()
+        self.writers = [w for w in self.writers if w.is_alive()] + [writer]
+        self.profile = None
+
+    def close(self, timeout=5.0):
+        """Finish a running capture and wait for its files (on exit)."""
+        if self.active:
+            self.stop()
+        for writer in self.writers:
+            writer.join(timeout)
+
+    def _label(self, code):
+        label = self.labels.get(code)
+        if label is None:
+            path = code.co_filename
+            path = os.path.relpath(path, ROOT) if path.startswith(ROOT + os.sep) else os.path.basename(path)
+            label = self.labels[code] = f"{code.co_name} ({path}:{code.co_firstlineno})"
+        return label
+
+    def _sample(self, stacks, stopping):
+        own = threading.get_ident()
+        while not stopping.wait(self.interval):
+            state = self.state
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.extend((names.get(ident, str(ident)), state))
+                stacks[";".join(reversed(stack))] += 1
+
+    def _write(self, profile, sampler, stacks, name):
+        sampler.join()
+        start = time.perf_counter()
+        pstats_path = os.path.join(self.directory, name + ".pstats")
+        collapsed_path = os.path.join(self.directory, name + ".collapsed")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profile.dump_stats(pstats_path)
+            with open(collapsed_path, "w") as f:
+                f.writelines(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+        except OSError as e:
+            log.warning("Could not save profile %s: %s", name, e)
+            return
+        log.info("Saved profile %s", name, extra=fields(pstats=pstats_path, collapsed=collapsed_path,
+                                                        samples=sum(stacks.values()),
+                                                        write_ms=round((time.perf_counter() - start) * 1000)))
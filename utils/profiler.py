@@ -0,0 +1,93 @@
+import threading
+import time
+from array import array
+from collections import deque
+from .constants import PROFILER_SAMPLES
+
+# Stages in pipeline order; the overlay lists them in this order
+STAGES = (
+    "capture",        # cap.read
+    "preprocess",     # cv2.flip + cvtColor
+    "inference",      # Hands.process
+    "overlay",        # gesture area drawing
+    "landmarks",      # draw_landmarks
+    "convert",        # cvimage_to_pygame
+    "update_ball",
+    "hud",            # GameHUD.draw
+    "present",        # pygame.display.update
+    "frame",          # whole frame excluding the clock wait
+)
+
+class StageProfiler:
+    """Per-stage frame timings kept in fixed-size perf_counter_ns ring buffers.
+    
+    Call sites do ``t = profiler.start()`` and ``profiler.stop("stage", t)``.
+    While disabled, start() returns 0 and stop() returns immediately, so the
+    instrumentation costs two trivial calls per stage.
+    
+    Only the game thread writes the ring buffers. Other threads (the camera
+    pipelines) queue their samples, and the game thread records them in
+    collect() once those threads are done with the frame.
+    """
+    def __init__(self, stages=STAGES, samples=PROFILER_SAMPLES):
+        self.enabled = False
+        self.samples = samples
+        self.buffers = {stage: array('q', bytes(8 * samples)) for stage in stages}
+        self.counts = dict.fromkeys(stages, 0)
+        self.owner = threading.main_thread().ident
+        self.deferred = deque()  # (stage, elapsed ns) from other threads; appends and pops are thread-safe
+    
+    def start(self):
+        return time.perf_counter_ns() if self.enabled else 0
+    
+    def stop(self, stage, start):
+        if not start:
+            return
+        elapsed = time.perf_counter_ns() - start
+        if threading.get_ident() != self.owner:
+            self.deferred.append((stage, elapsed))
+            return
+        self._record(stage, elapsed)
+    
+    def collect(self):
+        """Record the samples queued by other threads; call on the game thread."""
+        deferred = self.deferred
+        while deferred:
+            self._record(*deferred.popleft())
+    
+    def _record(self, stage, elapsed):
+        count = self.counts[stage]
+        self.buffers[stage][count % self.samples] = elapsed
+        self.counts[stage] = count + 1
+    
+    def toggle(self):
+        """Enable or disable recording; history is cleared when re-enabled."""
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.reset()
+        return self.enabled
+    
+    def reset(self):
+        self.deferred.clear()
+        for stage in self.counts:
+            self.counts[stage] = 0
+    
+    def percentiles(self, stage, points=(50, 95, 99)):
+        """Return the requested percentiles in milliseconds, or None without samples."""
+        count = min(self.counts[stage], self.samples)
+        if count == 0:
+            return None
+        values = sorted(self.buffers[stage][:count])
+        return tuple(values[min(count - 1, count * p // 100)] / 1e6 for p in points)
+    
+    def summary(self):
+        """Map each stage with samples to its (p50, p95, p99) in milliseconds."""
+        result = {}
+        for stage in self.buffers:
+            stats = self.percentiles(stage)
+            if stats:
+                result[stage] = stats
+        return result
+
+# Shared instance used by the game loop, GameLogic and GestureDetector
+profiler = StageProfiler()
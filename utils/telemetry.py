@@ -0,0 +1,220 @@
+import bisect
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .constants import TELEMETRY_INTERVAL, TELEMETRY_MAX_BYTES, TELEMETRY_BACKUPS, TELEMETRY_PORT
+from .log import get_logger
+
+log = get_logger("telemetry")
+
+class Counter:
+    """Monotonic count; the game thread only ever does ``value += n``."""
+    kind = "counter"
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+class Gauge:
+    """Last-written value."""
+    kind = "gauge"
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+class Histogram:
+    """Fixed-bucket histogram in Prometheus form (bucket counts are not cumulative until export)."""
+    kind = "histogram"
+
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @property
+    def value(self):
+        return {"count": sum(self.counts), "sum": self.sum, "buckets": list(self.counts)}
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+class MetricsRegistry:
+    """Named metrics shared by the game loop, GameLogic and GestureDetector.
+
+    Metrics are created once at import time and updated with plain attribute
+    increments; formatting, file writes and HTTP all happen on the exporter's
+    threads, which only read the values.
+    """
+    def __init__(self):
+        self.families = {}  # name -> (kind, help, {label tuple: metric})
+        self.collectors = []
+        self.lock = threading.Lock()
+
+    def _get(self, cls, name, help_text, labels, *args):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            kind, _, children = self.families.setdefault(name, (cls.kind, help_text, {}))
+            if kind != cls.kind:
+                raise ValueError(f"Metric {name} already registered as a {kind}")
+            if key not in children:
+                children[key] = cls(*args)
+            return children[key]
+
+    def counter(self, name, help_text, **labels):
+        return self._get(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text, **labels):
+        return self._get(Gauge, name, help_text, labels)
+
+    def histogram(self, name, help_text, buckets, **labels):
+        return self._get(Histogram, name, help_text, labels, buckets)
+
+    def add_collector(self, collect):
+        """Register a callable run on the exporter thread just before each export."""
+        self.collectors.append(collect)
+
+    def collect(self):
+        for collect in self.collectors:
+            collect()
+
+    def snapshot(self):
+        """Flat {"name{labels}": value} dict for the JSONL log."""
+        with self.lock:
+            families = [(name, list(children.items())) for name, (_, _, children) in self.families.items()]
+        return {name + _label_text(labels): metric.value for name, children in families for labels, metric in children}
+
+    def render_prometheus(self):
+        """Prometheus text exposition format."""
+        lines = []
+        with self.lock:
+            families = [(name, kind, help_text, list(children.items()))
+                        for name, (kind, help_text, children) in self.families.items()]
+        for name, kind, help_text, children in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, metric in children:
+                if kind != "histogram":
+                    lines.append(f"{name}{_label_text(labels)} {metric.value}")
+                    continue
+                cumulative = 0
+                counts = list(metric.counts)
+                for bound, count in zip(metric.buckets + ("+Inf",), counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_label_text(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{_label_text(labels)} {metric.sum}")
+                lines.append(f"{name}_count{_label_text(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+class TelemetryExporter:
+    """Background thread appending snapshots to a rotating JSONL file, plus a /metrics endpoint."""
+    def __init__(self, registry, path, port=TELEMETRY_PORT, interval=TELEMETRY_INTERVAL,
+                 max_bytes=TELEMETRY_MAX_BYTES, backups=TELEMETRY_BACKUPS):
+        self.registry = registry
+        self.path = path
+        self.port = port
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.started = time.monotonic()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.server = None
+
+    def start(self):
+        if self.port:
+            registry = self.registry
+
+            class MetricsHandler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] not in ("/", "/metrics"):
+                        self.send_error(404)
+                        return
+                    registry.collect()
+                    body = registry.render_prometheus().encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass  # Scrapes every few seconds would flood the console
+
+            try:
+                # Local monitoring only; the cabinet shouldn't expose metrics to the network
+                self.server = ThreadingHTTPServer(("127.0.0.1", self.port), MetricsHandler)
+            except OSError as e:
+                # E.g. a second instance on the same port; the JSONL export still runs
+                log.warning("Could not serve metrics on port %d: %s", self.port, e)
+            else:
+                self.server.daemon_threads = True
+                threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True).start()
+                log.info("Serving metrics on http://127.0.0.1:%d/metrics", self.port)
+        if self.path:
+            self.thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        """Append one snapshot line, rotating the file when it grows past max_bytes."""
+        self.registry.collect()
+        record = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "uptime": round(time.monotonic() - self.started, 1),
+            "metrics": self.registry.snapshot(),
+        }
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+                self._rotate()
+            with open(self.path, "a") as f:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        except OSError as e:
+            log.warning("Telemetry write failed: %s", e)
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+        if self.path:
+            self.flush()  # Keep the final counts of the session
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+# Shared registry; metrics are declared next to the code that updates them
+metrics = MetricsRegistry()
+
+def export_profiler(registry, profiler):
+    """Publish the frame profiler's per-stage percentiles as gauges at export time."""
+    gauges = {}
+    def collect():
+        for stage, stats in profiler.summary().items():
+            for quantile, value in zip(("0.5", "0.95", "0.99"), stats):
+                key = (stage, quantile)
+                if key not in gauges:
+                    gauges[key] = registry.gauge("pong_stage_seconds", "Per-stage frame time percentiles",
+                                                 stage=stage, quantile=quantile)
+                gauges[key].set(value / 1000)
+    registry.add_collector(collect)